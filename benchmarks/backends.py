@@ -0,0 +1,133 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.model.predict import PredictDetectionModel
+from src.utils.metrics import percentile
+from src.utils.config import MODEL_PATH
+import numpy as np
+import argparse
+import time
+import cv2
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_frames(folder: str) -> list:
+    """
+    Load every image in a folder, sorted by file name.
+
+    Args:
+        folder (str): The folder with sample frames.
+
+    Returns:
+        list: The (file name, frame) pairs.
+    """
+    names = sorted(name for name in os.listdir(folder) if name.lower().endswith(IMAGE_EXTENSIONS))
+    return [(name, cv2.imread(os.path.join(folder, name))) for name in names]
+
+
+def match_detections(reference: list, other: list, iou_threshold: float) -> tuple:
+    """
+    Greedily match two sets of detections of the same frame by IoU.
+
+    Args:
+        reference (list): The detections of the reference backend.
+        other (list): The detections of the compared backend.
+        iou_threshold (float): The minimum IoU for two detections to match.
+
+    Returns:
+        tuple: The agreement between 0 and 1, and the (IoU, confidence difference) of every match.
+    """
+    if not reference and not other:
+        return 1.0, []
+
+    matches = []
+    used = set()
+    for ref in sorted(reference, key=lambda d: -d.confidence):
+        best_iou, best_index = 0.0, None
+        for index, det in enumerate(other):
+            if index in used:
+                continue
+            x_left, y_top = max(ref.x1, det.x1), max(ref.y1, det.y1)
+            x_right, y_bottom = min(ref.x2, det.x2), min(ref.y2, det.y2)
+            intersection = max(0, x_right - x_left) * max(0, y_bottom - y_top)
+            union = ref.width * ref.height + det.width * det.height - intersection
+            iou = intersection / union if union else 0.0
+            if iou > best_iou:
+                best_iou, best_index = iou, index
+
+        if best_index is not None and best_iou >= iou_threshold:
+            used.add(best_index)
+            matches.append((best_iou, abs(ref.confidence - other[best_index].confidence)))
+
+    return len(matches) / max(len(reference), len(other)), matches
+
+
+def run_backend(name: str, model_path: str, frames: list, warmup: int) -> tuple:
+    """
+    Run a backend over all frames.
+
+    Args:
+        name (str): The backend name.
+        model_path (str): The path to the model weights.
+        frames (list): The (file name, frame) pairs.
+        warmup (int): The number of untimed runs on the first frame.
+
+    Returns:
+        tuple: The per-frame latencies in seconds and the per-frame detections.
+    """
+    model = PredictDetectionModel(model_path, backend=name)
+    for _ in range(warmup):
+        model.predict(frames[0][1])
+
+    latencies, detections = [], []
+    for _, frame in frames:
+        start_time = time.perf_counter()
+        labels = model.predict(frame) or []
+        latencies.append(time.perf_counter() - start_time)
+        detections.append(labels)
+
+    return latencies, detections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare detector latency and agreement between inference backends.")
+    parser.add_argument("--frames", required=True, help="Folder of sample frames.")
+    parser.add_argument("--model", default=MODEL_PATH, help="Path to the PyTorch weights.")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx"], help="Backends to compare; the first is the reference.")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--iou", type=float, default=0.5, help="Minimum IoU for two detections to agree.")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    if not frames:
+        print(f"No images found in {args.frames}")
+        return
+
+    results = {name: run_backend(name, args.model, frames, args.warmup) for name in args.backends}
+    reference = args.backends[0]
+    reference_detections = results[reference][1]
+
+    print(f"{len(frames)} frames, reference backend: {reference}")
+    print(f"{'backend':>10} {'mean (ms)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'boxes':>6} {'agreement':>10} {'mean IoU':>9} {'conf diff':>10}")
+    for name in args.backends:
+        latencies, detections = results[name]
+        agreements, matches = [], []
+        for ref, det in zip(reference_detections, detections):
+            agreement, frame_matches = match_detections(ref, det, args.iou)
+            agreements.append(agreement)
+            matches.extend(frame_matches)
+
+        mean_iou = np.mean([iou for iou, _ in matches]) if matches else 0.0
+        conf_diff = np.mean([diff for _, diff in matches]) if matches else 0.0
+        print(
+            f"{name:>10} {np.mean(latencies) * 1000:>10.1f} {percentile(latencies, 50) * 1000:>9.1f} "
+            f"{percentile(latencies, 95) * 1000:>9.1f} {sum(len(d) for d in detections):>6} "
+            f"{np.mean(agreements):>10.3f} {mean_iou:>9.3f} {conf_diff:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
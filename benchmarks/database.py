@@ -0,0 +1,207 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.database.indexes import ensure_indexes, INDEXES
+from src.database.visitor import VISITOR_GRACE_PERIOD
+from pymongo.mongo_client import MongoClient
+from src.utils.metrics import percentile
+import argparse
+import random
+import string
+import time
+
+
+def random_plate(rng: random.Random) -> str:
+    """
+    Create a random car plate such as "ABC1234".
+    """
+    return "".join(rng.choices(string.ascii_uppercase, k=3)) + str(rng.randint(1, 9999))
+
+
+def seed(database, residents: int, visitors: int, history: int, groups: int, seed_value: int) -> dict:
+    """
+    Fill the collections with synthetic residents, visitors and history records.
+
+    Args:
+        database (Database): The scratch database.
+        residents (int): The number of residents, each with one or two vehicles.
+        visitors (int): The number of visitor records.
+        history (int): The number of history records.
+        groups (int): The number of residential groups.
+        seed_value (int): The random seed.
+
+    Returns:
+        dict: Sample plates, phone numbers and groups to query.
+    """
+    rng = random.Random(seed_value)
+    now = time.time()
+    group_names = [f"group-{index}" for index in range(groups)]
+
+    users, plates, phone_numbers = [], [], []
+    for index in range(residents):
+        vehicles = [{"type": "Car", "license_plate": random_plate(rng)} for _ in range(rng.randint(1, 2))]
+        plates.extend(vehicle["license_plate"] for vehicle in vehicles)
+        phone_numbers.append(f"60{index:09d}")
+        users.append({
+            "phone_number": phone_numbers[-1],
+            "group": rng.choice(group_names),
+            "role": "Resident",
+            "home_address": f"{index} Benchmark Street",
+            "vehicle": vehicles
+        })
+
+    visitor_records, visitor_plates = [], []
+    for index in range(visitors):
+        visitor_plates.append(random_plate(rng))
+        enter_time = now + rng.uniform(-86400, 86400)
+        visitor_records.append({
+            "phone_number": rng.choice(phone_numbers),
+            "group": rng.choice(group_names),
+            "license_plate": visitor_plates[-1],
+            "vehicle_type": "Car",
+            "enter_time": enter_time,
+            "exit_time": enter_time + 7200
+        })
+
+    history_records = []
+    for _ in range(history):
+        enter_time = now - rng.uniform(0, 90 * 86400)
+        history_records.append({
+            "group": rng.choice(group_names),
+            "role": "Resident",
+            "vehicle_type": "Car",
+            "license_plate": rng.choice(plates),
+            "enter_time": enter_time,
+            "exit_time": enter_time + rng.uniform(600, 36000)
+        })
+
+    for collection, records in (("users", users), ("visitor-record", visitor_records), ("history-record", history_records)):
+        for start in range(0, len(records), 10000):
+            database[collection].insert_many(records[start:start + 10000], ordered=False)
+
+    return {"plates": plates, "visitor_plates": visitor_plates, "phone_numbers": phone_numbers, "groups": group_names}
+
+
+def queries(samples: dict) -> list:
+    """
+    Build the hot queries of the gate and the web views, each drawing its arguments from the samples.
+
+    Args:
+        samples (dict): The sample plates, phone numbers and groups.
+
+    Returns:
+        list: The (name, collection, cursor factory) of every query.
+    """
+    return [
+        ("user by plate", "users",
+         lambda collection, rng: collection.find({"vehicle": {"$elemMatch": {"license_plate": rng.choice(samples["plates"])}}}).limit(1)),
+        ("user by phone", "users",
+         lambda collection, rng: collection.find({"phone_number": rng.choice(samples["phone_numbers"])}).limit(1)),
+        ("visitor by plate", "visitor-record",
+         lambda collection, rng: collection.find({
+             "license_plate": rng.choice(samples["visitor_plates"]),
+             "enter_time": {"$lt": time.time() + VISITOR_GRACE_PERIOD},
+             "exit_time": {"$gt": time.time() - VISITOR_GRACE_PERIOD}
+         }).limit(1)),
+        ("latest history", "history-record",
+         lambda collection, rng: collection.find({"license_plate": rng.choice(samples["plates"])}).sort("enter_time", -1).limit(1)),
+        ("users of group", "users",
+         lambda collection, rng: collection.find({"group": rng.choice(samples["groups"])}, {"_id": False})),
+        ("visitors of group", "visitor-record",
+         lambda collection, rng: collection.find({"group": rng.choice(samples["groups"]), "exit_time": {"$not": {"$lte": time.time()}}})),
+        ("visitors of resident", "visitor-record",
+         lambda collection, rng: collection.find({"phone_number": rng.choice(samples["phone_numbers"]), "exit_time": {"$not": {"$lte": time.time()}}})),
+        ("history of group", "history-record",
+         lambda collection, rng: collection.find({"group": rng.choice(samples["groups"])}, {"_id": False}))
+    ]
+
+
+def plan_stages(plan: dict) -> list:
+    """
+    Collect the stage names of a query plan, from the root down.
+
+    Args:
+        plan (dict): The winning plan of an explain() result.
+
+    Returns:
+        list: The stage names.
+    """
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("queryPlan", "inputStage"):
+        if isinstance(plan.get(key), dict):
+            stages += plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += plan_stages(child)
+
+    return stages
+
+
+def report(database, samples: dict, repeat: int, seed_value: int) -> None:
+    """
+    Print the plan, examined documents and latency of every query.
+
+    Args:
+        database (Database): The seeded database.
+        samples (dict): The sample plates, phone numbers and groups.
+        repeat (int): The number of timed runs of every query.
+        seed_value (int): The random seed for the query arguments.
+    """
+    print(f"{'query':>18} {'plan':>28} {'keys':>8} {'docs':>8} {'returned':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for name, collection, cursor in queries(samples):
+        rng = random.Random(seed_value)
+        explain = cursor(database[collection], rng).explain()
+        stats = explain.get("executionStats", {})
+        plan = " > ".join(plan_stages(explain["queryPlanner"]["winningPlan"]))
+
+        durations = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            list(cursor(database[collection], rng))
+            durations.append(time.perf_counter() - start_time)
+
+        print(
+            f"{name:>18} {plan:>28} {stats.get('totalKeysExamined', 0):>8} {stats.get('totalDocsExamined', 0):>8} "
+            f"{stats.get('nReturned', 0):>9} {percentile(durations, 50) * 1000:>9.2f} {percentile(durations, 95) * 1000:>9.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report query latency and plans of the gate collections before and after indexing.")
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="smart-gate-benchmark",
+                        help="Scratch database, dropped before seeding and after the run.")
+    parser.add_argument("--residents", type=int, default=10000)
+    parser.add_argument("--visitors", type=int, default=2000)
+    parser.add_argument("--history", type=int, default=100000)
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database after the run.")
+    args = parser.parse_args()
+
+    client = MongoClient(args.url)
+    client.drop_database(args.database)
+    database = client[args.database]
+
+    try:
+        start_time = time.perf_counter()
+        samples = seed(database, args.residents, args.visitors, args.history, args.groups, args.seed)
+        print(f"Seeded {args.residents} residents, {args.visitors} visitors and {args.history} history records "
+              f"in {time.perf_counter() - start_time:.1f}s")
+
+        print("\nWithout indexes")
+        report(database, samples, args.repeat, args.seed)
+
+        start_time = time.perf_counter()
+        ensure_indexes(database)
+        print(f"\nWith indexes ({sum(len(indexes) for indexes in INDEXES.values())} created in {time.perf_counter() - start_time:.1f}s)")
+        report(database, samples, args.repeat, args.seed)
+
+    finally:
+        if not args.keep:
+            client.drop_database(args.database)
+
+
+if __name__ == "__main__":
+    main()
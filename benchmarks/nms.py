@@ -0,0 +1,139 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.model.nms import non_max_suppression, pairwise_suppression, matrix_suppression
+import numpy as np
+import argparse
+import time
+
+
+def legacy_check_overlap(coordinate_1: dict, coordinate_2: dict) -> bool:
+    """
+    The pairwise overlap check used by the original filter_nms.
+    """
+    x_left = max(coordinate_1["x1"], coordinate_2["x1"])
+    y_top = max(coordinate_1["y1"], coordinate_2["y1"])
+    x_right = min(coordinate_1["x2"], coordinate_2["x2"])
+    y_bottom = min(coordinate_1["y2"], coordinate_2["y2"])
+
+    if x_right < x_left or y_bottom < y_top:
+        return False
+
+    intersection_area = (x_right - x_left) * (y_bottom - y_top)
+    coordinate_1_area = (coordinate_1["x2"] - coordinate_1["x1"]) * (coordinate_1["y2"] - coordinate_1["y1"])
+    coordinate_2_area = (coordinate_2["x2"] - coordinate_2["x1"]) * (coordinate_2["y2"] - coordinate_2["y1"])
+    union_area = coordinate_1_area + coordinate_2_area - intersection_area
+
+    iou = intersection_area / union_area
+    return iou > 0.3
+
+
+def legacy_filter_nms(label: list) -> list:
+    """
+    The original nested-loop filter_nms, kept here for comparison.
+
+    The original removed labels from the list it was iterating over, which skips pairs and raises
+    ValueError once a label is removed twice. Here the loops run over a copy and skip removed labels,
+    keeping its pairwise rule and its quadratic cost.
+    """
+    for coord_1 in list(label):
+        for coord_2 in list(label):
+            if coord_1 is not coord_2 and coord_1 in label and coord_2 in label:
+                if legacy_check_overlap(coord_1, coord_2):
+                    if coord_1["confidence"] > coord_2["confidence"]:
+                        label.remove(coord_2)
+                    else:
+                        label.remove(coord_1)
+
+    return label
+
+
+def make_labels(count: int, rng: np.random.Generator) -> list:
+    """
+    Create plate-sized labels in clusters, so roughly a third of them overlap another box.
+
+    Args:
+        count (int): The number of labels.
+        rng (np.random.Generator): The random generator.
+
+    Returns:
+        list: The labels.
+    """
+    labels = []
+    centers = rng.uniform([100, 100], [1820, 980], size=(max(1, count * 2 // 3), 2))
+    for index in range(count):
+        x, y = centers[index % len(centers)] + rng.normal(0, 8, size=2)
+        labels.append({
+            "x1": int(x - 60), "y1": int(y - 20), "x2": int(x + 60), "y2": int(y + 20),
+            "confidence": float(rng.uniform(0.25, 1.0)), "class_id": 0
+        })
+    return labels
+
+
+def array_filter(suppression):
+    """
+    Wrap an array-based suppression as a label filter, including the conversion from and to label dicts.
+
+    Args:
+        suppression (function): pairwise_suppression, matrix_suppression or None for non_max_suppression.
+
+    Returns:
+        function: The label filter.
+    """
+    def filter_nms(label: list) -> list:
+        if len(label) < 2:
+            return label
+
+        boxes = np.array([[l["x1"], l["y1"], l["x2"], l["y2"]] for l in label], dtype=np.float32)
+        scores = np.array([l["confidence"] for l in label], dtype=np.float32)
+        if suppression is None:
+            keep = non_max_suppression(boxes, scores, iou_threshold=0.3)
+        else:
+            keep = suppression(boxes, np.argsort(-scores, kind="stable"), None, 0.3, 0)
+        return [label[index] for index in np.sort(keep)]
+
+    return filter_nms
+
+
+def measure(function, labels: list, repeats: int) -> tuple:
+    """
+    Return the median run time of a filter in microseconds and the number of kept labels.
+    """
+    samples = []
+    kept = None
+    for _ in range(repeats):
+        data = [dict(label) for label in labels]
+        start_time = time.perf_counter()
+        kept = len(function(data))
+        samples.append(time.perf_counter() - start_time)
+    return float(np.median(samples)) * 1e6, kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the legacy NMS filter with the pairwise and matrix suppression.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8, 10, 16, 32, 100])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    filters = [
+        ("legacy", legacy_filter_nms),
+        ("pairwise", array_filter(pairwise_suppression)),
+        ("matrix", array_filter(matrix_suppression)),
+        ("selected", array_filter(None))
+    ]
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'boxes':>6} " + " ".join(f"{name + ' (us)':>14}" for name, _ in filters) + f" {'speedup':>8} {'kept':>16}")
+    for size in args.sizes:
+        labels = make_labels(size, rng)
+        results = [measure(function, labels, args.repeats) for _, function in filters]
+        print(
+            f"{size:>6} " + " ".join(f"{elapsed:>14.1f}" for elapsed, _ in results) +
+            f" {results[0][0] / results[-1][0]:>7.1f}x {'/'.join(str(kept) for _, kept in results):>16}"
+        )
+
+
+if __name__ == "__main__":
+    main()
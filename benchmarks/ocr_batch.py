@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.controller.extract import TextExtraction
+from src.model.detection import Detection
+from src.utils.metrics import percentile
+import numpy as np
+import argparse
+import random
+import string
+import time
+import cv2
+
+
+def synthetic_frame(count: int, seed: int) -> tuple:
+    """
+    Draw a frame with several white car plates with black text, laid out on a grid.
+
+    Args:
+        count (int): The number of plates.
+        seed (int): The random seed for the plate texts and sizes.
+
+    Returns:
+        tuple: The frame and the label of every plate.
+    """
+    rng = random.Random(seed)
+    columns = 4
+    cell_width, cell_height = 320, 120
+    rows = (count + columns - 1) // columns
+    frame = np.full((rows * cell_height, columns * cell_width, 3), 60, dtype=np.uint8)
+
+    labels = []
+    for index in range(count):
+        row, column = divmod(index, columns)
+        width, height = rng.randint(200, 300), rng.randint(60, 100)
+        x1, y1 = column * cell_width + 10, row * cell_height + 10
+        text = f"{''.join(rng.choices(string.ascii_uppercase, k=3))} {rng.randint(1, 9999)}"
+
+        cv2.rectangle(frame, (x1, y1), (x1 + width, y1 + height), (255, 255, 255), -1)
+        cv2.putText(frame, text, (x1 + 10, y1 + height * 2 // 3), cv2.FONT_HERSHEY_SIMPLEX, width / 220, (0, 0, 0), 3)
+        labels.append(Detection(x1, y1, x1 + width, y1 + height, 1.0))
+
+    return frame, labels
+
+
+def time_runs(function, repeat: int) -> list:
+    """
+    Time repeated calls of a function.
+
+    Args:
+        function (callable): The function to call.
+        repeat (int): The number of timed calls.
+
+    Returns:
+        list: The duration of every call in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start_time)
+
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-crop and batched OCR of the plates in a frame.")
+    parser.add_argument("--crops", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=["recognize", "readtext"], default="recognize",
+                        help="Recognizer-only reads with readtext fallback, or full readtext on every crop.")
+    args = parser.parse_args()
+
+    extraction = TextExtraction()
+    extraction.mode = args.mode
+    # Repeated reads of the same frame would otherwise be timed as cache hits
+    extraction.cache = None
+
+    print(f"OCR mode: {args.mode}")
+    print(f"{'crops':>6} {'per-crop p50 (ms)':>18} {'batched p50 (ms)':>17} {'per-crop p95 (ms)':>18} {'batched p95 (ms)':>17} {'speedup':>8} {'agree':>6}")
+    for count in args.crops:
+        frame, labels = synthetic_frame(count, args.seed)
+
+        def per_crop():
+            return [extraction.read_car_plate(frame, label) for label in labels]
+
+        def batched():
+            return extraction.read_car_plates(frame, labels)
+
+        for _ in range(args.warmup):
+            per_crop()
+            batched()
+
+        single = time_runs(per_crop, args.repeat)
+        batch = time_runs(batched, args.repeat)
+        agree = sum(a[0] == b[0] for a, b in zip(per_crop(), batched()))
+
+        print(
+            f"{count:>6} {percentile(single, 50) * 1000:>18.1f} {percentile(batch, 50) * 1000:>17.1f} "
+            f"{percentile(single, 95) * 1000:>18.1f} {percentile(batch, 95) * 1000:>17.1f} "
+            f"{percentile(single, 50) / percentile(batch, 50):>7.2f}x {agree:>3}/{count:<2}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.controller.preprocess import PlatePreprocessor
+from src.utils.metrics import percentile
+import numpy as np
+import tracemalloc
+import argparse
+import time
+import cv2
+
+
+def legacy_preprocess(crop: np.ndarray) -> np.ndarray:
+    """
+    The original chain: 2x bicubic resize of the colour crop, then grayscale, then Gaussian blur.
+    """
+    resized = cv2.resize(crop, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+    gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
+    return cv2.GaussianBlur(gray, (5, 5), 0)
+
+
+def make_crops(count: int, seed: int) -> list:
+    """
+    Create synthetic plate crops of varied sizes with text and noise.
+
+    Args:
+        count (int): The number of crops.
+        seed (int): The random seed.
+
+    Returns:
+        list: The BGR crops.
+    """
+    rng = np.random.default_rng(seed)
+    crops = []
+    for _ in range(count):
+        height = int(rng.integers(30, 90))
+        width = int(height * rng.uniform(2.5, 5))
+        crop = np.full((height, width, 3), 230, dtype=np.uint8)
+        cv2.putText(crop, "ABC 1234", (4, height * 3 // 4), cv2.FONT_HERSHEY_SIMPLEX, height / 40, (20, 20, 20), 2)
+        noise = rng.integers(-10, 11, crop.shape)
+        crops.append(np.clip(crop.astype(np.int16) + noise, 0, 255).astype(np.uint8))
+
+    return crops
+
+
+def measure(function, crops: list, repeat: int) -> tuple:
+    """
+    Time a preprocessing function per crop and measure its peak traced allocation per call.
+
+    Args:
+        function (callable): The preprocessing function.
+        crops (list): The BGR crops.
+        repeat (int): The number of passes over the crops.
+
+    Returns:
+        tuple: The per-crop durations in seconds and the mean peak allocation per call in bytes.
+    """
+    for crop in crops:
+        function(crop)
+
+    durations = []
+    for _ in range(repeat):
+        for crop in crops:
+            start_time = time.perf_counter()
+            function(crop)
+            durations.append(time.perf_counter() - start_time)
+
+    peaks = []
+    tracemalloc.start()
+    for crop in crops:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        function(crop)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return durations, sum(peaks) / len(peaks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the original and fused plate preprocessing chains.")
+    parser.add_argument("--crops", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--target-heights", nargs="+", type=int, default=[0, 128, 64],
+                        help="Target heights of the fused chain; 0 keeps the original 2x scale.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    crops = make_crops(args.crops, args.seed)
+    rows = [("legacy 2x", legacy_preprocess, None)]
+    for target_height in args.target_heights:
+        name = "fused 2x" if not target_height else f"fused h={target_height}"
+        rows.append((name, PlatePreprocessor(target_height).process, target_height))
+
+    legacy_durations, legacy_peak = measure(legacy_preprocess, crops, args.repeat)
+    print(f"{len(crops)} crops, {args.repeat} passes")
+    print(f"{'chain':>14} {'p50 (us)':>9} {'p95 (us)':>9} {'peak alloc (KiB)':>17} {'speedup':>8} {'max diff vs legacy':>19}")
+    for name, function, target_height in rows:
+        durations, peak = (legacy_durations, legacy_peak) if target_height is None else measure(function, crops, args.repeat)
+
+        # Only the 2x chains produce the same output size, so only they are compared pixel by pixel
+        diff = "-"
+        if not target_height:
+            diff = str(max(int(np.abs(function(crop).astype(np.int16) - legacy_preprocess(crop)).max()) for crop in crops))
+
+        print(
+            f"{name:>14} {percentile(durations, 50) * 1e6:>9.1f} {percentile(durations, 95) * 1e6:>9.1f} "
+            f"{peak / 1024:>17.1f} {percentile(legacy_durations, 50) / percentile(durations, 50):>7.2f}x {diff:>19}"
+        )
+
+
+if __name__ == "__main__":
+    main()
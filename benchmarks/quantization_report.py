@@ -0,0 +1,179 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.model.predict import PredictDetectionModel
+from src.model.nms import box_iou_matrix
+from src.utils.metrics import percentile
+from src.utils.config import MODEL_PATH
+import numpy as np
+import argparse
+import time
+import cv2
+
+
+def load_dataset(images_folder: str, labels_folder: str) -> list:
+    """
+    Load images with their YOLO-format ground truth labels.
+
+    Each label file has one "class cx cy w h" line per plate, normalized to the image size.
+
+    Args:
+        images_folder (str): The folder with images.
+        labels_folder (str): The folder with one .txt label file per image.
+
+    Returns:
+        list: The (frame, ground truth boxes, ground truth classes) of every image.
+    """
+    dataset = []
+    for name in sorted(os.listdir(images_folder)):
+        if not name.lower().endswith((".jpg", ".jpeg", ".png", ".bmp")):
+            continue
+
+        frame = cv2.imread(os.path.join(images_folder, name))
+        height, width = frame.shape[:2]
+        label_path = os.path.join(labels_folder, f"{os.path.splitext(name)[0]}.txt")
+
+        rows = np.loadtxt(label_path, ndmin=2) if os.path.exists(label_path) else np.empty((0, 5))
+        classes = rows[:, 0].astype(int)
+        cx, cy, w, h = rows[:, 1] * width, rows[:, 2] * height, rows[:, 3] * width, rows[:, 4] * height
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        dataset.append((frame, boxes, classes))
+
+    return dataset
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    """
+    Compute the area under the precision-recall curve with all-point interpolation.
+
+    Args:
+        recall (np.ndarray): The cumulative recall, sorted by descending confidence.
+        precision (np.ndarray): The cumulative precision, sorted by descending confidence.
+
+    Returns:
+        float: The average precision.
+    """
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    precision = np.concatenate([[1.0], precision, [0.0]])
+    precision = np.flip(np.maximum.accumulate(np.flip(precision)))
+    changes = np.where(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[changes + 1] - recall[changes]) * precision[changes + 1]))
+
+
+def evaluate(dataset: list, predictions: list, iou_threshold: float) -> tuple:
+    """
+    Compute mAP and recall of the predictions against the ground truth.
+
+    Args:
+        dataset (list): The (frame, ground truth boxes, ground truth classes) of every image.
+        predictions (list): The detections of every image.
+        iou_threshold (float): The minimum IoU for a detection to count as a true positive.
+
+    Returns:
+        tuple: The mAP over classes and the recall over all ground truth boxes.
+    """
+    classes = sorted({int(c) for _, _, gt_classes in dataset for c in gt_classes})
+    average_precisions, true_positives_total, ground_truth_total = [], 0, 0
+
+    for class_id in classes:
+        scores, hits, ground_truth_count = [], [], 0
+        for (_, gt_boxes, gt_classes), detections in zip(dataset, predictions):
+            gt = gt_boxes[gt_classes == class_id]
+            ground_truth_count += len(gt)
+            dets = sorted((d for d in detections if d.class_id == class_id), key=lambda d: -d.confidence)
+            matched = np.zeros(len(gt), dtype=bool)
+
+            for det in dets:
+                scores.append(det.confidence)
+                if not len(gt):
+                    hits.append(False)
+                    continue
+
+                boxes = np.vstack([[det.x1, det.y1, det.x2, det.y2], gt])
+                ious = box_iou_matrix(boxes)[0, 1:]
+                ious[matched] = 0
+                best = int(np.argmax(ious))
+                hit = ious[best] >= iou_threshold
+                if hit:
+                    matched[best] = True
+                hits.append(hit)
+
+        if not ground_truth_count:
+            continue
+
+        order = np.argsort(-np.array(scores)) if scores else np.empty(0, dtype=int)
+        hits = np.array(hits, dtype=bool)[order]
+        true_positives = np.cumsum(hits)
+        false_positives = np.cumsum(~hits)
+        recall = true_positives / ground_truth_count
+        precision = true_positives / np.maximum(true_positives + false_positives, 1)
+        average_precisions.append(average_precision(recall, precision) if len(hits) else 0.0)
+        true_positives_total += int(hits.sum())
+        ground_truth_total += ground_truth_count
+
+    mean_ap = float(np.mean(average_precisions)) if average_precisions else 0.0
+    recall = true_positives_total / ground_truth_total if ground_truth_total else 0.0
+    return mean_ap, recall
+
+
+def run_model(model: PredictDetectionModel, dataset: list, warmup: int) -> tuple:
+    """
+    Run a model over the dataset.
+
+    Args:
+        model (PredictDetectionModel): The model to run.
+        dataset (list): The (frame, ground truth boxes, ground truth classes) of every image.
+        warmup (int): The number of untimed runs on the first image.
+
+    Returns:
+        tuple: The per-image latencies in seconds and the per-image detections.
+    """
+    for _ in range(warmup):
+        model.predict(dataset[0][0])
+
+    latencies, predictions = [], []
+    for frame, _, _ in dataset:
+        start_time = time.perf_counter()
+        predictions.append(model.predict(frame) or [])
+        latencies.append(time.perf_counter() - start_time)
+
+    return latencies, predictions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report accuracy and latency of quantized detector modes.")
+    parser.add_argument("--images", required=True, help="Folder of labelled images.")
+    parser.add_argument("--labels", required=True, help="Folder of YOLO-format label files.")
+    parser.add_argument("--model", default=MODEL_PATH, help="Path to the PyTorch weights.")
+    parser.add_argument("--backend", default="onnx")
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8-dynamic", "int8-static"],
+                        help="Precisions to compare; the first is the baseline for the deltas.")
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--warmup", type=int, default=3)
+    args = parser.parse_args()
+
+    dataset = load_dataset(args.images, args.labels)
+    if not dataset:
+        print(f"No images found in {args.images}")
+        return
+
+    rows = []
+    for precision in args.precisions:
+        model = PredictDetectionModel(args.model, backend=args.backend, precision=precision)
+        latencies, predictions = run_model(model, dataset, args.warmup)
+        mean_ap, recall = evaluate(dataset, predictions, args.iou)
+        rows.append((precision, mean_ap, recall, percentile(latencies, 50), percentile(latencies, 95)))
+
+    baseline = rows[0]
+    print(f"{len(dataset)} images, {args.backend} backend, mAP@{args.iou}")
+    print(f"{'precision':>13} {'mAP':>7} {'dmAP':>7} {'recall':>7} {'drecall':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'speedup':>8}")
+    for precision, mean_ap, recall, p50, p95 in rows:
+        print(
+            f"{precision:>13} {mean_ap:>7.3f} {mean_ap - baseline[1]:>+7.3f} {recall:>7.3f} {recall - baseline[2]:>+8.3f} "
+            f"{p50 * 1000:>9.1f} {p95 * 1000:>9.1f} {baseline[3] / p50 if p50 else 0:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+from src.utils.config import OCR_MIN_CONFIDENCE, OCR_VOTE_AGREEMENT, OCR_VOTE_MIN_VOTES, OCR_VOTE_WINDOW, TRACK_MAX_OCR_ATTEMPTS
+
+
+class PlateConsensus:
+
+    def __init__(self) -> None:
+        """
+        Initialize the confidence-weighted vote over the OCR readings of one tracked plate.
+        """
+        self.readings = []
+        self.attempts = 0
+        self.committed = None
+        self.confident = False
+
+
+    def votes(self) -> dict:
+        """
+        Sum the confidence of the kept readings per car plate.
+
+        Returns:
+            dict: The total confidence weight of every car plate.
+        """
+        votes = {}
+        for confidence, car_plate in self.readings:
+            votes[car_plate] = votes.get(car_plate, 0.0) + confidence
+        return votes
+
+
+    def leader(self) -> tuple:
+        """
+        Return the car plate with the most weight and its share of all weight.
+
+        Returns:
+            tuple: The leading car plate and its agreement between 0 and 1, or (None, 0.0).
+        """
+        votes = self.votes()
+        if not votes:
+            return None, 0.0
+
+        car_plate = max(votes, key=votes.get)
+        return car_plate, votes[car_plate] / sum(votes.values())
+
+
+    def add(self, car_plate: str, confidence: float) -> str:
+        """
+        Add an OCR reading and commit a car plate once enough readings agree.
+
+        Only the OCR_VOTE_WINDOW most confident readings are kept. A car plate is committed when
+        a single reading reaches OCR_MIN_CONFIDENCE, when at least OCR_VOTE_MIN_VOTES readings
+        give it OCR_VOTE_AGREEMENT of the weight, or when the OCR attempts run out.
+
+        Args:
+            car_plate (str): The car plate read from the current crop, or None.
+            confidence (float): The OCR confidence of the reading.
+
+        Returns:
+            str: The committed car plate, or None if the vote is still open.
+        """
+        if self.committed:
+            return self.committed
+
+        self.attempts += 1
+        if car_plate:
+            self.readings.append((confidence, car_plate))
+            self.readings.sort(reverse=True)
+            del self.readings[OCR_VOTE_WINDOW:]
+
+            if confidence >= OCR_MIN_CONFIDENCE:
+                self.committed = car_plate
+                self.confident = True
+                return self.committed
+
+        leader, agreement = self.leader()
+        if leader is None:
+            return None
+
+        leader_votes = sum(1 for _, reading in self.readings if reading == leader)
+        if (leader_votes >= OCR_VOTE_MIN_VOTES and agreement >= OCR_VOTE_AGREEMENT) or self.exhausted():
+            self.committed = leader
+
+        return self.committed
+
+
+    def exhausted(self) -> bool:
+        """
+        Check if the track has used all of its OCR attempts.
+
+        Returns:
+            bool: True if no more OCR attempts are allowed.
+        """
+        return self.attempts >= TRACK_MAX_OCR_ATTEMPTS
@@ -1,26 +1,46 @@
+from src.utils.config import WARMUP_RUNS, OCR_MODE, OCR_FALLBACK_CONFIDENCE, OCR_STACKED_RATIO, OCR_CACHE_SIZE, OCR_MIN_CONFIDENCE
+from src.controller.preprocess import PlatePreprocessor
+from src.controller.ocr_cache import OCRCache
+from src.model.detection import Detection
+from src.utils.metrics import Metrics
 from src.utils.log import write_log
 import numpy as np
-import easyocr
+import threading
+import bisect
+import time
 import cv2
 import re
 
 
 class TextExtraction:
 
-    def __init__(self) -> None:
+    def __init__(self, load_reader: bool = True) -> None:
         """
         Initialize the EasyOCR reader.
+
+        Args:
+            load_reader (bool): Load the EasyOCR reader in this process; False when OCR runs elsewhere.
         """
-        self.reader = easyocr.Reader(['en'])
+        self.reader = None
+        if load_reader:
+            import easyocr
+
+            self.reader = easyocr.Reader(['en'])
 
+        self.lock = threading.Lock()
+        self.mode = OCR_MODE
+        self.metrics = Metrics("ocr")
+        self.cache = OCRCache() if OCR_CACHE_SIZE > 0 else None
+        self.preprocessor = PlatePreprocessor()
 
-    def crop_bounding_box(self, image: np.ndarray, label: dict) -> np.ndarray:
+
+    def crop_bounding_box(self, image: np.ndarray, label: Detection) -> np.ndarray:
         """
         Crop the bounding box from the image using the coordinates provided in the label.
 
         Args:
             image (np.ndarray): The image to crop the bounding box from.
-            label (dict): The label containing the bounding box coordinates.
+            label (Detection): The label containing the bounding box coordinates.
 
         Returns:
             np.ndarray: The cropped image.
@@ -32,10 +52,10 @@ class TextExtraction:
             if image is None:
                 raise FileNotFoundError(f"Image not found at {image}")
 
-            x_min = label.get("x1")
-            y_min = label.get("y1")
-            x_max = label.get("x2")
-            y_max = label.get("y2")
+            x_min = label.x1
+            y_min = label.y1
+            x_max = label.x2
+            y_max = label.y2
             
             if None in [x_min, y_min, x_max, y_max]:
                 raise ValueError("Bounding box coordinates are incomplete")
@@ -122,41 +142,325 @@ class TextExtraction:
             write_log("error", f"[TextExtraction] Failed to format car plate: {e}")
 
 
-    def get_car_plate(self, image: str, label: dict) -> str:
+    def preprocess_crop(self, image: np.ndarray, label: Detection) -> np.ndarray:
         """
-        Extract the car plate number from the image.
+        Crop the car plate from the image and prepare it for OCR.
 
         Args:
-            image (str): The path to the image.
-            label (dict): The label containing the bounding box coordinates.
+            image (np.ndarray): The image containing the car plate.
+            label (Detection): The label containing the bounding box coordinates.
 
         Returns:
-            str: The extracted car plate number.
+            np.ndarray: The preprocessed grayscale crop.
         """
-        try:
-            cropped_image = self.crop_bounding_box(image, label)
+        cropped_image = self.crop_bounding_box(image, label)
+        if cropped_image is None:
+            return None
 
-            # Resize the image by a factor of 2x
-            resized_image = self.resize_image(cropped_image, 2)
+        # Convert to grayscale, resize to the target plate height and denoise in one pass
+        return self.preprocessor.process(cropped_image)
 
-            # Convert to grayscale
-            grayscale_image = self.convert_to_grayscale(resized_image)
 
-            # Denoise the image
-            denoised_image = self.denoise_image(grayscale_image)
-            
-            # Extract text using EasyOCR
-            easyocr_results = self.reader.readtext(denoised_image)
-            extracted_text = [result[1] for result in easyocr_results if result[2] > 0.25]
-            
-            if not extracted_text:
-                return None
+    def parse_results(self, easyocr_results: list) -> tuple:
+        """
+        Turn the EasyOCR results of one crop into a car plate number and its confidence.
 
-            combined_text = ' '.join(extracted_text)
-            car_plate = self.format_car_plate(combined_text)
-            
-            return car_plate
+        Args:
+            easyocr_results (list): The (box, text, confidence) results of the crop.
+
+        Returns:
+            tuple: The car plate number and its mean OCR confidence, or (None, 0.0).
+        """
+        confident_results = [result for result in easyocr_results if result[2] > 0.25]
+        if not confident_results:
+            return None, 0.0
+
+        combined_text = ' '.join(result[1] for result in confident_results)
+        car_plate = self.format_car_plate(combined_text)
+        if not car_plate:
+            return None, 0.0
+
+        confidence = sum(result[2] for result in confident_results) / len(confident_results)
+        return car_plate, confidence
+
+
+    def pad_crops(self, crops: list) -> list:
+        """
+        Pad the crops to a common size so they can be read in one batch, without distorting the text.
+
+        Args:
+            crops (list): The preprocessed grayscale crops.
+
+        Returns:
+            list: The crops padded on the bottom and right by repeating their edges.
+        """
+        height = max(crop.shape[0] for crop in crops)
+        width = max(crop.shape[1] for crop in crops)
+        return [
+            cv2.copyMakeBorder(crop, 0, height - crop.shape[0], 0, width - crop.shape[1], cv2.BORDER_REPLICATE)
+            for crop in crops
+        ]
+
+
+    def text_regions(self, crop: np.ndarray, offset_y: int = 0) -> list:
+        """
+        Split a plate crop into its text rows, one row for a normal plate or two for a stacked plate.
+
+        The rows of a stacked plate are split at the row with the least horizontal edge energy
+        in the middle band of the crop, which falls in the gap between the two lines of text.
+
+        Args:
+            crop (np.ndarray): The preprocessed grayscale crop.
+            offset_y (int): The vertical offset of the crop in the image passed to the recognizer.
+
+        Returns:
+            list: The [x_min, x_max, y_min, y_max] text regions, top row first.
+        """
+        height, width = crop.shape[:2]
+        if width / height >= OCR_STACKED_RATIO:
+            return [[0, width, offset_y, offset_y + height]]
+
+        energy = np.abs(np.diff(crop.astype(np.int16), axis=1)).sum(axis=1)
+        top, bottom = int(height * 0.3), int(height * 0.7)
+        split = top + int(np.argmin(energy[top:bottom]))
+        self.metrics.increment("stacked")
+        return [[0, width, offset_y, offset_y + split], [0, width, offset_y + split, offset_y + height]]
+
+
+    def recognize_crops(self, crops: list) -> list:
+        """
+        Read the plate crops with the EasyOCR recognizer only, skipping its text detector.
+
+        The crops are stacked into one image and their text regions are recognized in one batch.
+
+        Args:
+            crops (list): The preprocessed grayscale crops.
+
+        Returns:
+            list: The (car plate number, confidence) of every crop, in crop order.
+        """
+        width = max(crop.shape[1] for crop in crops)
+        padded_crops = [cv2.copyMakeBorder(crop, 0, 0, 0, width - crop.shape[1], cv2.BORDER_REPLICATE) for crop in crops]
+        canvas = cv2.vconcat(padded_crops) if len(padded_crops) > 1 else padded_crops[0]
+
+        offsets, regions, offset_y = [], [], 0
+        for crop in crops:
+            offsets.append(offset_y)
+            regions.extend(self.text_regions(crop, offset_y))
+            offset_y += crop.shape[0]
+
+        start_time = time.perf_counter()
+        with self.lock:
+            easyocr_results = self.reader.recognize(canvas, horizontal_list=regions, free_list=[], batch_size=len(regions))
+        self.metrics.observe("recognize", time.perf_counter() - start_time)
+
+        # Each result box starts at the top of its region, which falls inside the crop it came from
+        grouped_results = [[] for _ in crops]
+        for result in easyocr_results:
+            grouped_results[bisect.bisect_right(offsets, result[0][0][1]) - 1].append(result)
+
+        return [self.parse_results(results) for results in grouped_results]
+
+
+    def readtext_crops(self, crops: list) -> list:
+        """
+        Read the plate crops with the full EasyOCR text detector and recognizer.
+
+        Args:
+            crops (list): The preprocessed grayscale crops.
+
+        Returns:
+            list: The (car plate number, confidence) of every crop, in crop order.
+        """
+        start_time = time.perf_counter()
+
+        # The reader is shared between camera pipelines, so only one thread may run it at a time
+        with self.lock:
+            if len(crops) == 1:
+                batched_results = [self.reader.readtext(crops[0])]
+            else:
+                padded_crops = self.pad_crops(crops)
+                batched_results = self.reader.readtext_batched(padded_crops, batch_size=len(padded_crops))
+
+        self.metrics.observe("readtext", time.perf_counter() - start_time)
+        return [self.parse_results(results) for results in batched_results]
+
+
+    def ocr_crops(self, crops: list) -> list:
+        """
+        Read the plate crops, using the recognizer only and falling back to full readtext on low confidence.
+
+        Args:
+            crops (list): The preprocessed grayscale crops.
+
+        Returns:
+            list: The (car plate number, confidence) of every crop, in crop order.
+        """
+        results = [(None, 0.0)] * len(crops)
+        fallback = list(range(len(crops)))
+        if self.mode == "recognize":
+            results = self.recognize_crops(crops)
+            fallback = [index for index, result in enumerate(results) if result[1] < OCR_FALLBACK_CONFIDENCE]
+            self.metrics.increment("recognized", len(crops) - len(fallback))
+
+        if fallback:
+            self.metrics.increment("readtext", len(fallback))
+            for index, result in zip(fallback, self.readtext_crops([crops[index] for index in fallback])):
+                if result[1] > results[index][1]:
+                    results[index] = result
+
+        return results
+
+
+    def read_crops(self, crops: list, with_hits: bool = False) -> list:
+        """
+        Read the plate crops, answering near-identical crops from the OCR cache.
+
+        Only readings confident enough to commit a plate on their own are cached. A failed or
+        uncertain reading is read again, so a stationary plate keeps adding fresh votes.
+
+        Args:
+            crops (list): The preprocessed grayscale crops, None for crops that failed.
+            with_hits (bool): Add whether every reading was answered from the cache.
+
+        Returns:
+            list: The (car plate number, confidence) of every crop, in crop order, or (None, 0.0),
+                followed by the cache hit flag when with_hits is set.
+        """
+        results = [(None, 0.0)] * len(crops)
+        hits = [False] * len(crops)
+        keys = {}
+        misses = []
+        for index, crop in enumerate(crops):
+            if crop is None:
+                continue
+
+            if self.cache is None:
+                misses.append(index)
+                continue
+
+            keys[index], cached = self.cache.lookup(crop)
+            if cached is None:
+                misses.append(index)
+            else:
+                results[index] = cached
+                hits[index] = True
+
+        if self.cache is not None:
+            self.metrics.increment("cache_hits", len(keys) - len(misses))
+            self.metrics.increment("cache_misses", len(misses))
+
+        if misses:
+            for index, result in zip(misses, self.ocr_crops([crops[index] for index in misses])):
+                results[index] = result
+                if self.cache is not None and result[0] and result[1] >= OCR_MIN_CONFIDENCE:
+                    self.cache.store(keys[index], result)
+
+            if self.cache is not None:
+                self.metrics.set_gauge("cache_size", len(self.cache))
+
+        if with_hits:
+            return [(car_plate, confidence, hit) for (car_plate, confidence), hit in zip(results, hits)]
+
+        return results
+
+
+    def read_car_plate(self, image: str, label: Detection) -> tuple:
+        """
+        Extract the car plate number and the OCR confidence from the image.
+
+        Args:
+            image (str): The path to the image.
+            label (Detection): The label containing the bounding box coordinates.
+
+        Returns:
+            tuple: The extracted car plate number and its mean OCR confidence, or (None, 0.0).
+        """
+        try:
+            return self.read_crops([self.preprocess_crop(image, label)])[0]
         
         except Exception as e:
             write_log("error", f"[TextExtraction] Failed to extract car plate: {e}")
-    
\ No newline at end of file
+            return None, 0.0
+
+
+    def read_car_plates(self, image: np.ndarray, labels: list, with_hits: bool = False) -> list:
+        """
+        Extract the car plate numbers and OCR confidences of several labels in one batched OCR call.
+
+        Args:
+            image (np.ndarray): The image containing the car plates.
+            labels (list): The labels containing the bounding box coordinates.
+            with_hits (bool): Add whether every reading was answered from the cache.
+
+        Returns:
+            list: The (car plate number, confidence) of every label, in label order, followed by
+                the cache hit flag when with_hits is set.
+        """
+        try:
+            if isinstance(image, str):
+                image = cv2.imread(image)
+
+            return self.read_crops([self.preprocess_crop(image, label) for label in labels], with_hits)
+
+        except Exception as e:
+            write_log("error", f"[TextExtraction] Failed to extract car plates in a batch: {e}")
+            readings = [self.read_car_plate(image, label) for label in labels]
+            return [reading + (False,) for reading in readings] if with_hits else readings
+
+
+    def get_car_plate(self, image: str, label: Detection) -> str:
+        """
+        Extract the car plate number from the image.
+
+        Args:
+            image (str): The path to the image.
+            label (Detection): The label containing the bounding box coordinates.
+
+        Returns:
+            str: The extracted car plate number.
+        """
+        car_plate, _ = self.read_car_plate(image, label)
+        return car_plate
+
+
+    def get_car_plates(self, image: np.ndarray, labels: list) -> list:
+        """
+        Extract the car plate numbers of several labels in one batched OCR call.
+
+        Args:
+            image (np.ndarray): The image containing the car plates.
+            labels (list): The labels containing the bounding box coordinates.
+
+        Returns:
+            list: The extracted car plate number of every label, in label order.
+        """
+        return [car_plate for car_plate, _ in self.read_car_plates(image, labels)]
+
+
+    def warmup(self, runs: int = WARMUP_RUNS) -> float:
+        """
+        Run the OCR reader on a synthetic plate so the first vehicle does not pay the first-run cost.
+
+        Args:
+            runs (int): The number of warm-up passes.
+
+        Returns:
+            float: The duration of the last pass in seconds.
+        """
+        image = np.full((120, 360, 3), 255, dtype=np.uint8)
+        cv2.putText(image, "ABC 1234", (20, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 5)
+        label = Detection(0, 0, image.shape[1], image.shape[0], 1.0)
+
+        # The cache is bypassed, so every pass runs the reader and the synthetic plate never reaches the cache
+        duration = 0.0
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            self.ocr_crops([self.preprocess_crop(image, label)])
+            duration = time.perf_counter() - start_time
+
+            # Also warm the full text detector used as the low-confidence fallback
+            if self.mode == "recognize":
+                self.readtext_crops([self.preprocess_crop(image, label)])
+
+        return duration
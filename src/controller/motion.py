@@ -0,0 +1,86 @@
+from src.utils.config import MOTION_WIDTH, MOTION_PIXEL_THRESHOLD, MOTION_SENSITIVITY, MOTION_HEARTBEAT, MOTION_HOLD
+from src.utils.log import write_log
+import numpy as np
+import cv2
+
+
+class MotionGate:
+
+    def __init__(self) -> None:
+        """
+        Initialize the frame-differencing gate that decides when the detector needs to run.
+        """
+        self.previous = None
+        self.frames_since_detection = 0
+        self.hold = 0
+
+
+    def downsample(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Convert the frame to a small, blurred grayscale image for cheap comparison.
+
+        Args:
+            frame (np.ndarray): The full-size BGR frame.
+
+        Returns:
+            np.ndarray: The downsampled grayscale frame.
+        """
+        height, width = frame.shape[:2]
+        small_height = max(1, int(height * MOTION_WIDTH / width))
+        small = cv2.resize(frame, (MOTION_WIDTH, small_height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+
+    def motion_ratio(self, frame: np.ndarray) -> float:
+        """
+        Compute the share of pixels that changed since the previous frame.
+
+        Args:
+            frame (np.ndarray): The full-size BGR frame.
+
+        Returns:
+            float: The share of changed pixels, between 0 and 1.
+        """
+        current = self.downsample(frame)
+        if self.previous is None or self.previous.shape != current.shape:
+            self.previous = current
+            return 1.0
+
+        diff = cv2.absdiff(current, self.previous)
+        self.previous = current
+        return np.count_nonzero(diff > MOTION_PIXEL_THRESHOLD) / diff.size
+
+
+    def should_detect(self, frame: np.ndarray) -> tuple:
+        """
+        Decide whether the detector should run on the frame.
+
+        Detection runs when enough pixels changed, for MOTION_HOLD frames after the last motion,
+        and on every MOTION_HEARTBEAT-th frame so a vehicle that stopped is not missed.
+
+        Args:
+            frame (np.ndarray): The full-size BGR frame.
+
+        Returns:
+            tuple: Whether to run detection and the reason ("motion", "hold", "heartbeat" or "static").
+        """
+        try:
+            if self.motion_ratio(frame) >= MOTION_SENSITIVITY:
+                reason = "motion"
+                self.hold = MOTION_HOLD
+            elif self.hold > 0:
+                reason = "hold"
+                self.hold -= 1
+            elif self.frames_since_detection + 1 >= MOTION_HEARTBEAT:
+                reason = "heartbeat"
+            else:
+                self.frames_since_detection += 1
+                return False, "static"
+
+            self.frames_since_detection = 0
+            return True, reason
+
+        except Exception as e:
+            write_log("error", f"[MotionGate] Failed to check motion: {e}")
+            return True, "error"
@@ -0,0 +1,106 @@
+from src.utils.config import OCR_CACHE_SIZE, OCR_CACHE_TOLERANCE, OCR_CACHE_TTL
+from collections import OrderedDict
+import numpy as np
+import threading
+import time
+import cv2
+
+
+HASH_WIDTH = 32
+HASH_HEIGHT = 16
+HASH_MARGIN = 2
+
+
+def dhash(crop: np.ndarray, width: int = HASH_WIDTH, height: int = HASH_HEIGHT, margin: int = HASH_MARGIN) -> int:
+    """
+    Compute the difference hash of a grayscale crop.
+
+    Each bit records whether the right neighbour of a pixel of the downscaled crop is brighter by
+    more than the margin, so the hash ignores exposure changes and sensor noise on flat areas but
+    not the shape of the characters. The hash is wider than the usual 8x8 so that plates differing
+    in a single character stay far apart.
+
+    Args:
+        crop (np.ndarray): The grayscale crop.
+        width (int): The number of horizontal gradients per row.
+        height (int): The number of rows.
+        margin (int): The smallest brightness step counted as a gradient.
+
+    Returns:
+        int: The width * height bit hash.
+    """
+    small = cv2.resize(crop, (width + 1, height), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = (small[:, 1:] - small[:, :-1] > margin).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class OCRCache:
+
+    def __init__(self, max_size: int = OCR_CACHE_SIZE, tolerance: float = OCR_CACHE_TOLERANCE, ttl: float = OCR_CACHE_TTL) -> None:
+        """
+        Initialize the LRU cache of OCR results keyed by the perceptual hash of the plate crop.
+
+        Args:
+            max_size (int): The maximum number of cached crops, 0 to disable the cache.
+            tolerance (float): The largest fraction of differing hash bits for two crops to match.
+            ttl (float): The number of seconds a cached result stays valid.
+        """
+        self.max_size = max_size
+        self.max_distance = int(tolerance * HASH_WIDTH * HASH_HEIGHT)
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+
+    def lookup(self, crop: np.ndarray) -> tuple:
+        """
+        Find the cached OCR result of a crop, or of a near-identical crop.
+
+        Args:
+            crop (np.ndarray): The preprocessed grayscale crop.
+
+        Returns:
+            tuple: The hash of the crop and the cached (car plate number, confidence), or None on a miss.
+        """
+        key = dhash(crop)
+        now = time.monotonic()
+
+        with self.lock:
+            expired = [cached_key for cached_key, (stored_at, _) in self.entries.items() if now - stored_at > self.ttl]
+            for cached_key in expired:
+                del self.entries[cached_key]
+
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return key, self.entries[key][1]
+
+            best_key, best_distance = None, self.max_distance + 1
+            for cached_key in self.entries:
+                distance = (key ^ cached_key).bit_count()
+                if distance < best_distance:
+                    best_key, best_distance = cached_key, distance
+
+            if best_key is None:
+                return key, None
+
+            self.entries.move_to_end(best_key)
+            return key, self.entries[best_key][1]
+
+
+    def store(self, key: int, result: tuple) -> None:
+        """
+        Cache the OCR result of a crop, evicting the least recently used crop when full.
+
+        Args:
+            key (int): The hash of the crop.
+            result (tuple): The (car plate number, confidence) read from the crop.
+        """
+        with self.lock:
+            self.entries[key] = (time.monotonic(), result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+
+    def __len__(self) -> int:
+        return len(self.entries)
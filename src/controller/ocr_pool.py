@@ -0,0 +1,300 @@
+from src.utils.config import OCR_WORKERS, OCR_TORCH_THREADS, OCR_POOL_QUEUE, OCR_POOL_SLOT_KB, OCR_POOL_TIMEOUT
+from src.utils.config import RECONNECT_DELAY
+from concurrent.futures import Future, TimeoutError
+from multiprocessing import shared_memory
+from src.controller.extract import TextExtraction
+from src.utils.log import write_log
+import multiprocessing
+import itertools
+import numpy as np
+import threading
+import queue
+import time
+import os
+
+
+def ocr_worker(worker_id: int, tasks, results, slot_names: list, torch_threads: int) -> None:
+    """
+    Run OCR tasks in a worker process with its own preloaded and warmed-up EasyOCR reader.
+
+    Each task names the shared memory slot holding its crops and the shape of every crop,
+    or carries the crops itself when they did not fit in a slot.
+
+    Args:
+        worker_id (int): The index of the worker.
+        tasks (multiprocessing.Queue): The (task ID, slot, shapes, crops) tasks, None to stop.
+        results (multiprocessing.Queue): The ("ready" | "result" | "error", worker or task ID, payload) messages.
+        slot_names (list): The names of the shared memory slots.
+        torch_threads (int): The number of torch threads of the worker.
+    """
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+
+    # The cache lives in the parent process, in front of the pool
+    extraction = TextExtraction()
+    extraction.cache = None
+    extraction.warmup()
+    results.put(("ready", worker_id, None))
+
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+
+            task_id, slot, shapes, crops = task
+            try:
+                if crops is None:
+                    crops, offset = [], 0
+                    for shape in shapes:
+                        size = int(np.prod(shape))
+                        crops.append(np.ndarray(shape, dtype=np.uint8, buffer=slots[slot].buf, offset=offset).copy())
+                        offset += size
+
+                results.put(("result", task_id, extraction.ocr_crops(crops)))
+            except Exception as e:
+                results.put(("error", task_id, str(e)))
+
+    finally:
+        for shared in slots:
+            shared.close()
+
+
+class OCRProcessPool(TextExtraction):
+
+    def __init__(self, workers: int = OCR_WORKERS, torch_threads: int = OCR_TORCH_THREADS, queue_depth: int = OCR_POOL_QUEUE) -> None:
+        """
+        Initialize the text extractor that runs EasyOCR in worker processes, off the main interpreter.
+
+        Cropping, preprocessing and the OCR cache stay in this process. The preprocessed crops are
+        copied into one of queue_depth shared memory slots and read by whichever worker is free.
+        The pool counters and timings are added to the "ocr" metrics with a "pool_" prefix.
+
+        Args:
+            workers (int): The number of worker processes, each with its own EasyOCR reader.
+            torch_threads (int): The number of torch threads of every worker.
+            queue_depth (int): The maximum number of OCR tasks queued or running at once.
+        """
+        super().__init__(load_reader=False)
+        self.workers = max(1, workers)
+        self.torch_threads = torch_threads
+        self.context = multiprocessing.get_context("spawn")
+        self.tasks = self.context.Queue()
+        self.results = self.context.Queue()
+        self.slot_size = OCR_POOL_SLOT_KB * 1024
+        self.slots = [shared_memory.SharedMemory(create=True, size=self.slot_size) for _ in range(max(1, queue_depth))]
+        self.free_slots = queue.Queue()
+        for slot in range(len(self.slots)):
+            self.free_slots.put(slot)
+
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.task_ids = itertools.count(1)
+        self.ready = set()
+        self.ready_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.restart_times = {}
+
+        self.processes = [self.start_worker(worker_id) for worker_id in range(self.workers)]
+        self.collector = threading.Thread(target=self.collect, name="ocr-pool-collector", daemon=True)
+        self.collector.start()
+
+
+    def start_worker(self, worker_id: int):
+        """
+        Start a worker process.
+
+        Args:
+            worker_id (int): The index of the worker.
+
+        Returns:
+            multiprocessing.Process: The started worker process.
+        """
+        process = self.context.Process(
+            target=ocr_worker,
+            args=(worker_id, self.tasks, self.results, [slot.name for slot in self.slots], self.torch_threads),
+            name=f"ocr-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        return process
+
+
+    def submit(self, crops: list) -> Future:
+        """
+        Queue preprocessed crops for OCR, waiting for a free slot when the queue is full.
+
+        Args:
+            crops (list): The preprocessed grayscale crops.
+
+        Returns:
+            Future: The future that resolves to the (car plate number, confidence) of every crop.
+        """
+        future = Future()
+        slot = self.free_slots.get()
+        task_id = future.task_id = next(self.task_ids)
+        shapes = [crop.shape for crop in crops]
+
+        # Crops that do not fit in a slot are pickled with the task instead
+        payload = None
+        if sum(crop.nbytes for crop in crops) <= self.slot_size:
+            offset = 0
+            for crop in crops:
+                target = np.ndarray(crop.shape, dtype=np.uint8, buffer=self.slots[slot].buf, offset=offset)
+                target[...] = crop
+                offset += crop.nbytes
+        else:
+            payload = [np.ascontiguousarray(crop) for crop in crops]
+            self.metrics.increment("pool_pickled_tasks")
+
+        with self.pending_lock:
+            self.pending[task_id] = (future, slot, time.perf_counter())
+
+        self.tasks.put((task_id, slot, shapes, payload))
+        self.metrics.increment("pool_tasks")
+        self.metrics.set_gauge("pool_in_flight", len(self.pending))
+        return future
+
+
+    def release(self, task_id: int) -> tuple:
+        """
+        Forget a task and return its slot to the free slots, once.
+
+        Args:
+            task_id (int): The ID of the task.
+
+        Returns:
+            tuple: The (future, slot, submit time) of the task, or None if it was already released.
+        """
+        with self.pending_lock:
+            task = self.pending.pop(task_id, None)
+
+        if task is not None:
+            self.free_slots.put(task[1])
+
+        return task
+
+
+    def collect(self) -> None:
+        """
+        Resolve the futures of finished tasks and restart workers that died.
+        """
+        last_watch = time.time()
+        while not self.stop_event.is_set():
+            if time.time() - last_watch >= 1:
+                self.watch()
+                last_watch = time.time()
+
+            try:
+                kind, key, payload = self.results.get(timeout=1)
+            except queue.Empty:
+                continue
+            except Exception as e:
+                write_log("error", f"[OCRProcessPool] Failed to read worker result: {e}")
+                continue
+
+            if kind == "ready":
+                self.ready.add(key)
+                if len(self.ready) >= self.workers:
+                    self.ready_event.set()
+                continue
+
+            task = self.release(key)
+            if task is None:
+                continue
+
+            future, _, submit_time = task
+            self.metrics.observe("pool_task", time.perf_counter() - submit_time)
+            if kind == "result":
+                future.set_result(payload)
+            else:
+                self.metrics.increment("pool_errors")
+                future.set_exception(RuntimeError(payload))
+
+
+    def watch(self) -> None:
+        """
+        Restart any worker process that exited, at most once every RECONNECT_DELAY seconds per worker.
+        """
+        for worker_id, process in enumerate(self.processes):
+            if process.is_alive() or self.stop_event.is_set():
+                continue
+
+            if time.time() - self.restart_times.get(worker_id, 0) < RECONNECT_DELAY:
+                continue
+
+            write_log("error", f"[OCRProcessPool] Worker {worker_id} exited with code {process.exitcode}, restarting")
+            self.ready.discard(worker_id)
+            self.processes[worker_id] = self.start_worker(worker_id)
+            self.restart_times[worker_id] = time.time()
+            self.metrics.increment("pool_restarts")
+
+
+    def ocr_crops(self, crops: list) -> list:
+        """
+        Read the plate crops in a worker process.
+
+        Args:
+            crops (list): The preprocessed grayscale crops.
+
+        Returns:
+            list: The (car plate number, confidence) of every crop, in crop order.
+        """
+        future = self.submit(crops)
+        try:
+            return future.result(timeout=OCR_POOL_TIMEOUT)
+        except TimeoutError:
+            # A late result of a released task is ignored, so the slot can be reused right away
+            self.release(future.task_id)
+            self.metrics.increment("pool_timeouts")
+            write_log("error", f"[OCRProcessPool] OCR task timed out after {OCR_POOL_TIMEOUT}s")
+        except Exception as e:
+            write_log("error", f"[OCRProcessPool] OCR task failed: {e}")
+
+        return [(None, 0.0)] * len(crops)
+
+
+    def warmup(self, runs: int = 0) -> float:
+        """
+        Wait until every worker has loaded and warmed up its reader.
+
+        Args:
+            runs (int): Unused, the workers warm themselves up on start.
+
+        Returns:
+            float: The time spent waiting in seconds.
+        """
+        start_time = time.perf_counter()
+        if not self.ready_event.wait(timeout=600):
+            write_log("error", f"[OCRProcessPool] Only {len(self.ready)} of {self.workers} OCR workers are ready")
+
+        return time.perf_counter() - start_time
+
+
+    def stop(self) -> None:
+        """
+        Stop the workers and release the shared memory slots.
+        """
+        self.stop_event.set()
+        for _ in self.processes:
+            self.tasks.put(None)
+
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+        self.collector.join(timeout=2)
+        with self.pending_lock:
+            # Callers still waiting get their (None, 0.0) per crop from ocr_crops
+            for future, _, _ in self.pending.values():
+                future.set_exception(RuntimeError("OCR pool stopped"))
+            self.pending = {}
+
+        for slot in self.slots:
+            slot.close()
+            slot.unlink()
+
@@ -0,0 +1,417 @@
+from src.utils.config import FRAME_QUEUE_SIZE, OCR_QUEUE_SIZE, DECISION_QUEUE_SIZE, QUEUE_POLICY, METRICS_INTERVAL, RECONNECT_DELAY
+from src.utils.config import MOTION_GATE, QUALITY_GATE
+from src.controller.quality import PlateQualityGate
+from src.controller.tracker import PlateTracker
+from src.controller.motion import MotionGate
+from src.controller.roi import LaneROI
+from src.utils.metrics import Metrics
+from src.utils.log import write_log
+import numpy as np
+import threading
+import queue
+import time
+import cv2
+
+
+class StageQueue:
+
+    def __init__(self, name: str, maxsize: int, policy: str, metrics: Metrics) -> None:
+        """
+        Initialize a bounded queue between two pipeline stages.
+
+        Args:
+            name (str): The name of the queue, used for metrics.
+            maxsize (int): The maximum number of packets held by the queue.
+            policy (str): "drop_oldest" to evict the oldest packet when full, or "block" to wait for space.
+            metrics (Metrics): The metrics to record drops and depth to.
+        """
+        if policy not in ("drop_oldest", "block"):
+            raise ValueError(f"Invalid queue policy ({policy}).")
+
+        self.name = name
+        self.policy = policy
+        self.metrics = metrics
+        self.queue = queue.Queue(maxsize=max(1, maxsize))
+
+
+    def put(self, packet: dict, stop_event: threading.Event) -> None:
+        """
+        Put a packet on the queue according to the queue policy.
+
+        Args:
+            packet (dict): The packet to put on the queue.
+            stop_event (threading.Event): The event that aborts a blocking put.
+        """
+        if self.policy == "drop_oldest":
+            while True:
+                try:
+                    self.queue.put_nowait(packet)
+                    return
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.metrics.increment(f"{self.name}_dropped")
+                    except queue.Empty:
+                        pass
+
+        while not stop_event.is_set():
+            try:
+                self.queue.put(packet, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+    def get(self, timeout: float = 0.1) -> dict:
+        """
+        Get the next packet from the queue.
+
+        Args:
+            timeout (float): The number of seconds to wait for a packet.
+
+        Returns:
+            dict: The next packet, or None if no packet arrived in time.
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+    def depth(self) -> int:
+        """
+        Return the number of packets currently waiting in the queue.
+
+        Returns:
+            int: The queue depth.
+        """
+        return self.queue.qsize()
+
+
+class DetectionPipeline:
+
+    def __init__(self, source, model, extraction, detection, name: str = "camera", reconnect: bool = False, roi: list = None) -> None:
+        """
+        Initialize the capture, detection, OCR and decision stages.
+
+        Args:
+            source: The video source passed to cv2.VideoCapture.
+            model (PredictDetectionModel): The car plate detection model.
+            extraction (TextExtraction): The car plate text extractor.
+            detection (VehicleDetectionProcessor): The vehicle access processor.
+            name (str): The name of the camera, used in logs and metrics.
+            reconnect (bool): Reopen the video source after a failure instead of stopping the pipeline.
+            roi (list): The lane trigger zone as a rectangle or polygon, or None to use the full frame.
+        """
+        self.source = source
+        self.model = model
+        self.extraction = extraction
+        self.detection = detection
+        self.name = name
+        self.reconnect = reconnect
+        self.metrics = Metrics(name)
+        self.tracker = PlateTracker()
+        self.motion_gate = MotionGate() if MOTION_GATE else None
+        self.quality_gate = PlateQualityGate() if QUALITY_GATE else None
+        self.roi = LaneROI(roi) if roi else None
+        self.stop_event = threading.Event()
+        self.threads = []
+
+        self.frame_queue = StageQueue("frame", FRAME_QUEUE_SIZE, QUEUE_POLICY, self.metrics)
+        self.ocr_queue = StageQueue("ocr", OCR_QUEUE_SIZE, QUEUE_POLICY, self.metrics)
+        self.decision_queue = StageQueue("decision", DECISION_QUEUE_SIZE, QUEUE_POLICY, self.metrics)
+        self.result_queue = StageQueue("result", 1, "drop_oldest", self.metrics)
+
+
+    def start(self) -> None:
+        """
+        Start one thread per pipeline stage.
+        """
+        stages = [
+            ("capture", self.capture_frames, ()),
+            ("detection", self.run_stage, ("detection", self.frame_queue, self.ocr_queue, self.detect)),
+            ("ocr", self.run_stage, ("ocr", self.ocr_queue, self.decision_queue, self.recognize)),
+            ("decision", self.run_stage, ("decision", self.decision_queue, self.result_queue, self.decide)),
+            ("metrics", self.report_metrics, ())
+        ]
+
+        for stage, target, args in stages:
+            thread = threading.Thread(target=target, args=args, name=f"{self.name}-{stage}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+        write_log("info", f"[DetectionPipeline] Started pipeline for {self.name} ({self.source})")
+
+
+    def stop(self) -> None:
+        """
+        Stop all pipeline stages and wait for their threads to finish.
+        """
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout=5)
+
+        self.threads = []
+        self.metrics.log_summary()
+
+
+    def is_running(self) -> bool:
+        """
+        Check if the pipeline is still running.
+
+        Returns:
+            bool: True if the pipeline has not been stopped, False otherwise.
+        """
+        return not self.stop_event.is_set()
+
+
+    def get_result(self, timeout: float = 0.1) -> dict:
+        """
+        Get the most recent fully processed packet.
+
+        Args:
+            timeout (float): The number of seconds to wait for a packet.
+
+        Returns:
+            dict: The packet with frame, labels, plates and roles, or None if none is ready.
+        """
+        return self.result_queue.get(timeout)
+
+
+    def capture_frames(self) -> None:
+        """
+        Read frames from the video source and feed them to the detection stage.
+
+        When reconnecting is enabled, a source that fails to open or stops delivering frames
+        is reopened with an increasing delay, so a dead stream only stalls its own camera.
+        """
+        frame_id = 0
+        delay = RECONNECT_DELAY
+
+        while not self.stop_event.is_set():
+            cap = cv2.VideoCapture(self.source)
+            try:
+                if not cap.isOpened():
+                    write_log("error", f"[DetectionPipeline] Failed to open video capture for {self.name}")
+                else:
+                    while not self.stop_event.is_set():
+                        ret, frame = cap.read()
+                        if not ret:
+                            write_log("error", f"[DetectionPipeline] Failed to read frame from {self.name}")
+                            break
+
+                        frame_id += 1
+                        delay = RECONNECT_DELAY
+                        self.metrics.increment("captured")
+                        packet = {"frame_id": frame_id, "timestamp": time.time(), "frame": frame}
+                        self.frame_queue.put(packet, self.stop_event)
+
+            except Exception as e:
+                write_log("error", f"[DetectionPipeline] Failed to capture frames from {self.name}: {e}")
+
+            finally:
+                cap.release()
+
+            if not self.reconnect:
+                break
+
+            self.metrics.increment("reconnects")
+            write_log("info", f"[DetectionPipeline] Reconnecting to {self.name} in {delay:.0f} seconds")
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, RECONNECT_DELAY * 12)
+
+        self.stop_event.set()
+
+
+    def run_stage(self, name: str, input_queue: StageQueue, output_queue: StageQueue, handler) -> None:
+        """
+        Take packets from the input queue, process them and pass them to the output queue.
+
+        Args:
+            name (str): The name of the stage.
+            input_queue (StageQueue): The queue to take packets from.
+            output_queue (StageQueue): The queue to put processed packets on.
+            handler (callable): The function that processes a packet in place.
+        """
+        while not self.stop_event.is_set():
+            packet = input_queue.get()
+            if packet is None:
+                continue
+
+            start_time = time.perf_counter()
+            try:
+                handler(packet)
+            except Exception as e:
+                write_log("error", f"[DetectionPipeline] Failed to run {name} stage on {self.name}: {e}")
+                self.metrics.increment(f"{name}_errors")
+                continue
+
+            self.metrics.observe(name, time.perf_counter() - start_time)
+            self.metrics.increment(f"{name}_processed")
+            output_queue.put(packet, self.stop_event)
+
+
+    def detect(self, packet: dict) -> None:
+        """
+        Detect car plates in the packet's frame and assign each one to a track.
+
+        When a lane ROI is configured, only the trigger zone is searched and plates whose centroid
+        falls outside it are dropped. The detector is skipped on static frames when the motion
+        gate is enabled, unless a track is still waiting for its car plate to be committed.
+
+        Args:
+            packet (dict): The packet to process.
+        """
+        region, offset = packet["frame"], (0, 0)
+        if self.roi:
+            region, offset = self.roi.crop(packet["frame"])
+
+        if self.motion_gate:
+            start_time = time.perf_counter()
+            run_detection, reason = self.motion_gate.should_detect(region)
+            self.metrics.observe("motion", time.perf_counter() - start_time)
+
+            if not run_detection and any(track.needs_ocr() for track in self.tracker.tracks):
+                run_detection, reason = True, "open_track"
+
+            self.metrics.increment(f"motion_{reason}")
+            if not run_detection:
+                packet["labels"], packet["tracks"] = [], []
+                return
+
+        start_time = time.perf_counter()
+        labels = self.model.predict(region) or []
+        self.metrics.observe("predict", time.perf_counter() - start_time)
+
+        if self.roi:
+            mapped_labels = self.roi.map_labels(labels, offset)
+            self.metrics.increment("roi_dropped", len(labels) - len(mapped_labels))
+            labels = mapped_labels
+
+        packet["labels"] = labels
+        packet["tracks"] = self.tracker.update(packet["labels"])
+
+
+    def recognize(self, packet: dict) -> None:
+        """
+        Extract the car plate number of every track that still needs a reading.
+
+        Args:
+            packet (dict): The packet to process.
+        """
+        pending = [(label, track) for label, track in zip(packet["labels"], packet["tracks"]) if track.needs_ocr()]
+        self.metrics.increment("ocr_skipped", len(packet["labels"]) - len(pending))
+
+        if self.quality_gate:
+            pending = [(label, track) for label, track in pending if self.passes_quality(packet["frame"], label, track)]
+
+        if pending:
+            # All crops of the frame are read in one batched OCR call. Only readings that commit a plate
+            # on their own are cached, so a cache hit commits the track like the read it replays
+            readings = self.extraction.read_car_plates(packet["frame"], [label for label, _ in pending], with_hits=True)
+            for (_, track), (car_plate, confidence, hit) in zip(pending, readings):
+                if hit:
+                    self.metrics.increment("ocr_cached")
+                track.record_ocr(car_plate, confidence)
+
+            self.metrics.increment("ocr_calls", len(pending))
+            self.metrics.increment("ocr_batches")
+
+        packet["plates"] = [track.car_plate for track in packet["tracks"]]
+
+
+    def passes_quality(self, frame: np.ndarray, label, track) -> bool:
+        """
+        Check whether a plate crop is good enough for OCR and not clearly worse than the track's best crop.
+
+        Args:
+            frame (np.ndarray): The frame containing the plate.
+            label (Detection): The label of the plate.
+            track (Track): The track the plate belongs to.
+
+        Returns:
+            bool: True if the crop should be sent to OCR.
+        """
+        score, reason = self.quality_gate.check(self.extraction.crop_bounding_box(frame, label))
+        if reason:
+            self.metrics.increment(f"quality_rejected_{reason}")
+            return False
+
+        if not track.is_better_crop(score):
+            self.metrics.increment("quality_not_best")
+            return False
+
+        return True
+
+
+    def decide(self, packet: dict) -> None:
+        """
+        Verify the committed car plate of every track and record the access decision, reopening the
+        plate vote of a denied track while it has decisions left.
+
+        Args:
+            packet (dict): The packet to process.
+        """
+        for track in packet["tracks"]:
+            if track.ready_for_decision():
+                self.metrics.increment("decisions")
+                if track.record_decision(self.detection.verify_vehicle(track.car_plate)):
+                    self.metrics.increment("revotes")
+
+        packet["roles"] = [track.role for track in packet["tracks"]]
+        self.metrics.observe("end_to_end", time.time() - packet["timestamp"])
+
+
+    def report_metrics(self) -> None:
+        """
+        Periodically record queue depths, frame rates and process CPU use, and log a metrics summary.
+        """
+        last_report = time.time()
+        last_counters = {}
+        last_cpu = (time.process_time(), time.perf_counter())
+        while not self.stop_event.wait(1):
+            cpu = (time.process_time(), time.perf_counter())
+            self.metrics.set_gauge("process_cpu_percent", 100 * (cpu[0] - last_cpu[0]) / max(cpu[1] - last_cpu[1], 1e-6))
+            last_cpu = cpu
+
+            for stage_queue in (self.frame_queue, self.ocr_queue, self.decision_queue):
+                self.metrics.set_gauge(f"{stage_queue.name}_depth", stage_queue.depth())
+
+            counters = self.metrics.snapshot()["counters"]
+            for counter, gauge in (("captured", "capture_fps"), ("decision_processed", "fps")):
+                value = counters.get(counter, 0)
+                self.metrics.set_gauge(gauge, value - last_counters.get(counter, 0))
+                last_counters[counter] = value
+
+            if time.time() - last_report >= METRICS_INTERVAL:
+                self.metrics.log_summary()
+                self.extraction.metrics.log_summary()
+                last_report = time.time()
+
+
+def draw_results(packet: dict, fps: float) -> np.ndarray:
+    """
+    Draw the bounding boxes, car plates, roles and FPS on the packet's frame.
+
+    Args:
+        packet (dict): The fully processed packet.
+        fps (float): The frames per second to display.
+
+    Returns:
+        np.ndarray: The annotated frame.
+    """
+    frame = packet["frame"]
+
+    for label, car_plate, role in zip(packet["labels"], packet["plates"], packet["roles"]):
+        if role:
+            color = (0, 255, 0)
+        else:
+            color = (0, 0, 255)
+
+        x1, y1, x2, y2 = label.x1, label.y1, label.x2, label.y2
+
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+        cv2.putText(frame, f"{car_plate} ({role})", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
+
+    cv2.putText(frame, f"FPS: {fps:.2f}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+    return frame
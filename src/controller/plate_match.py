@@ -0,0 +1,217 @@
+from src.utils.config import FUZZY_MAX_DISTANCE, FUZZY_MIN_MARGIN
+
+
+# Letters and digits EasyOCR commonly mistakes for each other on car plates, substituted at a reduced cost.
+# Only letter-digit pairs are listed: the plate format (letter prefix, digit body, optional letter suffix)
+# tells which of the two belongs at a position, while a letter read for another letter is a different plate.
+CONFUSION_PAIRS = [
+    ("O", "0"), ("D", "0"), ("Q", "0"), ("I", "1"), ("L", "1"), ("T", "1"),
+    ("Z", "2"), ("S", "5"), ("B", "8"), ("G", "6"), ("A", "4")
+]
+CONFUSIONS = {pair for a, b in CONFUSION_PAIRS for pair in ((a, b), (b, a))}
+
+CONFUSION_COST = 0.3
+
+# Every confusable character is mapped to one representative of its group for the BK-tree keys
+CANONICAL = {"O": "0", "D": "0", "Q": "0", "I": "1", "L": "1", "T": "1", "Z": "2", "S": "5", "B": "8", "G": "6", "A": "4"}
+
+
+def canonical_plate(plate: str) -> str:
+    """
+    Collapse the OCR confusions of a plate, so plates differing only by confusions share one key.
+
+    Args:
+        plate (str): The normalized plate.
+
+    Returns:
+        str: The plate with confusable characters replaced by their representatives.
+    """
+    return "".join(CANONICAL.get(char, char) for char in plate)
+
+
+def levenshtein(a: str, b: str) -> int:
+    """
+    Compute the unit-cost edit distance between two strings.
+
+    Args:
+        a (str): The first string.
+        b (str): The second string.
+
+    Returns:
+        int: The number of insertions, deletions and substitutions turning a into b.
+    """
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+
+    return previous[-1]
+
+
+def plate_distance(a: str, b: str) -> float:
+    """
+    Compute the edit distance between two plates, with OCR confusions costing less than other edits.
+
+    Reading a digit where the registered plate has a confusable letter, or the other way round
+    (such as Z for 2), costs CONFUSION_COST, while other insertions, deletions and substitutions cost 1.
+
+    Args:
+        a (str): The plate read by OCR.
+        b (str): The registered plate.
+
+    Returns:
+        float: The weighted edit distance.
+    """
+    rows, columns = len(a) + 1, len(b) + 1
+    distance = [[0.0] * columns for _ in range(rows)]
+    for i in range(rows):
+        distance[i][0] = float(i)
+    for j in range(columns):
+        distance[0][j] = float(j)
+
+    for i in range(1, rows):
+        for j in range(1, columns):
+            char_a, char_b = a[i - 1], b[j - 1]
+            if char_a == char_b:
+                substitution = 0.0
+            elif (char_a, char_b) in CONFUSIONS:
+                substitution = CONFUSION_COST
+            else:
+                substitution = 1.0
+
+            distance[i][j] = min(distance[i - 1][j] + 1, distance[i][j - 1] + 1, distance[i - 1][j - 1] + substitution)
+
+    return distance[-1][-1]
+
+
+class BKTree:
+
+    def __init__(self, words: list = None) -> None:
+        """
+        Initialize a Burkhard-Keller tree for finding words within an edit distance.
+
+        Args:
+            words (list): The words to add.
+        """
+        self.root = None
+        self.size = 0
+        for word in words or []:
+            self.add(word)
+
+
+    def add(self, word: str) -> None:
+        """
+        Add a word to the tree.
+
+        Args:
+            word (str): The word to add.
+        """
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return
+
+        node = self.root
+        while True:
+            distance = levenshtein(word, node[0])
+            if distance == 0:
+                return
+
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self.size += 1
+                return
+
+            node = child
+
+
+    def search(self, word: str, radius: int) -> list:
+        """
+        Find every word within an edit distance of the given word.
+
+        The triangle inequality limits the search to children whose edge distance is within
+        radius of the distance to their parent.
+
+        Args:
+            word (str): The word to search for.
+            radius (int): The maximum edit distance.
+
+        Returns:
+            list: The (edit distance, word) pairs found.
+        """
+        if self.root is None:
+            return []
+
+        found, stack = [], [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = levenshtein(word, node_word)
+            if distance <= radius:
+                found.append((distance, node_word))
+
+            for edge, child in children.items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+
+        return found
+
+
+class PlateMatcher:
+
+    def __init__(self, plates: list, max_distance: float = FUZZY_MAX_DISTANCE, min_margin: float = FUZZY_MIN_MARGIN) -> None:
+        """
+        Initialize the approximate matcher over the registered plates.
+
+        The BK-tree holds the canonical keys of the plates, so OCR confusions cost nothing in the tree
+        and only genuine edits widen the search. Candidates are then ranked by their weighted distance.
+
+        Args:
+            plates (list): The normalized registered plates.
+            max_distance (float): The largest weighted distance accepted as a match.
+            min_margin (float): The smallest gap between the best and second-best candidates for a match
+                to be unambiguous.
+        """
+        self.plates = {}
+        for plate in plates:
+            self.plates.setdefault(canonical_plate(plate), []).append(plate)
+
+        self.tree = BKTree(list(self.plates))
+        self.max_distance = max_distance
+        self.min_margin = min_margin
+
+
+    def match(self, plate: str) -> dict:
+        """
+        Find the registered plate closest to an OCR reading.
+
+        Args:
+            plate (str): The normalized plate read by OCR.
+
+        Returns:
+            dict: The best "plate", its weighted "distance", the "runner_up" and its distance, and
+                whether the match is "ambiguous", or None if no plate is within max_distance.
+        """
+        # Confusions cost nothing between canonical keys and a genuine edit costs 1, so keys further
+        # apart than max_distance can never produce an accepted match
+        radius = int(self.max_distance)
+        candidates = sorted(
+            (plate_distance(plate, candidate), candidate)
+            for _, key in self.tree.search(canonical_plate(plate), radius)
+            for candidate in self.plates[key]
+        )
+        candidates = [(distance, candidate) for distance, candidate in candidates if distance <= self.max_distance]
+        if not candidates:
+            return None
+
+        distance, best = candidates[0]
+        runner_up = candidates[1] if len(candidates) > 1 else (None, None)
+        return {
+            "plate": best,
+            "distance": distance,
+            "runner_up": runner_up[1],
+            "runner_up_distance": runner_up[0],
+            "ambiguous": runner_up[0] is not None and runner_up[0] - distance < self.min_margin
+        }
@@ -0,0 +1,88 @@
+from src.utils.config import OCR_TARGET_HEIGHT, OCR_BUFFER_BUCKET
+import numpy as np
+import threading
+import cv2
+
+
+class PlatePreprocessor:
+
+    def __init__(self, target_height: int = OCR_TARGET_HEIGHT, bucket: int = OCR_BUFFER_BUCKET, max_buffers: int = 64) -> None:
+        """
+        Initialize the fused grayscale, resize and denoise chain applied to plate crops before OCR.
+
+        Args:
+            target_height (int): The height every crop is resized to, 0 to scale crops by 2x instead.
+            bucket (int): The step in pixels crop sizes are rounded up to when picking a reusable buffer.
+            max_buffers (int): The maximum number of buffers kept per thread before they are dropped.
+        """
+        self.target_height = target_height
+        self.bucket = max(1, bucket)
+        self.max_buffers = max_buffers
+        self.local = threading.local()
+
+
+    def buffer(self, stage: str, height: int, width: int) -> np.ndarray:
+        """
+        Return a view of the calling thread's reusable buffer for a stage and the size bucket of a crop.
+
+        Args:
+            stage (str): The preprocessing stage, so the input and output of a step never share memory.
+            height (int): The height of the crop.
+            width (int): The width of the crop.
+
+        Returns:
+            np.ndarray: A (height, width) uint8 view into the buffer.
+        """
+        buffers = getattr(self.local, "buffers", None)
+        if buffers is None or len(buffers) > self.max_buffers:
+            buffers = self.local.buffers = {}
+
+        key = (stage, -(-height // self.bucket) * self.bucket, -(-width // self.bucket) * self.bucket)
+        if key not in buffers:
+            buffers[key] = np.empty(key[1:], dtype=np.uint8)
+
+        return buffers[key][:height, :width]
+
+
+    def output_size(self, height: int, width: int) -> tuple:
+        """
+        Compute the size of a preprocessed crop.
+
+        Args:
+            height (int): The height of the crop.
+            width (int): The width of the crop.
+
+        Returns:
+            tuple: The (width, height) of the resized crop.
+        """
+        if not self.target_height:
+            return width * 2, height * 2
+
+        return max(1, round(width * self.target_height / height)), self.target_height
+
+
+    def process(self, crop: np.ndarray) -> np.ndarray:
+        """
+        Convert a plate crop to grayscale, resize it to the target height and denoise it.
+
+        The grayscale conversion runs first so the resize works on one channel instead of three,
+        and the intermediate images are written into reusable buffers. Only the returned image
+        is newly allocated, so callers can keep it while other crops are processed.
+
+        Args:
+            crop (np.ndarray): The BGR or grayscale plate crop.
+
+        Returns:
+            np.ndarray: The preprocessed grayscale crop.
+        """
+        height, width = crop.shape[:2]
+        if crop.ndim == 3:
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY, dst=self.buffer("gray", height, width))
+        else:
+            gray = crop
+
+        new_width, new_height = self.output_size(height, width)
+        interpolation = cv2.INTER_CUBIC if new_height >= height else cv2.INTER_AREA
+        resized = cv2.resize(gray, (new_width, new_height), dst=self.buffer("resized", new_height, new_width), interpolation=interpolation)
+
+        return cv2.GaussianBlur(resized, (5, 5), 0)
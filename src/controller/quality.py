@@ -0,0 +1,77 @@
+from src.utils.config import QUALITY_MIN_HEIGHT, QUALITY_MIN_SHARPNESS, QUALITY_MIN_CONTRAST, QUALITY_MAX_CLIPPED
+from src.utils.log import write_log
+import numpy as np
+import cv2
+
+
+class PlateQualityGate:
+
+    def __init__(self) -> None:
+        """
+        Initialize the gate that scores plate crops and rejects those not worth sending to OCR.
+        """
+        self.min_height = QUALITY_MIN_HEIGHT
+        self.min_sharpness = QUALITY_MIN_SHARPNESS
+        self.min_contrast = QUALITY_MIN_CONTRAST
+        self.max_clipped = QUALITY_MAX_CLIPPED
+
+
+    def measure(self, crop: np.ndarray) -> dict:
+        """
+        Measure the size, sharpness, contrast and exposure clipping of a plate crop.
+
+        Args:
+            crop (np.ndarray): The BGR plate crop.
+
+        Returns:
+            dict: The height in pixels, the Laplacian variance, the grayscale standard deviation
+                and the share of pixels clipped to black or white.
+        """
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        return {
+            "height": gray.shape[0],
+            "sharpness": float(cv2.Laplacian(gray, cv2.CV_64F).var()),
+            "contrast": float(gray.std()),
+            "clipped": float(np.count_nonzero((gray <= 2) | (gray >= 253)) / gray.size)
+        }
+
+
+    def check(self, crop: np.ndarray) -> tuple:
+        """
+        Score a plate crop and decide whether it is good enough for OCR.
+
+        The score multiplies how far the height, sharpness and contrast are above their thresholds,
+        each capped at 4x, by the share of unclipped pixels, so crops of one track can be ranked.
+
+        Args:
+            crop (np.ndarray): The BGR plate crop.
+
+        Returns:
+            tuple: The quality score, and the rejection reason ("empty", "small", "blurry",
+                "low_contrast" or "clipped") or None if the crop is accepted.
+        """
+        try:
+            if crop is None or crop.size == 0:
+                return 0.0, "empty"
+
+            quality = self.measure(crop)
+            if quality["height"] < self.min_height:
+                return 0.0, "small"
+            if quality["sharpness"] < self.min_sharpness:
+                return 0.0, "blurry"
+            if quality["contrast"] < self.min_contrast:
+                return 0.0, "low_contrast"
+            if quality["clipped"] > self.max_clipped:
+                return 0.0, "clipped"
+
+            score = (
+                min(quality["height"] / max(self.min_height, 1), 4)
+                * min(quality["sharpness"] / max(self.min_sharpness, 1e-6), 4)
+                * min(quality["contrast"] / max(self.min_contrast, 1e-6), 4)
+                * (1 - quality["clipped"])
+            )
+            return score, None
+
+        except Exception as e:
+            write_log("error", f"[PlateQualityGate] Failed to score plate crop: {e}")
+            return 0.0, None
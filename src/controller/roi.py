@@ -0,0 +1,81 @@
+from src.model.detection import Detection
+from src.utils.log import write_log
+import numpy as np
+import cv2
+
+
+class LaneROI:
+
+    def __init__(self, points: list) -> None:
+        """
+        Initialize the trigger zone of a camera lane.
+
+        Args:
+            points (list): Either a rectangle [x1, y1, x2, y2] or a polygon [[x, y], ...] in frame pixels.
+        """
+        if len(points) == 4 and all(isinstance(point, (int, float)) for point in points):
+            x1, y1, x2, y2 = points
+            points = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+        if len(points) < 3:
+            raise ValueError(f"Invalid lane ROI ({points}).")
+
+        self.polygon = np.array(points, dtype=np.int32)
+        self.x1, self.y1 = self.polygon.min(axis=0)
+        self.x2, self.y2 = self.polygon.max(axis=0)
+
+
+    def crop(self, frame: np.ndarray) -> tuple:
+        """
+        Crop the frame to the bounding rectangle of the trigger zone.
+
+        Args:
+            frame (np.ndarray): The full-size frame.
+
+        Returns:
+            tuple: The cropped region and its (x, y) offset in the full frame.
+        """
+        height, width = frame.shape[:2]
+        x1, y1 = max(0, int(self.x1)), max(0, int(self.y1))
+        x2, y2 = min(width, int(self.x2)), min(height, int(self.y2))
+        return frame[y1:y2, x1:x2], (x1, y1)
+
+
+    def contains(self, label: Detection) -> bool:
+        """
+        Check if the centroid of a label lies inside the trigger zone.
+
+        Args:
+            label (Detection): The label in full-frame coordinates.
+
+        Returns:
+            bool: True if the centroid is inside or on the edge of the zone.
+        """
+        return cv2.pointPolygonTest(self.polygon, label.centroid, False) >= 0
+
+
+    def map_labels(self, labels: list, offset: tuple) -> list:
+        """
+        Map labels detected on the cropped region back to full-frame coordinates and keep only
+        those whose centroid is inside the trigger zone.
+
+        Args:
+            labels (list): The labels in cropped-region coordinates.
+            offset (tuple): The (x, y) offset of the cropped region.
+
+        Returns:
+            list: The labels inside the trigger zone, in full-frame coordinates.
+        """
+        try:
+            x_offset, y_offset = offset
+            for label in labels:
+                label.x1 += x_offset
+                label.x2 += x_offset
+                label.y1 += y_offset
+                label.y2 += y_offset
+
+            return [label for label in labels if self.contains(label)]
+
+        except Exception as e:
+            write_log("error", f"[LaneROI] Failed to map labels to the full frame: {e}")
+            return []
@@ -0,0 +1,206 @@
+from src.controller.vehicle_processor import VehicleDetectionProcessor
+from src.controller.pipeline import DetectionPipeline, draw_results
+from src.utils.config import VIDEO_SOURCE, ACTION_OPTION, LANE_ROI, METRICS_INTERVAL, RECONNECT_DELAY, BATCH_MAX_SIZE
+from src.model.batching import BatchingPredictor
+from src.utils.log import write_log
+import time
+import cv2
+
+
+def parse_cameras(sources: list) -> list:
+    """
+    Normalize the configured camera sources.
+
+    Args:
+        sources (list): The configured cameras, each a dict with "source" and optional "name", "action" and "roi".
+
+    Returns:
+        list: The cameras with name, source, action and roi filled in.
+    """
+    if not sources:
+        sources = [{"name": "camera", "source": VIDEO_SOURCE, "action": ACTION_OPTION, "roi": LANE_ROI}]
+
+    cameras = []
+    for index, camera in enumerate(sources):
+        source = camera.get("source")
+        if isinstance(source, str) and source.isdigit():
+            source = int(source)
+
+        action = camera.get("action", ACTION_OPTION)
+        if action not in ("entry", "exit"):
+            raise ValueError(f"Invalid action ({action}) for camera {camera.get('name', index)}.")
+
+        cameras.append({
+            "name": camera.get("name", f"camera-{index + 1}"),
+            "source": source,
+            "action": action,
+            "roi": camera.get("roi")
+        })
+
+    return cameras
+
+
+class GateSupervisor:
+
+    def __init__(self, sources: list, model, extraction) -> None:
+        """
+        Initialize the supervisor for several camera lanes sharing one model and OCR reader.
+
+        Args:
+            sources (list): The configured cameras.
+            model (PredictDetectionModel): The car plate detection model shared by all lanes.
+            extraction (TextExtraction): The car plate text extractor shared by all lanes.
+        """
+        self.cameras = parse_cameras(sources)
+        self.model = model
+        self.predictor = BatchingPredictor(model) if BATCH_MAX_SIZE > 1 else None
+        self.extraction = extraction
+        self.pipelines = {}
+        self.restart_times = {}
+
+
+    def create_pipeline(self, camera: dict) -> DetectionPipeline:
+        """
+        Create the pipeline for a single camera lane.
+
+        Args:
+            camera (dict): The camera configuration.
+
+        Returns:
+            DetectionPipeline: The pipeline for the camera.
+        """
+        detection = VehicleDetectionProcessor(camera["action"])
+        return DetectionPipeline(
+            camera["source"],
+            self.predictor or self.model,
+            self.extraction,
+            detection,
+            name=camera["name"],
+            reconnect=True,
+            roi=camera["roi"]
+        )
+
+
+    def start(self) -> None:
+        """
+        Start the pipelines of all camera lanes.
+        """
+        for camera in self.cameras:
+            self.start_camera(camera)
+
+        write_log("info", f"[GateSupervisor] Started {len(self.cameras)} camera lanes")
+
+
+    def start_camera(self, camera: dict) -> None:
+        """
+        Start or restart the pipeline of a camera lane.
+
+        Args:
+            camera (dict): The camera configuration.
+        """
+        try:
+            pipeline = self.create_pipeline(camera)
+            pipeline.start()
+            self.pipelines[camera["name"]] = pipeline
+        except Exception as e:
+            write_log("error", f"[GateSupervisor] Failed to start camera {camera['name']}: {e}")
+
+        self.restart_times[camera["name"]] = time.time()
+
+
+    def stop(self) -> None:
+        """
+        Stop the pipelines of all camera lanes.
+        """
+        for pipeline in self.pipelines.values():
+            pipeline.stop()
+
+        self.pipelines = {}
+        if self.predictor:
+            self.predictor.stop()
+
+
+    def watch(self) -> None:
+        """
+        Restart any camera lane whose pipeline has stopped, without touching the other lanes.
+        """
+        for camera in self.cameras:
+            pipeline = self.pipelines.get(camera["name"])
+            if pipeline and pipeline.is_running():
+                continue
+
+            if time.time() - self.restart_times.get(camera["name"], 0) < RECONNECT_DELAY:
+                continue
+
+            write_log("error", f"[GateSupervisor] Camera {camera['name']} stopped, restarting")
+            if pipeline:
+                pipeline.stop()
+            self.start_camera(camera)
+
+
+    def report_fps(self) -> None:
+        """
+        Log the capture and processing frame rate of every camera lane, and the batching metrics.
+        """
+        try:
+            parts = []
+            for name, pipeline in self.pipelines.items():
+                gauges = pipeline.metrics.snapshot()["gauges"]
+                parts.append(f"{name}={gauges.get('fps', 0):.1f}/{gauges.get('capture_fps', 0):.1f}")
+
+            write_log("info", f"[GateSupervisor] Processed/captured FPS per camera: {' '.join(parts)}")
+
+            if self.predictor:
+                self.predictor.metrics.log_summary()
+        except Exception as e:
+            write_log("error", f"[GateSupervisor] Failed to report FPS: {e}")
+
+
+    def run(self, show_preview: bool = False, startup=None) -> None:
+        """
+        Run all camera lanes until interrupted.
+
+        Args:
+            show_preview (bool): Show one annotated preview window per camera.
+            startup (StartupTracker): The startup tracker to signal readiness once the lanes are live.
+        """
+        self.start()
+        if startup:
+            startup.mark_ready()
+
+        last_watch = time.time()
+        last_report = time.time()
+        try:
+            while True:
+                if show_preview:
+                    for name, pipeline in list(self.pipelines.items()):
+                        packet = pipeline.get_result(timeout=0.01)
+                        if packet is not None:
+                            fps = pipeline.metrics.snapshot()["gauges"].get("fps", 0)
+                            cv2.imshow(name, draw_results(packet, fps))
+
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
+                else:
+                    time.sleep(0.5)
+
+                if time.time() - last_watch >= 1:
+                    self.watch()
+                    last_watch = time.time()
+
+                if time.time() - last_report >= METRICS_INTERVAL:
+                    self.report_fps()
+                    last_report = time.time()
+
+        except KeyboardInterrupt:
+            write_log("info", "[GateSupervisor] Shutting down")
+
+        except Exception as e:
+            write_log("error", f"[GateSupervisor] Failed to run camera lanes: {e}")
+
+        finally:
+            if startup:
+                startup.clear_ready()
+            self.stop()
+            if show_preview:
+                cv2.destroyAllWindows()
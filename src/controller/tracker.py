@@ -0,0 +1,229 @@
+from src.utils.config import TRACK_IOU_THRESHOLD, TRACK_MAX_DISTANCE, TRACK_MAX_MISSED, TRACK_MAX_DECISIONS, QUALITY_BEST_RATIO
+from src.controller.consensus import PlateConsensus
+from src.model.detection import Detection
+from src.utils.log import write_log
+import itertools
+import math
+
+
+def box_iou(box_1: Detection, box_2: Detection) -> float:
+    """
+    Compute the intersection over union of two bounding boxes.
+
+    Args:
+        box_1 (Detection): The first bounding box.
+        box_2 (Detection): The second bounding box.
+
+    Returns:
+        float: The intersection over union, between 0 and 1.
+    """
+    x_left = max(box_1.x1, box_2.x1)
+    y_top = max(box_1.y1, box_2.y1)
+    x_right = min(box_1.x2, box_2.x2)
+    y_bottom = min(box_1.y2, box_2.y2)
+
+    if x_right <= x_left or y_bottom <= y_top:
+        return 0.0
+
+    intersection_area = (x_right - x_left) * (y_bottom - y_top)
+    box_1_area = box_1.width * box_1.height
+    box_2_area = box_2.width * box_2.height
+    return intersection_area / (box_1_area + box_2_area - intersection_area)
+
+
+class Track:
+
+    def __init__(self, track_id: int, label: Detection) -> None:
+        """
+        Initialize a track for a newly seen car plate.
+
+        Args:
+            track_id (int): The unique ID of the track.
+            label (Detection): The label the track starts from.
+        """
+        self.track_id = track_id
+        self.label = label
+        self.hits = 1
+        self.missed = 0
+        self.consensus = PlateConsensus()
+        self.decided = False
+        self.decisions = 0
+        self.role = None
+        self.best_quality = 0.0
+
+
+    @property
+    def car_plate(self) -> str:
+        """
+        The committed car plate, or the current vote leader while the vote is open.
+        """
+        if self.consensus.committed:
+            return self.consensus.committed
+        return self.consensus.leader()[0]
+
+
+    def needs_ocr(self) -> bool:
+        """
+        Check if the track still needs another OCR reading.
+
+        Returns:
+            bool: True if no car plate has been committed and attempts remain.
+        """
+        if self.decided or self.consensus.committed:
+            return False
+        return not self.consensus.exhausted()
+
+
+    def ready_for_decision(self) -> bool:
+        """
+        Check if the track should be sent to the access decision.
+
+        Returns:
+            bool: True if the track has a committed car plate that has not been decided yet.
+        """
+        return not self.decided and self.consensus.committed is not None
+
+
+    def record_decision(self, role: str) -> bool:
+        """
+        Record the access decision of the committed car plate.
+
+        A denial of a plate committed by a vote or by running out of attempts may come from a misread,
+        so the plate vote is reopened for another read until TRACK_MAX_DECISIONS decisions were made.
+        A denied plate read at OCR_MIN_CONFIDENCE or above is final.
+
+        Args:
+            role (str): The role of the vehicle, or None if access was denied.
+
+        Returns:
+            bool: True if the plate vote was reopened.
+        """
+        self.role = role
+        self.decisions += 1
+        if role is None and not self.consensus.confident and self.decisions < TRACK_MAX_DECISIONS:
+            self.consensus = PlateConsensus()
+            self.best_quality = 0.0
+            return True
+
+        self.decided = True
+        return False
+
+
+    def is_better_crop(self, score: float) -> bool:
+        """
+        Check a crop's quality score against the best crop of the track, keeping the best score.
+
+        Crops within QUALITY_BEST_RATIO of the best score are still read so the plate vote can fill up.
+
+        Args:
+            score (float): The quality score of the crop.
+
+        Returns:
+            bool: True if the crop is close to or better than the best crop seen so far.
+        """
+        if score < self.best_quality * QUALITY_BEST_RATIO:
+            return False
+
+        self.best_quality = max(self.best_quality, score)
+        return True
+
+
+    def record_ocr(self, car_plate: str, confidence: float) -> None:
+        """
+        Add an OCR reading to the track's car plate vote.
+
+        Args:
+            car_plate (str): The car plate read from the current frame.
+            confidence (float): The OCR confidence of the reading.
+        """
+        self.consensus.add(car_plate, confidence)
+
+
+class PlateTracker:
+
+    def __init__(self) -> None:
+        """
+        Initialize the IoU/centroid tracker for detected car plates.
+        """
+        self.tracks = []
+        self.track_ids = itertools.count(1)
+
+
+    def match_score(self, track: Track, label: Detection) -> float:
+        """
+        Score how well a label continues a track.
+
+        Boxes that overlap enough are matched on IoU. Boxes that moved too fast to overlap fall
+        back to centroid distance, measured in plate widths, and always rank below IoU matches.
+
+        Args:
+            track (Track): The existing track.
+            label (Detection): The label from the current frame.
+
+        Returns:
+            float: The match score, or None if the label cannot continue the track.
+        """
+        iou = box_iou(track.label, label)
+        if iou >= TRACK_IOU_THRESHOLD:
+            return 1 + iou
+
+        track_x, track_y = track.label.centroid
+        label_x, label_y = label.centroid
+        width = max(track.label.width, 1)
+        distance = math.hypot(track_x - label_x, track_y - label_y) / width
+        if distance <= TRACK_MAX_DISTANCE:
+            return 1 - distance / (TRACK_MAX_DISTANCE + 1)
+
+        return None
+
+
+    def update(self, labels: list) -> list:
+        """
+        Assign every label of the current frame to a track.
+
+        Args:
+            labels (list): The labels detected in the current frame.
+
+        Returns:
+            list: The track of every label, in label order.
+        """
+        try:
+            candidates = []
+            for track in self.tracks:
+                for index, label in enumerate(labels):
+                    score = self.match_score(track, label)
+                    if score is not None:
+                        candidates.append((score, track.track_id, index, track))
+
+            assigned = [None] * len(labels)
+            matched_tracks = set()
+            for score, track_id, index, track in sorted(candidates, key=lambda c: (-c[0], c[1], c[2])):
+                if assigned[index] is not None or track_id in matched_tracks:
+                    continue
+
+                track.label = labels[index]
+                track.hits += 1
+                track.missed = 0
+                assigned[index] = track
+                matched_tracks.add(track_id)
+
+            for track in self.tracks:
+                if track.track_id not in matched_tracks:
+                    track.missed += 1
+
+            self.tracks = [track for track in self.tracks if track.missed <= TRACK_MAX_MISSED]
+
+            for index, label in enumerate(labels):
+                if assigned[index] is None:
+                    track = Track(next(self.track_ids), label)
+                    self.tracks.append(track)
+                    assigned[index] = track
+
+            for label, track in zip(labels, assigned):
+                label.track_id = track.track_id
+
+            return assigned
+
+        except Exception as e:
+            write_log("error", f"[PlateTracker] Failed to update tracks: {e}")
+            return [Track(next(self.track_ids), label) for label in labels]
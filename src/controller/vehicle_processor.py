@@ -5,24 +5,30 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from src.database.visitor import VisitorRecord
 from src.database.history import HistoryRecord
 from src.database.user import UserDatabase
-from src.utils.config import ACTION_OPTION
+from src.database.authorization import get_authorization_index
+from src.utils.config import ACTION_OPTION, AUTH_INDEX, PRESENCE_CACHE, HISTORY_WRITE_BEHIND, FUZZY_CONFIRM_WINDOW
+from src.database.presence import get_presence_table
 from src.utils.log import write_log
 import time
 
 
-visitor_db = VisitorRecord()
-history_db = HistoryRecord()
-user_db = UserDatabase()
-
-
 class VehicleDetectionProcessor:
 
-    def __init__(self) -> None:
+    def __init__(self, action: str = ACTION_OPTION) -> None:
         """
         Initialize the process detection controller.
+
+        Args:
+            action (str): The lane direction handled by this processor, either "entry" or "exit".
         """
-        self.action = ACTION_OPTION
+        self.action = action
         self.cooldown = 180
+        self.visitor_db = VisitorRecord()
+        self.history_db = HistoryRecord(write_behind=HISTORY_WRITE_BEHIND)
+        self.user_db = UserDatabase()
+        self.index = get_authorization_index() if AUTH_INDEX else None
+        self.presence = get_presence_table() if PRESENCE_CACHE else None
+        self.fuzzy_pending = {}
 
 
     def create_new_entry(self, car_plate: str, user: dict, vehicle_type: str) -> dict:
@@ -65,7 +71,9 @@ class VehicleDetectionProcessor:
             return user.get("role", "Visitor")
 
         new_data = self.create_new_entry(car_plate, user, vehicle_type)
-        history_db.insert(new_data)
+        self.history_db.insert(new_data)
+        if self.presence:
+            self.presence.store(car_plate, new_data)
         write_log("info", f"{vehicle_type} with {car_plate} entered.")
         return user.get("role", "Visitor")
 
@@ -90,7 +98,9 @@ class VehicleDetectionProcessor:
             return data["role"]
 
         data["exit_time"] = time.time()
-        history_db.update(data["_id"], data)
+        self.history_db.update(data["_id"], data)
+        if self.presence:
+            self.presence.store(car_plate, data)
         write_log("info", f"{data['vehicle_type']} with {car_plate} exited.")
         return data["role"]
 
@@ -105,10 +115,19 @@ class VehicleDetectionProcessor:
         Returns:
             tuple: A tuple containing the user data and vehicle type.
         """
-        user = user_db.find_by_car_plate(car_plate)
+        # A fresh index answers from memory, and so does a stale one while MongoDB is unreachable;
+        # without change streams a miss may be a plate added since the last reload
+        if self.index and self.index.is_usable():
+            user, vehicle_type = self.index.lookup(car_plate)
+            if user or self.index.is_authoritative():
+                if not user:
+                    write_log("info", f"Vehicle with {car_plate} is not registered as resident or visitor.")
+                return user, vehicle_type
+
+        user = self.user_db.find_by_car_plate(car_plate)
         if not user:
             write_log("info", f"Vehicle with {car_plate} is not registered as resident.")
-            user = visitor_db.find_by_car_plate(car_plate)
+            user = self.visitor_db.find_by_car_plate(car_plate)
             if not user:
                 write_log("info", f"Vehicle with {car_plate} is not registered as visitor.")
                 return None, None
@@ -122,6 +141,96 @@ class VehicleDetectionProcessor:
         return user, vehicle["type"]
 
 
+    def resolve_plate(self, car_plate: str) -> str:
+        """
+        Replace an OCR near-miss with the registered plate it matches, once a second read agrees and unless the match is ambiguous.
+
+        Args:
+            car_plate (str): The license plate read by OCR.
+
+        Returns:
+            str: The registered license plate, or the plate as read.
+        """
+        if not self.index or not self.index.is_usable():
+            return car_plate
+
+        match = self.index.match(car_plate)
+        if not match:
+            return car_plate
+
+        if match["ambiguous"]:
+            write_log("info", (
+                f"Vehicle with {car_plate} is ambiguous between {match['plate']} (distance {match['distance']:.2f}) "
+                f"and {match['runner_up']} (distance {match['runner_up_distance']:.2f}), not matched."
+            ))
+            return car_plate
+
+        # A near-miss is only admitted once a second, separate read matches the same registered plate
+        current_time = time.time()
+        self.fuzzy_pending = {
+            plate: pending for plate, pending in self.fuzzy_pending.items() if current_time - pending[1] <= FUZZY_CONFIRM_WINDOW
+        }
+        first = self.fuzzy_pending.pop(match["plate"], None)
+        if not first:
+            self.fuzzy_pending[match["plate"]] = (car_plate, current_time)
+            write_log("info", (
+                f"Vehicle with {car_plate} is near registered {match['plate']} (distance {match['distance']:.2f}), "
+                f"not matched until a second read agrees."
+            ))
+            return car_plate
+
+        write_log("info", (
+            f"Vehicle with {car_plate} matched registered {match['plate']} (distance {match['distance']:.2f}), "
+            f"confirming the earlier read {first[0]}."
+        ))
+        return match["plate"]
+
+
+    def fits_action(self, data: dict) -> bool:
+        """
+        Check if a cached history record settles the detection on its own, as a repeated detection
+        of the same vehicle within the cooldown.
+
+        Any other record may have been superseded by a lane in another process, so it is read again.
+
+        Args:
+            data (dict): The cached history record.
+
+        Returns:
+            bool: True if the record was entered (entry lane) or exited (exit lane) within the cooldown,
+                or the vehicle is still inside (exit lane).
+        """
+        current_time = time.time()
+        if self.action == "entry":
+            return current_time - data["enter_time"] < self.cooldown
+
+        return not data.get("exit_time") or current_time - data["exit_time"] < self.cooldown
+
+
+    def find_history(self, car_plate: str) -> dict:
+        """
+        Retrieve the latest history record of the vehicle, from the presence table when its record fits the action.
+
+        Args:
+            car_plate (str): The license plate of the vehicle.
+
+        Returns:
+            dict: The latest history record, {} if the vehicle has none, or None if retrieval fails.
+        """
+        if self.presence:
+            data = self.presence.lookup(car_plate)
+            if data is not None:
+                if self.fits_action(data):
+                    return data
+                self.presence.metrics.increment("refreshed")
+
+        data = self.history_db.find_by_car_plate(car_plate)
+        if self.presence and data is not None:
+            self.presence.store(car_plate, data)
+
+        return data
+
+
     def verify_vehicle(self, car_plate: str) -> str:
         """
         Verify the vehicle and process the detection.
@@ -133,11 +242,12 @@ class VehicleDetectionProcessor:
             str: The role of the user or None if processing fails.
         """
         try:
+            car_plate = self.resolve_plate(car_plate)
             user, vehicle_type = self.get_user_and_vehicle_type(car_plate)
             if not user:
                 return
 
-            data = history_db.find_by_car_plate(car_plate)
+            data = self.find_history(car_plate)
 
             if self.action == "entry":
                 return self.process_entry(car_plate, user, vehicle_type, data)
@@ -0,0 +1,547 @@
+from src.utils.config import AUTH_INDEX_REFRESH, AUTH_INDEX_MAX_AGE, METRICS_INTERVAL, RECONNECT_DELAY, FUZZY_MATCH
+from src.utils.config import AUTH_INDEX_FULL_RELOAD, AUTH_SNAPSHOT_FILE
+from src.controller.plate_match import PlateMatcher
+from src.database.visitor import VISITOR_GRACE_PERIOD
+from src.database.setup import get_database
+from src.utils.metrics import Metrics
+from datetime import datetime, timezone
+from src.utils.log import write_log
+import threading
+import sqlite3
+import time
+import os
+import re
+
+
+def normalize_plate(car_plate: str) -> str:
+    """
+    Normalize a car plate for lookups, keeping only upper-case letters and digits.
+
+    Args:
+        car_plate (str): The car plate.
+
+    Returns:
+        str: The normalized car plate.
+    """
+    return re.sub(r"[^A-Z0-9]", "", str(car_plate).upper()) if car_plate else ""
+
+
+# Seconds a change lookup reaches back before the previous one, covering clock skew between writers
+DELTA_OVERLAP = 5
+
+USER_PROJECTION = {"vehicle": True, "group": True, "role": True}
+VISITOR_PROJECTION = {"license_plate": True, "enter_time": True, "exit_time": True, "group": True, "vehicle_type": True}
+
+
+def resident_plates(user: dict) -> list:
+    """
+    Collect the indexed plates of a user.
+
+    Args:
+        user (dict): The user document.
+
+    Returns:
+        list: The (plate, (user, vehicle type)) of every vehicle of the user.
+    """
+    entry = {"group": user.get("group"), "role": user.get("role")}
+    return [
+        (normalize_plate(vehicle.get("license_plate")), (entry, vehicle.get("type")))
+        for vehicle in user.get("vehicle") or []
+        if normalize_plate(vehicle.get("license_plate"))
+    ]
+
+
+def visitor_visit(visitor: dict) -> tuple:
+    """
+    Build the indexed visit of a visitor record.
+
+    Args:
+        visitor (dict): The visitor record.
+
+    Returns:
+        tuple: The plate and its (window, user, vehicle type) visit, or (None, None) if the record has no plate or window.
+    """
+    plate = normalize_plate(visitor.get("license_plate"))
+    enter_time, exit_time = visitor.get("enter_time"), visitor.get("exit_time")
+    if not (plate and enter_time and exit_time):
+        return None, None
+
+    window = (enter_time - VISITOR_GRACE_PERIOD, exit_time + VISITOR_GRACE_PERIOD)
+    return plate, (window, {"group": visitor.get("group"), "role": "Visitor"}, visitor.get("vehicle_type"))
+
+
+class AuthorizationIndex:
+
+    def __init__(self, refresh: float = AUTH_INDEX_REFRESH, max_age: float = AUTH_INDEX_MAX_AGE,
+                 full_reload: float = AUTH_INDEX_FULL_RELOAD, snapshot_file: str = AUTH_SNAPSHOT_FILE) -> None:
+        """
+        Initialize the process-local index of registered resident and visitor plates.
+
+        Only the plate, role, group and vehicle type of each registration are kept, in memory and in the
+        local SQLite snapshot that every successful load is saved to. The index is restored from the
+        snapshot when MongoDB is unreachable at startup.
+
+        Args:
+            refresh (float): The number of seconds between lookups of changed users and new visitor records.
+            max_age (float): The age in seconds after which the index is too stale to decide on while MongoDB is reachable.
+            full_reload (float): The number of seconds between full reloads, which also drop deleted users.
+            snapshot_file (str): The path of the SQLite snapshot, empty to keep no snapshot.
+        """
+        self.refresh = refresh
+        self.max_age = max_age
+        self.full_reload = full_reload
+        self.snapshot_file = snapshot_file
+        self.residents = {}
+        self.visitors = {}
+        self.owners = {}
+        self.visitor_ids = set()
+        self.deletion_ids = set()
+        self.loaded_at = None
+        self.full_loaded_at = None
+        self.matcher = None
+        self.online = False
+        self.streaming = False
+        self.metrics = Metrics("authorization")
+        self.lock = threading.Lock()
+        self.changed = threading.Event()
+        self.stop_event = threading.Event()
+        self.threads = []
+
+
+    def load(self) -> bool:
+        """
+        Bulk-load every resident vehicle and visitor record, then swap them in at once.
+
+        Returns:
+            bool: True if the index was loaded.
+        """
+        try:
+            start_time, loaded_at = time.perf_counter(), time.time()
+            database = get_database()
+
+            residents, owners = {}, {}
+            for user in database["users"].find({}, USER_PROJECTION):
+                owners[user["_id"]] = []
+                for plate, entry in resident_plates(user):
+                    if plate not in residents:
+                        residents[plate] = entry
+                        owners[user["_id"]].append(plate)
+
+            visitors, visitor_ids = {}, set()
+            query = {"exit_time": {"$gt": time.time() - VISITOR_GRACE_PERIOD}}
+            for visitor in database["visitor-record"].find(query, VISITOR_PROJECTION):
+                plate, visit = visitor_visit(visitor)
+                if plate:
+                    visitors.setdefault(plate, []).append(visit)
+                    visitor_ids.add(visitor["_id"])
+
+            changed = residents != self.residents or visitors != self.visitors
+            self.owners, self.visitor_ids = owners, visitor_ids
+            self.swap(residents, visitors, loaded_at)
+            self.full_loaded_at = loaded_at
+            self.online = True
+            if changed:
+                self.save()
+
+            self.metrics.observe("load", time.perf_counter() - start_time)
+            return True
+
+        except Exception as e:
+            self.online = False
+            self.metrics.increment("load_errors")
+            write_log("error", f"[AuthorizationIndex] Failed to load authorization index: {e}")
+
+            if self.loaded_at is None:
+                self.restore()
+            return False
+
+
+    def load_changes(self) -> bool:
+        """
+        Apply the users and visitor records deleted, the users inserted or updated and the visitor records
+        inserted since the last load.
+
+        Deletes are read from the tombstones that UserDatabase and VisitorRecord record before deleting,
+        and are applied first so a plate deleted and registered again stays registered. Users are found
+        by the creation time in their _id or by the updated_at that UserDatabase sets on every write;
+        a changed user's plates replace the ones it had.
+
+        Returns:
+            bool: True if the changes were applied.
+        """
+        from bson import ObjectId
+
+        try:
+            start_time, loaded_at = time.perf_counter(), time.time()
+            since = self.loaded_at - DELTA_OVERLAP
+            created_since = ObjectId.from_datetime(datetime.fromtimestamp(since, timezone.utc))
+            database = get_database()
+
+            # A tombstone the previous lookup already applied can fall within the overlap again
+            tombstones = list(database["deletions"].find({"deleted_at": {"$gte": since}}))
+            deletions = [deletion for deletion in tombstones if deletion["_id"] not in self.deletion_ids]
+            users = list(database["users"].find(
+                {"$or": [{"_id": {"$gte": created_since}}, {"updated_at": {"$gte": since}}]}, USER_PROJECTION
+            ))
+            visitors = [
+                visitor for visitor in database["visitor-record"].find({"_id": {"$gte": created_since}}, VISITOR_PROJECTION)
+                if visitor["_id"] not in self.visitor_ids
+            ]
+
+            changed = False
+            if deletions or users or visitors:
+                residents = dict(self.residents)
+                visitor_plates = {plate: list(visits) for plate, visits in self.visitors.items()}
+                for deletion in deletions:
+                    if deletion["collection"] == "users":
+                        for plate in self.owners.pop(deletion.get("record_id"), []):
+                            residents.pop(plate, None)
+                    else:
+                        for plate in deletion.get("plates") or []:
+                            visitor_plates.pop(normalize_plate(plate), None)
+
+                for user in users:
+                    for plate in self.owners.pop(user["_id"], []):
+                        residents.pop(plate, None)
+
+                    self.owners[user["_id"]] = []
+                    for plate, entry in resident_plates(user):
+                        if plate not in residents:
+                            residents[plate] = entry
+                            self.owners[user["_id"]].append(plate)
+
+                for visitor in visitors:
+                    plate, visit = visitor_visit(visitor)
+                    self.visitor_ids.add(visitor["_id"])
+                    if plate:
+                        visitor_plates.setdefault(plate, []).append(visit)
+
+                changed = residents != self.residents or visitor_plates != self.visitors
+                self.swap(residents, visitor_plates, loaded_at)
+            else:
+                with self.lock:
+                    self.loaded_at = loaded_at
+
+            self.deletion_ids = {deletion["_id"] for deletion in tombstones}
+            self.online = True
+            if changed:
+                self.save()
+
+            self.metrics.increment("delta_deletions", len(deletions))
+            self.metrics.increment("delta_users", len(users))
+            self.metrics.increment("delta_visitors", len(visitors))
+            self.metrics.observe("load_changes", time.perf_counter() - start_time)
+            return True
+
+        except Exception as e:
+            self.online = False
+            self.metrics.increment("load_errors")
+            write_log("error", f"[AuthorizationIndex] Failed to load authorization changes: {e}")
+            return False
+
+
+    def swap(self, residents: dict, visitors: dict, loaded_at: float) -> None:
+        """
+        Replace the indexed plates at once.
+
+        Args:
+            residents (dict): The resident plates.
+            visitors (dict): The visitor plates.
+            loaded_at (float): The time the plates were read from MongoDB.
+        """
+        # The BK-tree is only rebuilt when the set of registered plates changed
+        matcher = self.matcher
+        if FUZZY_MATCH and (matcher is None or set(residents) | set(visitors) != self.plates()):
+            matcher = PlateMatcher(list(set(residents) | set(visitors)))
+
+        with self.lock:
+            self.residents = residents
+            self.visitors = visitors
+            self.matcher = matcher
+            self.loaded_at = loaded_at
+
+        self.metrics.set_gauge("residents", len(residents))
+        self.metrics.set_gauge("visitors", len(visitors))
+
+
+    def save(self) -> None:
+        """
+        Replace the SQLite snapshot with the indexed plates, keeping only their role, group and vehicle type.
+        """
+        if not self.snapshot_file:
+            return
+
+        try:
+            with self.lock:
+                residents = [(plate, user["role"], user["group"], vtype) for plate, (user, vtype) in self.residents.items()]
+                visitors = [
+                    (plate, valid_from, valid_until, user["role"], user["group"], vtype)
+                    for plate, visits in self.visitors.items()
+                    for (valid_from, valid_until), user, vtype in visits
+                ]
+                loaded_at = self.loaded_at
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_file)), exist_ok=True)
+            connection = sqlite3.connect(self.snapshot_file)
+            try:
+                with connection:
+                    # Dropping the tables also clears snapshots that held whole user and visitor documents
+                    connection.execute("DROP TABLE IF EXISTS residents")
+                    connection.execute("DROP TABLE IF EXISTS visitors")
+                    connection.execute("CREATE TABLE residents (license_plate TEXT PRIMARY KEY, role TEXT, grp TEXT, vehicle_type TEXT)")
+                    connection.execute("CREATE TABLE visitors (license_plate TEXT, valid_from REAL, valid_until REAL, role TEXT, grp TEXT, vehicle_type TEXT)")
+                    connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL)")
+                    connection.executemany("INSERT INTO residents VALUES (?, ?, ?, ?)", residents)
+                    connection.executemany("INSERT INTO visitors VALUES (?, ?, ?, ?, ?, ?)", visitors)
+                    connection.execute("INSERT OR REPLACE INTO meta VALUES ('loaded_at', ?)", (loaded_at,))
+            finally:
+                connection.close()
+
+            self.metrics.increment("snapshots_saved")
+
+        except Exception as e:
+            write_log("error", f"[AuthorizationIndex] Failed to save authorization snapshot: {e}")
+
+
+    def restore(self) -> bool:
+        """
+        Restore the indexed plates from the SQLite snapshot.
+
+        Returns:
+            bool: True if a snapshot was restored.
+        """
+        if not self.snapshot_file or not os.path.exists(self.snapshot_file):
+            return False
+
+        try:
+            connection = sqlite3.connect(self.snapshot_file)
+            try:
+                residents = {
+                    plate: ({"group": group, "role": role}, vtype)
+                    for plate, role, group, vtype in connection.execute("SELECT license_plate, role, grp, vehicle_type FROM residents")
+                }
+                visitors = {}
+                query = "SELECT license_plate, valid_from, valid_until, role, grp, vehicle_type FROM visitors"
+                for plate, valid_from, valid_until, role, group, vtype in connection.execute(query):
+                    visitors.setdefault(plate, []).append(((valid_from, valid_until), {"group": group, "role": role}, vtype))
+                loaded_at = connection.execute("SELECT value FROM meta WHERE key = 'loaded_at'").fetchone()[0]
+            finally:
+                connection.close()
+
+            self.swap(residents, visitors, loaded_at)
+            self.metrics.increment("snapshots_restored")
+            write_log("info", (
+                f"[AuthorizationIndex] Restored {len(residents)} residents and {len(visitors)} visitors "
+                f"from a snapshot taken {time.time() - loaded_at:.0f}s ago"
+            ))
+            return True
+
+        except Exception as e:
+            write_log("error", f"[AuthorizationIndex] Failed to restore authorization snapshot: {e}")
+            return False
+
+
+    def plates(self) -> set:
+        """
+        The set of registered resident and visitor plates.
+        """
+        with self.lock:
+            return set(self.residents) | set(self.visitors)
+
+
+    def match(self, car_plate: str) -> dict:
+        """
+        Find the registered plate an OCR reading most likely stands for.
+
+        Args:
+            car_plate (str): The license plate read by OCR.
+
+        Returns:
+            dict: The match of PlateMatcher.match, or None if the plate is registered as read or no
+                registered plate is close enough.
+        """
+        plate = normalize_plate(car_plate)
+        with self.lock:
+            registered = plate in self.residents or plate in self.visitors
+            matcher = self.matcher
+
+        if registered or matcher is None:
+            return None
+
+        start_time = time.perf_counter()
+        match = matcher.match(plate)
+        self.metrics.observe("fuzzy_match", time.perf_counter() - start_time)
+
+        if match is None:
+            self.metrics.increment("fuzzy_misses")
+        elif match["ambiguous"]:
+            self.metrics.increment("fuzzy_ambiguous")
+        else:
+            self.metrics.increment("fuzzy_matches")
+
+        return match
+
+
+    def staleness(self) -> float:
+        """
+        The number of seconds since the index was last loaded, infinite if it never was.
+        """
+        return time.time() - self.loaded_at if self.loaded_at else float("inf")
+
+
+    def is_fresh(self) -> bool:
+        """
+        Check if the index is recent enough to decide on.
+
+        Returns:
+            bool: True if the index was loaded within max_age seconds.
+        """
+        return self.staleness() <= self.max_age
+
+
+    def is_usable(self) -> bool:
+        """
+        Check if decisions should be served from the index rather than from MongoDB.
+
+        Returns:
+            bool: True if the index is fresh, or MongoDB is unreachable and the index holds the last known plates.
+        """
+        return self.is_fresh() or (not self.online and self.loaded_at is not None)
+
+
+    def is_authoritative(self) -> bool:
+        """
+        Check if a miss in the index can be trusted without asking MongoDB.
+
+        Returns:
+            bool: True if change streams keep the index current, or MongoDB is unreachable anyway.
+        """
+        return self.streaming or not self.online
+
+
+    def lookup(self, car_plate: str) -> tuple:
+        """
+        Find the user and vehicle type of a plate, a resident first and then a visitor within their window.
+
+        Args:
+            car_plate (str): The license plate of the vehicle.
+
+        Returns:
+            tuple: The user data and vehicle type, or (None, None) if the plate is not registered.
+        """
+        plate = normalize_plate(car_plate)
+        current_time = time.time()
+        self.metrics.set_gauge("staleness_seconds", self.staleness())
+
+        with self.lock:
+            resident = self.residents.get(plate)
+            visits = self.visitors.get(plate, [])
+
+        if resident:
+            self.metrics.increment("resident_hits")
+            return resident
+
+        for (valid_from, valid_until), user, vehicle_type in visits:
+            if valid_from < current_time < valid_until:
+                self.metrics.increment("visitor_hits")
+                return user, vehicle_type
+
+        self.metrics.increment("misses")
+        return None, None
+
+
+    def start(self) -> None:
+        """
+        Load the index and keep it fresh with change streams, falling back to periodic reloads.
+        """
+        self.load()
+        for target in (self.poll, self.watch):
+            thread = threading.Thread(target=target, name=f"authorization-{target.__name__}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+
+    def poll(self) -> None:
+        """
+        Apply changes every refresh seconds and reload the whole index every full_reload seconds,
+        or soon after a change stream event.
+        """
+        last_report = time.time()
+        while not self.stop_event.is_set():
+            changed = self.changed.wait(self.refresh)
+            if self.stop_event.is_set():
+                break
+
+            if changed:
+                # Let a burst of changes settle into a single reload
+                time.sleep(0.2)
+                self.changed.clear()
+                self.metrics.increment("change_reloads")
+
+            if changed or self.full_loaded_at is None or time.time() - self.full_loaded_at >= self.full_reload:
+                self.load()
+            else:
+                self.load_changes()
+            self.metrics.set_gauge("staleness_seconds", self.staleness())
+
+            if time.time() - last_report >= METRICS_INTERVAL:
+                self.metrics.log_summary()
+                last_report = time.time()
+
+
+    def watch(self) -> None:
+        """
+        Watch the users and visitor-record collections and trigger a full reload on every change, which
+        also covers deletes.
+
+        Change streams need a replica set; without one the index relies on the periodic change lookups.
+        """
+        pipeline = [{"$match": {"ns.coll": {"$in": ["users", "visitor-record"]}}}]
+        while not self.stop_event.is_set():
+            try:
+                with get_database().watch(pipeline) as stream:
+                    self.streaming = True
+                    write_log("info", "[AuthorizationIndex] Watching user and visitor changes")
+                    while not self.stop_event.is_set():
+                        if stream.try_next() is not None:
+                            self.changed.set()
+                        else:
+                            time.sleep(0.5)
+
+            except Exception as e:
+                if not self.streaming:
+                    write_log("info", f"[AuthorizationIndex] Change streams unavailable, looking up changes every {self.refresh}s: {e}")
+                    return
+
+                self.streaming = False
+                write_log("error", f"[AuthorizationIndex] Change stream interrupted, reconnecting: {e}")
+                self.stop_event.wait(RECONNECT_DELAY)
+
+
+    def stop(self) -> None:
+        """
+        Stop refreshing the index.
+        """
+        self.stop_event.set()
+        self.changed.set()
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_authorization_index() -> AuthorizationIndex:
+    """
+    Return the authorization index shared by every lane of the process, loading it on first use.
+
+    Returns:
+        AuthorizationIndex: The shared authorization index.
+    """
+    global _index
+
+    with _lock:
+        if _index is None:
+            _index = AuthorizationIndex()
+            _index.start()
+
+    return _index
@@ -0,0 +1,33 @@
+from src.database.setup import get_database
+from datetime import datetime, timezone
+from src.utils.log import write_log
+import time
+
+
+# Tombstones are kept far longer than the gap between two authorization index refreshes
+DELETION_RETENTION = 86400
+
+
+def record_deletion(collection: str, plates: list, record_id=None) -> None:
+    """
+    Record the plates a delete is about to revoke, so the authorization index can drop them without a full reload.
+
+    The tombstone is written before the delete; if the delete then fails, the plates are only
+    missing from the index until its next full reload.
+
+    Args:
+        collection (str): The collection the records are deleted from.
+        plates (list): The license plates of the deleted records.
+        record_id (ObjectId): The _id of the deleted user, if a single user is deleted.
+    """
+    try:
+        deleted_at = time.time()
+        get_database()["deletions"].insert_one({
+            "collection": collection,
+            "record_id": record_id,
+            "plates": plates,
+            "deleted_at": deleted_at,
+            "expire_at": datetime.fromtimestamp(deleted_at + DELETION_RETENTION, timezone.utc)
+        })
+    except Exception as e:
+        write_log("error", f"[Deletions] Failed to record deletion from {collection}: {e}")
@@ -1,24 +1,501 @@
-from src.database.setup import database
+from src.utils.config import HISTORY_BATCH_SIZE, HISTORY_FLUSH_INTERVAL, HISTORY_RETRY_MAX_DELAY, HISTORY_DRAIN_TIMEOUT
+from src.utils.config import HISTORY_QUEUE_SIZE, HISTORY_JOURNAL_FILE, METRICS_INTERVAL
+from src.database.setup import get_database
+from src.utils.metrics import Metrics
 from src.utils.log import write_log
+import threading
+import queue
+import time
+import os
+
+
+def lock_file(handle) -> bool:
+    """
+    Take an exclusive, non-blocking lock on an open file, held until the file is closed.
+
+    Args:
+        handle (file): The open file.
+
+    Returns:
+        bool: True if the lock was taken, False if another process holds it.
+    """
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+class HistoryWriter:
+
+    def __init__(self, batch_size: int = HISTORY_BATCH_SIZE, flush_interval: float = HISTORY_FLUSH_INTERVAL,
+                 retry_max_delay: float = HISTORY_RETRY_MAX_DELAY, drain_timeout: float = HISTORY_DRAIN_TIMEOUT,
+                 queue_size: int = HISTORY_QUEUE_SIZE, journal_file: str = HISTORY_JOURNAL_FILE) -> None:
+        """
+        Initialize the write-behind queue that flushes history inserts and updates in ordered bulk writes.
+
+        Every queued write is first appended to a local journal, which is truncated once the queue is
+        flushed. Each process locks its own journal, the first of journal_file, journal_file.1, ... that
+        no other process holds, so a restarted process replays the writes it left unflushed and never
+        those of a process still running.
+
+        Args:
+            batch_size (int): The number of queued writes that triggers a flush.
+            flush_interval (float): The number of seconds after the first queued write that triggers a flush.
+            retry_max_delay (float): The longest backoff in seconds between retries of a failed flush.
+            drain_timeout (float): The number of seconds spent draining the queue on shutdown.
+            queue_size (int): The most writes waiting to be flushed; further writes are dropped and counted.
+            journal_file (str): The path of the append-only journal, empty to keep no journal.
+        """
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.retry_max_delay = retry_max_delay
+        self.drain_timeout = drain_timeout
+        self.journal_lock = threading.Lock()
+        self.journal_handle = None
+        self.journal_file = self.claim_journal(journal_file) if journal_file else ""
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self.orphaned = False
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.metrics = Metrics("history")
+        self.stop_event = threading.Event()
+        self.drain_deadline = None
+        self.thread = threading.Thread(target=self.run, name="history-writer", daemon=True)
+        self.thread.start()
+        self.replay()
+
+
+    def claim_journal(self, journal_file: str) -> str:
+        """
+        Lock the first journal that no other process holds.
+
+        Args:
+            journal_file (str): The path of the first journal.
+
+        Returns:
+            str: The path of the locked journal, or "" if every candidate is held.
+        """
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(journal_file)), exist_ok=True)
+            for index in range(64):
+                candidate = journal_file if index == 0 else f"{journal_file}.{index}"
+                handle = open(candidate + ".lock", "a")
+                if lock_file(handle):
+                    self.journal_handle = handle
+                    return candidate
+                handle.close()
+
+            write_log("error", f"[HistoryWriter] Every history journal next to {journal_file} is in use, keeping no journal")
+
+        except Exception as e:
+            write_log("error", f"[HistoryWriter] Failed to lock history journal: {e}")
+
+        return ""
+
+
+    def put(self, action: str, data: dict) -> None:
+        """
+        Journal and queue a write, dropping it if the queue is full.
+
+        A dropped write stays in the journal and is written again once the queue has drained.
+
+        Args:
+            action (str): The write, either "insert" or "update".
+            data (dict): The record as written, including its _id.
+        """
+        with self.journal_lock:
+            if self.journal_file:
+                from bson import json_util
+
+                try:
+                    with open(self.journal_file, "a") as journal_file:
+                        journal_file.write(json_util.dumps({"action": action, "data": data}) + "\n")
+                except Exception as e:
+                    self.metrics.increment("journal_errors")
+                    write_log("error", f"[HistoryWriter] Failed to journal history write: {e}")
+
+            self.enqueue(action, data, block=False)
+
+
+    def enqueue(self, action: str, data: dict, block: bool) -> bool:
+        """
+        Queue a write and remember its record as the latest pending one of the plate.
+
+        Args:
+            action (str): The write, either "insert" or "update".
+            data (dict): The record as written, including its _id.
+            block (bool): Wait for room in the queue instead of dropping the write.
+
+        Returns:
+            bool: True if the write was queued.
+        """
+        plate = data.get("license_plate")
+        with self.pending_lock:
+            self.pending[plate] = data
+
+        try:
+            self.queue.put((action, dict(data), data), block=block)
+        except queue.Full:
+            with self.pending_lock:
+                if self.pending.get(plate) is data:
+                    del self.pending[plate]
+
+            self.orphaned = True
+            self.metrics.increment("dropped")
+            write_log("error", f"[HistoryWriter] History queue is full, dropped {action} of {plate}")
+            return False
+
+        self.metrics.increment("queued")
+        self.metrics.set_gauge("queue_depth", self.queue.qsize())
+        return True
+
+
+    def replay(self) -> None:
+        """
+        Queue the writes left in the journal by a previous run, waiting for room in the queue.
+
+        Replayed inserts that already reached MongoDB fail as duplicates and updates are idempotent,
+        so the whole journal can be queued again.
+        """
+        if not self.journal_file or not os.path.exists(self.journal_file):
+            return
+
+        try:
+            from bson import json_util
+
+            count = 0
+            # Holding the journal lock keeps the journal from being truncated before every line is queued
+            with self.journal_lock, open(self.journal_file) as journal_file:
+                for line in journal_file:
+                    # A line cut short by a crash is the only one that can fail to parse
+                    try:
+                        entry = json_util.loads(line)
+                    except ValueError:
+                        continue
+
+                    self.enqueue(entry["action"], entry["data"], block=True)
+                    count += 1
+
+            if count:
+                self.metrics.increment("replayed", count)
+                write_log("info", f"[HistoryWriter] Replayed {count} journaled history writes")
+
+        except Exception as e:
+            write_log("error", f"[HistoryWriter] Failed to replay history journal: {e}")
+
+
+    def truncate_journal(self) -> None:
+        """
+        Empty the journal once every queued write was flushed and none was dropped.
+        """
+        if not self.journal_file or self.orphaned:
+            return
+
+        # A held lock means a write is being journaled or replayed, so the queue is not done
+        if not self.journal_lock.acquire(blocking=False):
+            return
+
+        try:
+            if self.queue.empty():
+                open(self.journal_file, "w").close()
+        except Exception as e:
+            write_log("error", f"[HistoryWriter] Failed to truncate history journal: {e}")
+        finally:
+            self.journal_lock.release()
+
+
+    def recover_journal(self) -> None:
+        """
+        Write the whole journal again once the queue has drained after writes were dropped or lost,
+        then start a fresh journal.
+
+        Inserts already in MongoDB fail as duplicates and updates are idempotent. Writes queued
+        meanwhile are journaled after the recovered ones and flushed after them.
+        """
+        if not self.journal_file:
+            self.orphaned = False
+            return
+
+        from bson import json_util
+
+        with self.journal_lock:
+            if not self.queue.empty():
+                return
+
+            try:
+                with open(self.journal_file) as journal_file:
+                    lines = journal_file.readlines()
+                open(self.journal_file, "w").close()
+            except Exception as e:
+                write_log("error", f"[HistoryWriter] Failed to recover history journal: {e}")
+                return
+
+            self.orphaned = False
+
+        entries = []
+        for line in lines:
+            # A line cut short by a crash is the only one that can fail to parse
+            try:
+                entries.append(json_util.loads(line))
+            except ValueError:
+                continue
+
+        self.metrics.increment("recovered", len(entries))
+        write_log("info", f"[HistoryWriter] Writing {len(entries)} journaled history writes again")
+        for start in range(0, len(entries), self.batch_size):
+            batch = [(entry["action"], dict(entry["data"]), entry["data"]) for entry in entries[start:start + self.batch_size]]
+            if not self.flush(batch):
+                # Put the unwritten entries back in front of the writes journaled meanwhile
+                with self.journal_lock:
+                    try:
+                        with open(self.journal_file) as journal_file:
+                            newer = journal_file.read()
+                        with open(self.journal_file, "w") as journal_file:
+                            journal_file.writelines(lines[start:])
+                            journal_file.write(newer)
+                    except Exception as e:
+                        write_log("error", f"[HistoryWriter] Failed to restore history journal: {e}")
+
+                    self.orphaned = True
+                return
+
+
+    def latest(self, car_plate: str) -> dict:
+        """
+        Return the latest record of a plate that was queued but not flushed yet.
+
+        Args:
+            car_plate (str): The license plate of the vehicle.
+
+        Returns:
+            dict: The pending record, or None if the plate has no pending write.
+        """
+        with self.pending_lock:
+            return self.pending.get(car_plate)
+
+
+    def next_batch(self) -> list:
+        """
+        Collect queued writes until the batch is full or flush_interval seconds passed since the first one.
+
+        Returns:
+            list: The (action, record copy, record) writes of the batch.
+        """
+        batch, deadline = [], None
+        while len(batch) < self.batch_size:
+            timeout = self.flush_interval if deadline is None else deadline - time.time()
+            if self.stop_event.is_set():
+                timeout = 0
+
+            try:
+                batch.append(self.queue.get(timeout=max(0, timeout)))
+            except queue.Empty:
+                break
+
+            if deadline is None:
+                deadline = time.time() + self.flush_interval
+
+        return batch
+
+
+    def flush(self, batch: list) -> bool:
+        """
+        Write a batch in one ordered bulk write, retrying with exponential backoff until it succeeds.
+
+        Inserts carry their client-side _id, so an insert already applied by an earlier attempt fails as a
+        duplicate and is skipped. Any other rejected write is logged and dropped so it cannot block the queue.
+
+        Args:
+            batch (list): The (action, record copy, record) writes.
+
+        Returns:
+            bool: False if the drain timeout passed before the batch was written.
+        """
+        from pymongo.errors import BulkWriteError
+        from pymongo import InsertOne, UpdateOne
+
+        start_time, attempt = time.perf_counter(), 0
+        remaining = [
+            InsertOne(record) if action == "insert" else UpdateOne({"_id": record["_id"]}, {"$set": record})
+            for action, record, _ in batch
+        ]
+        while remaining:
+            try:
+                get_database()["history-record"].bulk_write(remaining, ordered=True)
+                self.metrics.increment("flushed", len(remaining))
+                remaining = []
+                continue
+
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors") or []
+                if write_errors:
+                    error = write_errors[0]
+                    if error.get("code") == 11000:
+                        self.metrics.increment("duplicates")
+                    else:
+                        self.metrics.increment("rejected")
+                        write_log("error", f"[HistoryWriter] History write rejected: {error.get('errmsg')}")
+
+                    self.metrics.increment("flushed", error["index"])
+                    remaining = remaining[error["index"] + 1:]
+                    continue
+
+                # Only the write concern failed, so the whole batch is retried
+                failure = e
+
+            except Exception as e:
+                failure = e
+
+            if self.drain_deadline and time.time() >= self.drain_deadline:
+                self.metrics.increment("unflushed", len(remaining))
+                write_log("error", f"[HistoryWriter] Left {len(remaining)} history writes unflushed on shutdown: {failure}")
+                break
+
+            delay = min(self.retry_max_delay, 0.5 * 2 ** attempt)
+            if self.drain_deadline:
+                delay = min(delay, max(0.0, self.drain_deadline - time.time()))
+            attempt += 1
+            self.metrics.increment("retries")
+            write_log("error", f"[HistoryWriter] Failed to flush history writes, retrying in {delay:.1f}s: {failure}")
+            time.sleep(delay)
+
+        self.metrics.observe("flush", time.perf_counter() - start_time)
+
+        with self.pending_lock:
+            for _, _, data in batch:
+                if self.pending.get(data.get("license_plate")) is data:
+                    del self.pending[data.get("license_plate")]
+
+        return not remaining
+
+
+    def run(self) -> None:
+        """
+        Flush queued writes until stopped and the queue is drained.
+
+        Writes that were dropped or lost to a failed flush stay in the journal, which is written again
+        once the queue has drained, or replayed by the next run if the drain timeout passed first.
+        """
+        last_report = time.time()
+        while True:
+            batch = []
+            try:
+                batch = self.next_batch()
+                if batch and not self.flush(batch):
+                    self.orphaned = True
+                elif self.queue.empty():
+                    if self.orphaned and not (self.drain_deadline and time.time() >= self.drain_deadline):
+                        self.recover_journal()
+                    elif batch:
+                        self.truncate_journal()
+
+            except Exception as e:
+                # The writes in hand stay in the journal, so one bad flush cannot stop the writer
+                self.orphaned = True
+                self.metrics.increment("writer_errors")
+                write_log("error", f"[HistoryWriter] Failed to write history batch: {e}")
+                self.stop_event.wait(self.flush_interval)
+
+            if not batch and self.stop_event.is_set():
+                break
+
+            self.metrics.set_gauge("queue_depth", self.queue.qsize())
+            if time.time() - last_report >= METRICS_INTERVAL:
+                self.metrics.log_summary()
+                last_report = time.time()
+
+
+    def stop(self) -> None:
+        """
+        Flush every queued write, giving up on retries after drain_timeout seconds.
+        """
+        self.drain_deadline = time.time() + self.drain_timeout
+        self.stop_event.set()
+        self.thread.join(timeout=self.drain_timeout + 5)
+        self.metrics.log_summary()
+
+        if self.journal_handle:
+            self.journal_handle.close()
+
+
+_writer = None
+_lock = threading.Lock()
+
+
+def get_history_writer() -> HistoryWriter:
+    """
+    Return the history writer shared by every lane of the process, starting it on first use.
+
+    Returns:
+        HistoryWriter: The shared history writer.
+    """
+    global _writer
+
+    with _lock:
+        if _writer is None:
+            _writer = HistoryWriter()
+
+    return _writer
+
+
+def stop_history_writer() -> None:
+    """
+    Drain and stop the shared history writer, if it was started.
+    """
+    global _writer
+
+    with _lock:
+        writer, _writer = _writer, None
+
+    if writer:
+        writer.stop()
 
 
 class HistoryRecord:
 
-    def __init__(self) -> None:
+    def __init__(self, write_behind: bool = False) -> None:
         """
         Initialize the history record database.
+
+        Args:
+            write_behind (bool): Queue inserts and updates for the shared HistoryWriter instead of
+                waiting for MongoDB to acknowledge them.
+        """
+        self.collection_name = "history-record"
+        self.writer = get_history_writer() if write_behind else None
+
+
+    @property
+    def collection(self):
+        """
+        Returns the collection, connecting to the database on first use.
         """
-        self.collection = database["history-record"]
+        return get_database()[self.collection_name]
 
 
     def insert(self, data: dict) -> None:
         """
         Insert a history record into the database.
+
+        The _id is generated here, so the record can be updated before the queued insert is flushed.
         
         Args:
             data (dict): The history record data.
         """
         try:
+            if self.writer:
+                from bson import ObjectId
+
+                data.setdefault("_id", ObjectId())
+                self.writer.put("insert", data)
+                return
+
             self.collection.insert_one(data)
         except Exception as e:
             write_log("error", f"[HistoryRecord] Failed to insert history record: {e}")
@@ -37,6 +514,22 @@ class HistoryRecord:
             write_log("error", f"[HistoryRecord] Failed to retrieve history records: {e}")
 
 
+    def find_by_group(self, group: str) -> list:
+        """
+        Returns the history records of a group.
+
+        Args:
+            group (str): The group, matched exactly even when empty or None.
+
+        Returns:
+            list: list of the history records of the group.
+        """
+        try:
+            return list(self.collection.find({"group": group}, {"_id": False}))
+        except Exception as e:
+            write_log("error", f"[HistoryRecord] Failed to retrieve history records by group: {e}")
+
+
     def find_by_car_plate(self, car_plate) -> dict:
         """
         Find a history record by car plate.
@@ -48,6 +541,11 @@ class HistoryRecord:
             dict: The latest history record.
         """
         try:
+            # A record still waiting in the write-behind queue is newer than anything in the database
+            pending = self.writer.latest(car_plate) if self.writer else None
+            if pending:
+                return pending
+
             data = list(self.collection.find({"license_plate": car_plate}, {})
                                         .sort("enter_time", -1)
                                         .limit(1))
@@ -68,6 +566,11 @@ class HistoryRecord:
             data (dict): The updated history record data.
         """
         try:
+            if self.writer:
+                data["_id"] = id
+                self.writer.put("update", data)
+                return
+
             self.collection.update_one({"_id": id}, {"$set": data})
         except Exception as e:
             write_log("error", f"[HistoryRecord] Failed to update history record: {e}")
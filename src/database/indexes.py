@@ -0,0 +1,56 @@
+from src.database.setup import get_database
+from src.utils.log import write_log
+
+
+# The indexes behind every query on the gate and web view paths, as (keys, options) per collection
+INDEXES = {
+    "users": [
+        ([("vehicle.license_plate", 1)], {"name": "vehicle_license_plate"}),
+        ([("phone_number", 1)], {"name": "phone_number"}),
+        ([("group", 1)], {"name": "group"}),
+        ([("updated_at", 1)], {"name": "updated_at"})
+    ],
+    "visitor-record": [
+        ([("license_plate", 1)], {"name": "license_plate"}),
+        ([("group", 1)], {"name": "group"}),
+        ([("phone_number", 1)], {"name": "phone_number"}),
+        # MongoDB deletes a visitor record once its expire_at has passed
+        ([("expire_at", 1)], {"name": "expire_at", "expireAfterSeconds": 0})
+    ],
+    "history-record": [
+        ([("license_plate", 1), ("enter_time", -1)], {"name": "license_plate_enter_time"}),
+        ([("group", 1), ("enter_time", -1)], {"name": "group_enter_time"})
+    ],
+    "deletions": [
+        ([("deleted_at", 1)], {"name": "deleted_at"}),
+        # MongoDB deletes a tombstone once the authorization index no longer needs it
+        ([("expire_at", 1)], {"name": "expire_at", "expireAfterSeconds": 0})
+    ]
+}
+
+
+def ensure_indexes(database=None) -> bool:
+    """
+    Create any missing index of the gate collections; existing indexes are left untouched.
+
+    Args:
+        database (Database): The database to index, the smart-gate database by default.
+
+    Returns:
+        bool: True if every index exists.
+    """
+    database = database if database is not None else get_database()
+
+    success = True
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                database[collection].create_index(keys, **options)
+            except Exception as e:
+                success = False
+                write_log("error", f"[Indexes] Failed to create index {options['name']} on {collection}: {e}")
+
+    if success:
+        write_log("info", f"[Indexes] Ensured {sum(len(indexes) for indexes in INDEXES.values())} indexes")
+
+    return success
@@ -0,0 +1,145 @@
+from src.utils.config import PRESENCE_TTL, METRICS_INTERVAL
+from src.database.setup import get_database
+from src.utils.metrics import Metrics
+from src.utils.log import write_log
+import threading
+import time
+
+
+class PresenceTable:
+
+    def __init__(self, ttl: float = PRESENCE_TTL) -> None:
+        """
+        Initialize the process-local table of the latest history record of vehicles inside or recently seen.
+
+        Every entry expires ttl seconds after it was loaded or written, which bounds how long a record
+        written by another process can go unseen.
+
+        Args:
+            ttl (float): The number of seconds an entry is trusted.
+        """
+        self.ttl = ttl
+        self.records = {}
+        self.metrics = Metrics("presence")
+        self.lock = threading.Lock()
+        self.last_purge = time.time()
+        self.last_report = time.time()
+
+
+    def load(self) -> bool:
+        """
+        Rebuild the table from the latest history record of every vehicle still inside or seen within ttl seconds.
+
+        Returns:
+            bool: True if the table was loaded.
+        """
+        try:
+            start_time = time.perf_counter()
+            since = time.time() - self.ttl
+            pipeline = [
+                {"$sort": {"license_plate": 1, "enter_time": -1}},
+                {"$group": {"_id": "$license_plate", "record": {"$first": "$$ROOT"}}},
+                {"$replaceRoot": {"newRoot": "$record"}},
+                {"$match": {"$or": [{"exit_time": None}, {"enter_time": {"$gte": since}}, {"exit_time": {"$gte": since}}]}}
+            ]
+
+            expires_at = time.time() + self.ttl
+            records = {
+                record["license_plate"]: (expires_at, record)
+                for record in get_database()["history-record"].aggregate(pipeline, allowDiskUse=True)
+            }
+
+            with self.lock:
+                self.records = records
+
+            self.metrics.observe("load", time.perf_counter() - start_time)
+            self.metrics.set_gauge("size", len(records))
+            return True
+
+        except Exception as e:
+            self.metrics.increment("load_errors")
+            write_log("error", f"[PresenceTable] Failed to load presence table: {e}")
+            return False
+
+
+    def lookup(self, car_plate: str) -> dict:
+        """
+        Find the latest history record of a vehicle.
+
+        Args:
+            car_plate (str): The license plate of the vehicle.
+
+        Returns:
+            dict: The latest history record, or None if the table does not know the vehicle.
+        """
+        current_time = time.time()
+        with self.lock:
+            entry = self.records.get(car_plate)
+            if entry and entry[0] <= current_time:
+                del self.records[car_plate]
+                self.metrics.increment("expired")
+                entry = None
+
+        self.metrics.increment("hits" if entry else "misses")
+        self.report()
+        return entry[1] if entry else None
+
+
+    def store(self, car_plate: str, record: dict) -> None:
+        """
+        Write the latest history record of a vehicle through to the table.
+
+        Vehicles without history are not stored, so a record written by another process is never hidden by a miss.
+
+        Args:
+            car_plate (str): The license plate of the vehicle.
+            record (dict): The latest history record.
+        """
+        if not record:
+            return
+
+        current_time = time.time()
+        with self.lock:
+            self.records[car_plate] = (current_time + self.ttl, record)
+
+            if current_time - self.last_purge >= self.ttl:
+                self.records = {plate: entry for plate, entry in self.records.items() if entry[0] > current_time}
+                self.last_purge = current_time
+
+            size = len(self.records)
+
+        self.metrics.set_gauge("size", size)
+
+
+    def report(self) -> None:
+        """
+        Update the hit rate and log a metrics summary at most once every METRICS_INTERVAL seconds.
+        """
+        counters = self.metrics.snapshot()["counters"]
+        lookups = counters.get("hits", 0) + counters.get("misses", 0)
+        self.metrics.set_gauge("hit_rate", counters.get("hits", 0) / lookups if lookups else 0.0)
+
+        if time.time() - self.last_report >= METRICS_INTERVAL:
+            self.last_report = time.time()
+            self.metrics.log_summary()
+
+
+_table = None
+_lock = threading.Lock()
+
+
+def get_presence_table() -> PresenceTable:
+    """
+    Return the presence table shared by every lane of the process, loading it on first use.
+
+    Returns:
+        PresenceTable: The shared presence table.
+    """
+    global _table
+
+    with _lock:
+        if _table is None:
+            _table = PresenceTable()
+            _table.load()
+
+    return _table
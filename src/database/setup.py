@@ -1,17 +1,58 @@
-from pymongo.mongo_client import MongoClient
-from pymongo.server_api import ServerApi
-from src.utils.config import DATABASE_URL
+from src.utils.config import DATABASE_URL, DATABASE_TIMEOUT
 from src.utils.log import write_log
+import threading
 
 
-# Create a new client and connect to the server
-client = MongoClient(DATABASE_URL, server_api=ServerApi('1'))
-database = client["smart-gate"]
+client = None
+_database = None
+_lock = threading.Lock()
 
 
-# Send a ping to confirm a successful connection
-try:
-    client.admin.command('ping')
-    write_log("info", "Pinged your deployment. You successfully connected to MongoDB!")
-except Exception as e:
-    write_log("error", f"Failed to ping your deployment: {e}")
+def get_database():
+    """
+    Return the MongoDB database, connecting on first use.
+
+    Returns:
+        Database: The smart-gate database.
+    """
+    global client, _database
+
+    if _database is not None:
+        return _database
+
+    with _lock:
+        if _database is None:
+            from pymongo.mongo_client import MongoClient
+            from pymongo.server_api import ServerApi
+
+            # Create a new client and connect to the server
+            # Bounded timeouts keep an unreachable server from stalling gate decisions
+            timeout_ms = int(DATABASE_TIMEOUT * 1000)
+            client = MongoClient(
+                DATABASE_URL,
+                server_api=ServerApi('1'),
+                serverSelectionTimeoutMS=timeout_ms,
+                connectTimeoutMS=timeout_ms,
+                socketTimeoutMS=timeout_ms
+            )
+
+            # Send a ping to confirm a successful connection
+            try:
+                client.admin.command('ping')
+                write_log("info", "Pinged your deployment. You successfully connected to MongoDB!")
+            except Exception as e:
+                write_log("error", f"Failed to ping your deployment: {e}")
+
+            _database = client["smart-gate"]
+
+    return _database
+
+
+def __getattr__(name: str):
+    """
+    Keep `from src.database.setup import database` working without connecting at import.
+    """
+    if name == "database":
+        return get_database()
+
+    raise AttributeError(f"module {__name__} has no attribute {name}")
@@ -1,6 +1,8 @@
 from src.utils.config import ADMIN_PHONE_NUMBER, ADMIN_PASSWORD
-from src.database.setup import database
+from src.database.deletions import record_deletion
+from src.database.setup import get_database
 from src.utils.log import write_log
+import time
 
 
 class UserDatabase:
@@ -9,10 +11,18 @@ class UserDatabase:
         """
         Initialize the user database.
         """
-        self.collection = database["users"]
+        self.collection_name = "users"
         self.add_admin_user()
 
 
+    @property
+    def collection(self):
+        """
+        Returns the collection, connecting to the database on first use.
+        """
+        return get_database()[self.collection_name]
+
+
     def find_all(self) -> list:
         """
         Returns all users in the database.
@@ -24,6 +34,22 @@ class UserDatabase:
             return list(self.collection.find({}, {"_id": False}))
         except Exception as e:
             write_log("error", f"[UserDatabase] Failed to retrieve users: {e}")
+
+
+    def find_by_group(self, group: str) -> list:
+        """
+        Returns the users of a group.
+
+        Args:
+            group (str): The group, matched exactly even when empty or None.
+
+        Returns:
+            list: list of the users of the group.
+        """
+        try:
+            return list(self.collection.find({"group": group}, {"_id": False}))
+        except Exception as e:
+            write_log("error", f"[UserDatabase] Failed to retrieve users by group: {e}")
         
 
     def find_by_phone_number(self, phone_number: int) -> dict:
@@ -50,6 +76,7 @@ class UserDatabase:
             user (dict): The user data.
         """
         try:
+            user["updated_at"] = time.time()
             self.collection.insert_one(user)
         except Exception as e:
             write_log("error", f"[UserDatabase] Failed to insert user: {e}")
@@ -79,12 +106,13 @@ class UserDatabase:
 
     def update_user(self, user: dict) -> None:
         """
-        Update a user in the database.
+        Update a user in the database, stamping updated_at for the authorization index to pick up.
         
         Args:
             user (dict): The user data.
         """
         try:
+            user["updated_at"] = time.time()
             self.collection.update_one({"phone_number": user["phone_number"]}, {"$set": user})
         except Exception as e:
             write_log("error", f"[UserDatabase] Failed to update user: {e}")
@@ -92,12 +120,16 @@ class UserDatabase:
 
     def delete_user(self, phone_number: int):
         """
-        Delete a user from the database.
+        Delete a user from the database, recording the revoked plates for the authorization index.
         
         Args:
             phone_number (int): The phone number of the user.
         """
         try:
+            user = self.collection.find_one({"phone_number": phone_number}, {"vehicle": True})
+            if user:
+                record_deletion(self.collection_name, [vehicle.get("license_plate") for vehicle in user.get("vehicle") or []], user["_id"])
+
             self.collection.delete_one({"phone_number": phone_number})
         except Exception as e:
             write_log("error", f"[UserDatabase] Failed to delete user: {e}")
@@ -1,22 +1,39 @@
-from src.database.setup import database
+from src.database.deletions import record_deletion
+from src.database.setup import get_database
+from datetime import datetime, timezone
 from src.utils.log import write_log
 import time
 
 
+# Visitors are let in from 30 minutes before their visit until 30 minutes after it ends
+VISITOR_GRACE_PERIOD = 1800
+
+
 class VisitorRecord:
 
     def __init__(self) -> None:
         """
         Initialize the visitor record database.
         """
-        self.collection = database["visitor-record"]
+        self.collection_name = "visitor-record"
+
+
+    @property
+    def collection(self):
+        """
+        Returns the collection, connecting to the database on first use.
+        """
+        return get_database()[self.collection_name]
 
 
     def insert(self, data: dict) -> None:
         """
-        Insert a visitor record into the database.
+        Insert a visitor record into the database, to expire once its grace period after the visit has passed.
         """
         try:
+            if data.get("exit_time"):
+                data["expire_at"] = datetime.fromtimestamp(data["exit_time"] + VISITOR_GRACE_PERIOD, timezone.utc)
+
             self.collection.insert_one(data)
         except Exception as e:
             write_log("error", f"[VisitorRecord] Failed to insert visitor record: {e}")
@@ -24,37 +41,58 @@ class VisitorRecord:
 
     def find_all(self) -> list:
         """
-        Returns all visitor records in the database.
+        Returns all visitor records in the database whose visit has not ended.
 
         Returns:
             list: list of all visitor records in the database.
         """
         try:
-            current_time = time.time()
-            visitors = list(self.collection.find({}))
-            
-            valid_visitors = []
-            for visitor in visitors:
-                exit_time = visitor.get('exit_time')
-                if exit_time and current_time > exit_time:
-                    self.collection.delete_one({"_id": visitor["_id"]})
-                else:
-                    valid_visitors.append(visitor)
-            
-            return valid_visitors
-        
+            return list(self.collection.find({"exit_time": {"$not": {"$lte": time.time()}}}))
         except Exception as e:
             write_log("error", f"[VisitorRecord] Failed to retrieve visitor records: {e}")
 
 
+    def find_by_group(self, group: str) -> list:
+        """
+        Returns the visitor records of a group whose visit has not ended.
+
+        Args:
+            group (str): The group, matched exactly even when empty or None.
+
+        Returns:
+            list: list of the visitor records of the group.
+        """
+        try:
+            return list(self.collection.find({"group": group, "exit_time": {"$not": {"$lte": time.time()}}}))
+        except Exception as e:
+            write_log("error", f"[VisitorRecord] Failed to retrieve visitor records by group: {e}")
+
+
+    def find_by_phone_number(self, phone_number: str) -> list:
+        """
+        Returns the visitor records registered by a resident whose visit has not ended.
+
+        Args:
+            phone_number (str): The phone number of the resident.
+
+        Returns:
+            list: list of the visitor records of the resident.
+        """
+        try:
+            return list(self.collection.find({"phone_number": phone_number, "exit_time": {"$not": {"$lte": time.time()}}}))
+        except Exception as e:
+            write_log("error", f"[VisitorRecord] Failed to retrieve visitor records by phone number: {e}")
+
+
     def delete(self, license_plate: int) -> None:
         """
-        Delete a visitor record from the database.
+        Delete a visitor record from the database, recording the revoked plate for the authorization index.
 
         Args:
             license_plate (int): The license plate of the visitor.
         """
         try:
+            record_deletion(self.collection_name, [license_plate])
             self.collection.delete_many({"license_plate": license_plate})
         except Exception as e:
             write_log("error", f"[VisitorRecord] Failed to delete visitor record: {e}")
@@ -71,17 +109,47 @@ class VisitorRecord:
             dict: The visitor data.
         """
         try:
-            current_time = time.time()            
-            for visitor in self.collection.find({"license_plate": car_plate}, {}):
-                enter_time = visitor.get('enter_time')
-                exit_time = visitor.get('exit_time')
-
-                if enter_time and exit_time:
-                    if (enter_time - 1800) < current_time < (exit_time + 1800):
-                        return visitor
-                    elif exit_time < current_time:
-                        self.collection.delete_one({"_id": visitor["_id"]})
-            
-            return None
+            current_time = time.time()
+            return self.collection.find_one({
+                "license_plate": car_plate,
+                "enter_time": {"$lt": current_time + VISITOR_GRACE_PERIOD},
+                "exit_time": {"$gt": current_time - VISITOR_GRACE_PERIOD}
+            })
         except Exception as e:
             write_log("error", f"[VisitorRecord] Failed to retrieve visitor by license plate: {e}")
+
+
+    def sweep_expired(self, batch_size: int = 1000) -> int:
+        """
+        Delete the visitor records whose grace period has passed, and give older records an expire_at.
+
+        Records inserted before the TTL index existed have no expire_at, so they are deleted here in
+        batches and the remaining ones are backfilled for the TTL index to expire.
+
+        Args:
+            batch_size (int): The number of records deleted per delete_many.
+
+        Returns:
+            int: The number of deleted records.
+        """
+        try:
+            expired = {"exit_time": {"$lt": time.time() - VISITOR_GRACE_PERIOD}}
+            deleted = 0
+            while True:
+                ids = [visitor["_id"] for visitor in self.collection.find(expired, {"_id": True}).limit(batch_size)]
+                if not ids:
+                    break
+
+                deleted += self.collection.delete_many({"_id": {"$in": ids}}).deleted_count
+
+            backfilled = self.collection.update_many(
+                {"expire_at": {"$exists": False}, "exit_time": {"$type": "number"}},
+                [{"$set": {"expire_at": {"$toDate": {"$multiply": [{"$add": ["$exit_time", VISITOR_GRACE_PERIOD]}, 1000]}}}}]
+            ).modified_count
+
+            write_log("info", f"[VisitorRecord] Deleted {deleted} expired visitor records and backfilled expiry of {backfilled}")
+            return deleted
+
+        except Exception as e:
+            write_log("error", f"[VisitorRecord] Failed to sweep expired visitor records: {e}")
+            return 0
@@ -1,71 +1,90 @@
 from controller.vehicle_processor import VehicleDetectionProcessor
-from utils.config import VIDEO_SOURCE, MODEL_PATH
+from controller.pipeline import DetectionPipeline, draw_results
+from utils.config import VIDEO_SOURCE, MODEL_PATH, LANE_ROI, OCR_WORKERS, DATABASE_ENSURE_INDEXES
 from model.predict import PredictDetectionModel
 from controller.extract import TextExtraction
+from controller.ocr_pool import OCRProcessPool
+from src.database.history import stop_history_writer
+from src.database.indexes import ensure_indexes
+from src.database.visitor import VisitorRecord
+from utils.startup import StartupTracker
 from utils.log import write_log
 import time
 import cv2
 
 
-model = PredictDetectionModel(MODEL_PATH)
-detection = VehicleDetectionProcessor()
-extraction = TextExtraction()
+def initialize(startup: StartupTracker) -> tuple:
+    """
+    Load and warm up the detector, the OCR reader and the database connection.
+
+    Args:
+        startup (StartupTracker): The tracker timing each startup phase.
+
+    Returns:
+        tuple: The detection model, the text extractor and the vehicle processor.
+    """
+    with startup.phase("Detector load"):
+        model = PredictDetectionModel(MODEL_PATH)
+
+    with startup.phase("OCR load"):
+        extraction = OCRProcessPool() if OCR_WORKERS > 0 else TextExtraction()
+
+    with startup.phase("Database connect"):
+        if DATABASE_ENSURE_INDEXES:
+            ensure_indexes()
+            VisitorRecord().sweep_expired()
+        detection = VehicleDetectionProcessor()
+
+    with startup.phase("Detector warm-up"):
+        model.warmup()
+
+    with startup.phase("OCR warm-up"):
+        extraction.warmup()
+
+    return model, extraction, detection
 
 
 def real_time_detection() -> None:
     """
     Run real-time car plate recognition.
     """
-    cap = cv2.VideoCapture(VIDEO_SOURCE)
-
-    if not cap.isOpened():
-        write_log("error", "Failed to open video capture")
-        return
-
-    while True:
-        start_time = time.time()
-        ret, frame = cap.read()
-        if not ret:
-            write_log("error", "Failed to read frame")
-            break
-
-        try:
-            labels = model.predict(frame)
-
-            for label in labels:
-                car_plate = extraction.get_car_plate(frame, label)
-                role = detection.verify_vehicle(car_plate)
-                if role:
-                    color = (0, 255, 0)
-                else:
-                    color = (0, 0, 255)
-
-                # Drawing bounding box and label on the frame
-                x1, y1 = label["x1"], label["y1"]
-                x2, y2 = label["x2"], label["y2"]
-
-                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-                cv2.putText(frame, f"{car_plate} ({role})", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
-
-            # Calculate and display FPS
-            end_time = time.time()
-            fps = 1 / (end_time - start_time)
-            cv2.putText(frame, f"FPS: {fps:.2f}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+    startup = StartupTracker()
+    model, extraction, detection = initialize(startup)
+
+    pipeline = DetectionPipeline(VIDEO_SOURCE, model, extraction, detection, roi=LANE_ROI)
+    pipeline.start()
+    startup.mark_ready()
+
+    last_time = time.time()
+    try:
+        while pipeline.is_running():
+            packet = pipeline.get_result()
+            if packet is None:
+                continue
+
+            # Calculate FPS from the rate of fully processed frames
+            current_time = time.time()
+            fps = 1 / max(current_time - last_time, 1e-6)
+            last_time = current_time
 
             # Show the frame
-            cv2.imshow("Detection", frame)
+            cv2.imshow("Detection", draw_results(packet, fps))
 
             # Break loop on 'q' key press
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
 
-        except Exception as e:
-            write_log("error", f"Failed to run car plate recognition: {e}")
-            break
+    except Exception as e:
+        write_log("error", f"Failed to run car plate recognition: {e}")
 
-    cap.release()
-    cv2.destroyAllWindows()
+    finally:
+        startup.clear_ready()
+        pipeline.stop()
+        stop_history_writer()
+        if OCR_WORKERS > 0:
+            extraction.stop()
+        cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
-    real_time_detection()
\ No newline at end of file
+    real_time_detection()
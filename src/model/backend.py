@@ -0,0 +1,358 @@
+from src.utils.config import INFERENCE_IMGSZ, INFERENCE_THREADS, MODEL_PRECISION
+from src.utils.log import write_log
+from abc import ABC, abstractmethod
+import numpy as np
+import os
+import cv2
+
+
+DETECTION_CONFIDENCE = 0.25
+
+
+def letterbox(frame: np.ndarray, size: int) -> tuple:
+    """
+    Resize the frame to fit a square input while keeping its aspect ratio, padding the rest.
+
+    Args:
+        frame (np.ndarray): The BGR frame.
+        size (int): The side of the square model input.
+
+    Returns:
+        tuple: The padded image, the resize ratio and the (x, y) padding.
+    """
+    height, width = frame.shape[:2]
+    ratio = min(size / height, size / width)
+    new_width, new_height = round(width * ratio), round(height * ratio)
+    resized = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+
+    pad_x, pad_y = (size - new_width) / 2, (size - new_height) / 2
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    padded = cv2.copyMakeBorder(resized, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+    return padded, ratio, (left, top)
+
+
+def empty_detections() -> tuple:
+    """
+    Return empty box, score and class arrays.
+
+    Returns:
+        tuple: The empty (0, 4) boxes, scores and classes.
+    """
+    return np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+
+
+def export_model(model_path: str, export_format: str) -> str:
+    """
+    Export the YOLOv10 weights, reusing a previous export that is newer than the weights.
+
+    Args:
+        model_path (str): The path to the PyTorch weights.
+        export_format (str): The ultralytics export format, "onnx" or "openvino".
+
+    Returns:
+        str: The path to the exported model.
+    """
+    base_path = os.path.splitext(model_path)[0]
+    exported_path = f"{base_path}.onnx" if export_format == "onnx" else f"{base_path}_openvino_model"
+
+    if os.path.exists(exported_path) and os.path.getmtime(exported_path) >= os.path.getmtime(model_path):
+        return exported_path
+
+    from ultralytics import YOLO
+
+    write_log("info", f"[InferenceBackend] Exporting {model_path} to {export_format}")
+    return YOLO(model_path).export(format=export_format, imgsz=INFERENCE_IMGSZ, dynamic=True, simplify=True)
+
+
+class InferenceBackend(ABC):
+
+    name = None
+
+    @abstractmethod
+    def predict(self, frame: np.ndarray) -> tuple:
+        """
+        Run the detector on a single frame.
+
+        Args:
+            frame (np.ndarray): The BGR frame.
+
+        Returns:
+            tuple: The (n, 4) boxes in frame pixels, the (n,) scores and the (n,) classes.
+        """
+
+
+    def predict_batch(self, frames: list) -> list:
+        """
+        Run the detector on several frames.
+
+        Args:
+            frames (list): The BGR frames.
+
+        Returns:
+            list: The (boxes, scores, classes) of every frame, in frame order.
+        """
+        return [self.predict(frame) for frame in frames]
+
+
+class TorchBackend(InferenceBackend):
+
+    name = "torch"
+
+    def __init__(self, model_path: str, save: bool = False, precision: str = "fp32") -> None:
+        """
+        Initialize the ultralytics YOLO model on the GPU when available.
+
+        Args:
+            model_path (str): The path to the PyTorch weights.
+            save (bool): Save the annotated predictions, labels and confidences.
+            precision (str): "fp16" runs half precision on the GPU; other precisions need an exported backend.
+        """
+        from ultralytics import YOLO
+        import torch
+
+        if precision not in ("fp32", "fp16"):
+            raise ValueError(f"Model precision {precision} requires the onnx backend.")
+
+        self.best_model = YOLO(model_path)
+        self.save = save
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.half = precision == "fp16" and self.device.type == "cuda"
+
+
+    def predict(self, frame: np.ndarray) -> tuple:
+        """
+        Run the detector on a single frame.
+
+        Args:
+            frame (np.ndarray): The BGR frame.
+
+        Returns:
+            tuple: The (n, 4) boxes in frame pixels, the (n,) scores and the (n,) classes.
+        """
+        return self.predict_batch([frame])[0]
+
+
+    def predict_batch(self, frames: list) -> list:
+        """
+        Run the detector on several frames in a single ultralytics call.
+
+        Args:
+            frames (list): The BGR frames.
+
+        Returns:
+            list: The (boxes, scores, classes) of every frame, in frame order.
+        """
+        results = self.best_model.predict(
+                                source=frames,
+                                conf=DETECTION_CONFIDENCE,
+                                iou=0.7,
+                                device=self.device,
+                                save=self.save,
+                                save_txt=self.save,
+                                save_conf=self.save,
+                                half=self.half,
+                                verbose=False
+                                )
+
+        outputs = []
+        for result in results:
+            if not len(result.boxes):
+                outputs.append(empty_detections())
+                continue
+
+            outputs.append((
+                result.boxes.xyxy.cpu().numpy(),
+                result.boxes.conf.cpu().numpy(),
+                result.boxes.cls.cpu().numpy()
+            ))
+
+        return outputs
+
+
+class ExportedBackend(InferenceBackend):
+
+    def __init__(self) -> None:
+        """
+        Initialize the shared pre- and post-processing of exported NMS-free YOLOv10 models.
+        """
+        self.imgsz = INFERENCE_IMGSZ
+
+
+    @abstractmethod
+    def run(self, blob: np.ndarray) -> np.ndarray:
+        """
+        Run the exported model on a preprocessed NCHW blob.
+
+        Args:
+            blob (np.ndarray): The input blob.
+
+        Returns:
+            np.ndarray: The raw (batch, detections, 6) output.
+        """
+
+
+    def predict(self, frame: np.ndarray) -> tuple:
+        """
+        Run the detector on a single frame.
+
+        Args:
+            frame (np.ndarray): The BGR frame, or the path to an image.
+
+        Returns:
+            tuple: The (n, 4) boxes in frame pixels, the (n,) scores and the (n,) classes.
+        """
+        return self.predict_batch([frame])[0]
+
+
+    def predict_batch(self, frames: list) -> list:
+        """
+        Run the detector on several frames as one NCHW batch.
+
+        Args:
+            frames (list): The BGR frames, or paths to images.
+
+        Returns:
+            list: The (boxes, scores, classes) of every frame, in frame order.
+        """
+        frames = [cv2.imread(frame) if isinstance(frame, str) else frame for frame in frames]
+        letterboxed = [letterbox(frame, self.imgsz) for frame in frames]
+        blob = cv2.dnn.blobFromImages([padded for padded, _, _ in letterboxed], scalefactor=1 / 255, swapRB=True)
+        output = self.run(blob)
+
+        return [
+            self.postprocess(output[index], ratio, padding, frame.shape)
+            for index, (frame, (_, ratio, padding)) in enumerate(zip(frames, letterboxed))
+        ]
+
+
+    def postprocess(self, output: np.ndarray, ratio: float, padding: tuple, shape: tuple) -> tuple:
+        """
+        Convert the raw YOLOv10 output of one image back to frame pixels.
+
+        Args:
+            output (np.ndarray): The (detections, 6) output of x1, y1, x2, y2, score, class.
+            ratio (float): The letterbox resize ratio.
+            padding (tuple): The letterbox (x, y) padding.
+            shape (tuple): The shape of the original frame.
+
+        Returns:
+            tuple: The (n, 4) boxes in frame pixels, the (n,) scores and the (n,) classes.
+        """
+        if output.ndim != 2 or output.shape[1] != 6:
+            raise ValueError(f"Unsupported model output shape ({output.shape}), expected an NMS-free YOLOv10 export.")
+
+        output = output[output[:, 4] >= DETECTION_CONFIDENCE]
+        boxes = output[:, :4].copy()
+        boxes[:, [0, 2]] = (boxes[:, [0, 2]] - padding[0]) / ratio
+        boxes[:, [1, 3]] = (boxes[:, [1, 3]] - padding[1]) / ratio
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, shape[1])
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, shape[0])
+        return boxes.astype(np.float32), output[:, 4].astype(np.float32), output[:, 5].astype(np.float32)
+
+
+class OnnxBackend(ExportedBackend):
+
+    name = "onnx"
+
+    def __init__(self, model_path: str, precision: str = "fp32") -> None:
+        """
+        Initialize an ONNX Runtime CPU session with a tuned thread count.
+
+        Args:
+            model_path (str): The path to the PyTorch weights or an exported .onnx file.
+            precision (str): The model precision, "fp32", "fp16", "int8-dynamic" or "int8-static".
+        """
+        super().__init__()
+        from src.model.quantize import quantize_model
+        import onnxruntime as ort
+
+        if not model_path.endswith(".onnx"):
+            model_path = export_model(model_path, "onnx")
+        model_path = quantize_model(model_path, precision)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if INFERENCE_THREADS:
+            options.intra_op_num_threads = INFERENCE_THREADS
+            options.inter_op_num_threads = 1
+
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+
+    def run(self, blob: np.ndarray) -> np.ndarray:
+        """
+        Run the ONNX model on a preprocessed NCHW blob.
+
+        Args:
+            blob (np.ndarray): The input blob.
+
+        Returns:
+            np.ndarray: The raw (batch, detections, 6) output.
+        """
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+class OpenVinoBackend(ExportedBackend):
+
+    name = "openvino"
+
+    def __init__(self, model_path: str, precision: str = "fp32") -> None:
+        """
+        Initialize an OpenVINO CPU model with a tuned thread count.
+
+        Args:
+            model_path (str): The path to the PyTorch weights or an exported OpenVINO model folder.
+            precision (str): "fp32" or "fp16"; INT8 models need the onnx backend.
+        """
+        super().__init__()
+        import openvino as ov
+
+        if precision not in ("fp32", "fp16"):
+            raise ValueError(f"Model precision {precision} requires the onnx backend.")
+
+        if not model_path.endswith("_openvino_model"):
+            model_path = export_model(model_path, "openvino")
+
+        xml_path = next(os.path.join(model_path, name) for name in os.listdir(model_path) if name.endswith(".xml"))
+        config = {"INFERENCE_NUM_THREADS": INFERENCE_THREADS} if INFERENCE_THREADS else {}
+        config["INFERENCE_PRECISION_HINT"] = "f16" if precision == "fp16" else "f32"
+        self.model = ov.Core().compile_model(xml_path, "CPU", config)
+
+
+    def run(self, blob: np.ndarray) -> np.ndarray:
+        """
+        Run the OpenVINO model on a preprocessed NCHW blob.
+
+        Args:
+            blob (np.ndarray): The input blob.
+
+        Returns:
+            np.ndarray: The raw (batch, detections, 6) output.
+        """
+        return self.model(blob)[0]
+
+
+def create_backend(name: str, model_path: str, save: bool = False, precision: str = MODEL_PRECISION) -> InferenceBackend:
+    """
+    Create the inference backend by name.
+
+    Args:
+        name (str): The backend name, "torch", "onnx" or "openvino".
+        model_path (str): The path to the model weights.
+        save (bool): Save the predictions, only supported by the torch backend.
+        precision (str): The model precision, "fp32", "fp16", "int8-dynamic" or "int8-static".
+
+    Returns:
+        InferenceBackend: The inference backend.
+    """
+    if name == "torch":
+        return TorchBackend(model_path, save, precision)
+    if name == "onnx":
+        return OnnxBackend(model_path, precision)
+    if name == "openvino":
+        return OpenVinoBackend(model_path, precision)
+
+    raise ValueError(f"Invalid inference backend ({name}).")
@@ -0,0 +1,130 @@
+from src.utils.config import BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS
+from concurrent.futures import Future
+from src.utils.metrics import Metrics
+from src.utils.log import write_log
+import numpy as np
+import threading
+import queue
+import time
+
+
+class BatchingPredictor:
+
+    def __init__(self, model, max_batch: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS) -> None:
+        """
+        Initialize the predictor that groups frames from several callers into one detector call.
+
+        Args:
+            model (PredictDetectionModel): The car plate detection model.
+            max_batch (int): The maximum number of frames per detector call.
+            max_wait_ms (float): The longest time the first frame of a batch waits for more frames.
+        """
+        self.model = model
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = Metrics("batching")
+        self.requests = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="batching-predictor", daemon=True)
+        self.thread.start()
+
+
+    def submit(self, frame: np.ndarray) -> Future:
+        """
+        Queue a frame for detection.
+
+        Args:
+            frame (np.ndarray): The frame to run detection on.
+
+        Returns:
+            Future: The future that resolves to the frame's detections.
+        """
+        future = Future()
+        self.requests.put((time.perf_counter(), frame, future))
+        return future
+
+
+    def predict(self, frame: np.ndarray) -> list:
+        """
+        Run detection on a frame as part of the next batch, with the same interface as
+        PredictDetectionModel.predict.
+
+        Args:
+            frame (np.ndarray): The frame to run detection on.
+
+        Returns:
+            list: The detections of the frame.
+        """
+        try:
+            return self.submit(frame).result()
+        except Exception as e:
+            write_log("error", f"[BatchingPredictor] Failed to predict: {e}")
+            return []
+
+
+    def collect(self) -> list:
+        """
+        Wait for a first request, then collect more until the batch is full or the wait expires.
+
+        Returns:
+            list: The collected (submit time, frame, future) requests.
+        """
+        try:
+            batch = [self.requests.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = batch[0][0] + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+
+    def run(self) -> None:
+        """
+        Run batches until stopped, resolving each request's future with its own detections.
+        """
+        while not self.stop_event.is_set():
+            batch = self.collect()
+            if not batch:
+                continue
+
+            start_time = time.perf_counter()
+            try:
+                results = self.model.predict_batch([frame for _, frame, _ in batch])
+            except Exception as e:
+                write_log("error", f"[BatchingPredictor] Failed to run batch: {e}")
+                results = [[] for _ in batch]
+
+            end_time = time.perf_counter()
+            for (submit_time, _, future), labels in zip(batch, results):
+                future.set_result(labels)
+                self.metrics.observe("queue_wait", start_time - submit_time)
+
+            self.metrics.increment("batches")
+            self.metrics.increment("frames", len(batch))
+            self.metrics.observe("inference", end_time - start_time)
+            self.metrics.set_gauge("last_batch_size", len(batch))
+            self.metrics.set_gauge("mean_batch_size", self.metrics.counters["frames"] / self.metrics.counters["batches"])
+
+
+    def stop(self) -> None:
+        """
+        Stop the batching thread and fail any request still waiting.
+        """
+        self.stop_event.set()
+        self.thread.join(timeout=5)
+
+        while True:
+            try:
+                _, _, future = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            future.set_result([])
+
+        self.metrics.log_summary()
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+class Detection:
+
+    __slots__ = ("x1", "y1", "x2", "y2", "confidence", "class_id", "track_id")
+
+    def __init__(self, x1: int, y1: int, x2: int, y2: int, confidence: float, class_id: int = 0, track_id: int = None) -> None:
+        """
+        Initialize a detected car plate bounding box.
+
+        Args:
+            x1 (int): The left edge in pixels.
+            y1 (int): The top edge in pixels.
+            x2 (int): The right edge in pixels.
+            y2 (int): The bottom edge in pixels.
+            confidence (float): The detection confidence.
+            class_id (int): The predicted class.
+            track_id (int): The ID of the track the plate belongs to, once tracked.
+        """
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.confidence = confidence
+        self.class_id = class_id
+        self.track_id = track_id
+
+
+    def __repr__(self) -> str:
+        return (
+            f"Detection(x1={self.x1}, y1={self.y1}, x2={self.x2}, y2={self.y2}, "
+            f"confidence={self.confidence:.2f}, class_id={self.class_id}, track_id={self.track_id})"
+        )
+
+
+    @property
+    def centroid(self) -> tuple:
+        """
+        The (x, y) centroid of the bounding box.
+        """
+        return (self.x1 + self.x2) / 2, (self.y1 + self.y2) / 2
+
+
+    @property
+    def width(self) -> int:
+        """
+        The width of the bounding box in pixels.
+        """
+        return self.x2 - self.x1
+
+
+    @property
+    def height(self) -> int:
+        """
+        The height of the bounding box in pixels.
+        """
+        return self.y2 - self.y1
+
+
+    def to_dict(self) -> dict:
+        """
+        Convert the detection to the label dict format.
+
+        Returns:
+            dict: The detection as a dict.
+        """
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+    @classmethod
+    def from_arrays(cls, boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray) -> list:
+        """
+        Create detections from box, score and class arrays in a single conversion.
+
+        Args:
+            boxes (np.ndarray): The boxes as an (n, 4) array of x1, y1, x2, y2.
+            scores (np.ndarray): The (n,) confidence scores.
+            classes (np.ndarray): The (n,) class IDs.
+
+        Returns:
+            list: The detections.
+        """
+        return [
+            cls(x1, y1, x2, y2, confidence, class_id)
+            for (x1, y1, x2, y2), confidence, class_id in zip(
+                boxes.astype(np.int64).tolist(),
+                scores.astype(np.float64).tolist(),
+                classes.astype(np.int64).tolist()
+            )
+        ]
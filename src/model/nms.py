@@ -0,0 +1,150 @@
+import numpy as np
+
+
+# Up to this many boxes a pairwise loop in Python is faster than building the IoU matrix
+# (benchmarks/nms.py: the two cross over between 8 and 10 boxes)
+PAIRWISE_MAX_BOXES = 8
+
+
+def box_iou_matrix(boxes: np.ndarray) -> np.ndarray:
+    """
+    Compute the pairwise intersection over union of a set of boxes.
+
+    Args:
+        boxes (np.ndarray): The boxes as an (n, 4) array of x1, y1, x2, y2.
+
+    Returns:
+        np.ndarray: The (n, n) IoU matrix.
+    """
+    x1, y1, x2, y2 = boxes.astype(np.float32, copy=False).T
+    areas = (x2 - x1) * (y2 - y1)
+
+    widths = np.minimum.outer(x2, x2) - np.maximum.outer(x1, x1)
+    heights = np.minimum.outer(y2, y2) - np.maximum.outer(y1, y1)
+    np.clip(widths, 0, None, out=widths)
+    np.clip(heights, 0, None, out=heights)
+    intersection = widths * heights
+
+    union = areas[:, None] + areas[None, :] - intersection
+    return intersection / np.maximum(union, 1e-9)
+
+
+def box_iou(box_1: list, box_2: list) -> float:
+    """
+    Compute the intersection over union of two boxes.
+
+    Args:
+        box_1 (list): The first box as x1, y1, x2, y2.
+        box_2 (list): The second box as x1, y1, x2, y2.
+
+    Returns:
+        float: The intersection over union, between 0 and 1.
+    """
+    width = min(box_1[2], box_2[2]) - max(box_1[0], box_2[0])
+    height = min(box_1[3], box_2[3]) - max(box_1[1], box_2[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+
+    intersection = width * height
+    area_1 = (box_1[2] - box_1[0]) * (box_1[3] - box_1[1])
+    area_2 = (box_2[2] - box_2[0]) * (box_2[3] - box_2[1])
+    return intersection / max(area_1 + area_2 - intersection, 1e-9)
+
+
+def pairwise_suppression(boxes: np.ndarray, order: np.ndarray, classes: np.ndarray, iou_threshold: float, top_k: int) -> list:
+    """
+    Greedy suppression comparing every box with the boxes kept so far, one pair at a time.
+
+    Args:
+        boxes (np.ndarray): The (n, 4) boxes.
+        order (np.ndarray): The box indices in descending score order.
+        classes (np.ndarray): The (n,) class IDs, or None to suppress across classes.
+        iou_threshold (float): The IoU above which the lower scoring box is suppressed.
+        top_k (int): The maximum number of boxes to keep, or 0 to keep all.
+
+    Returns:
+        list: The indices of the kept boxes, in descending score order.
+    """
+    box_list = boxes.tolist()
+    class_list = classes.tolist() if classes is not None else None
+    keep = []
+
+    for index in order.tolist():
+        if any(
+            (class_list is None or class_list[index] == class_list[kept]) and box_iou(box_list[index], box_list[kept]) > iou_threshold
+            for kept in keep
+        ):
+            continue
+
+        keep.append(index)
+        if top_k and len(keep) >= top_k:
+            break
+
+    return keep
+
+
+def matrix_suppression(boxes: np.ndarray, order: np.ndarray, classes: np.ndarray, iou_threshold: float, top_k: int) -> list:
+    """
+    Greedy suppression over the IoU matrix of all boxes, one row of comparisons per kept box.
+
+    Args:
+        boxes (np.ndarray): The (n, 4) boxes.
+        order (np.ndarray): The box indices in descending score order.
+        classes (np.ndarray): The (n,) class IDs, or None to suppress across classes.
+        iou_threshold (float): The IoU above which the lower scoring box is suppressed.
+        top_k (int): The maximum number of boxes to keep, or 0 to keep all.
+
+    Returns:
+        list: The indices of the kept boxes, in descending score order.
+    """
+    if classes is not None:
+        # Shift every class into its own coordinate range so boxes of different classes cannot overlap
+        offsets = np.asarray(classes, dtype=np.float32) * (boxes.max() + 1)
+        boxes = boxes + offsets[:, None]
+
+    overlaps = box_iou_matrix(boxes[order]) > iou_threshold
+    suppressed = np.zeros(len(order), dtype=bool)
+    keep = []
+
+    for index in range(len(order)):
+        if suppressed[index]:
+            continue
+
+        keep.append(order[index])
+        if top_k and len(keep) >= top_k:
+            break
+
+        suppressed |= overlaps[index]
+
+    return keep
+
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray = None,
+                        iou_threshold: float = 0.3, class_aware: bool = False, top_k: int = 0) -> np.ndarray:
+    """
+    Greedy Non-Maximum Suppression over arrays of boxes.
+
+    A box is suppressed when its IoU with a higher scoring kept box is above the threshold.
+    In class-aware mode, boxes of different classes never suppress each other. Up to
+    PAIRWISE_MAX_BOXES boxes are compared pair by pair, larger sets through the IoU matrix.
+
+    Args:
+        boxes (np.ndarray): The boxes as an (n, 4) array of x1, y1, x2, y2.
+        scores (np.ndarray): The (n,) confidence scores.
+        classes (np.ndarray): The (n,) class IDs, only used in class-aware mode.
+        iou_threshold (float): The IoU above which the lower scoring box is suppressed.
+        class_aware (bool): Only suppress boxes of the same class.
+        top_k (int): The maximum number of boxes to keep, or 0 to keep all.
+
+    Returns:
+        np.ndarray: The indices of the kept boxes, in descending score order.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    boxes = np.asarray(boxes, dtype=np.float32)
+    order = np.argsort(-np.asarray(scores), kind="stable")
+    classes = classes if class_aware and classes is not None else None
+
+    suppression = pairwise_suppression if len(order) <= PAIRWISE_MAX_BOXES else matrix_suppression
+    return np.asarray(suppression(boxes, order, classes, iou_threshold, top_k), dtype=np.int64)
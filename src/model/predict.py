@@ -1,108 +1,87 @@
+from src.utils.config import NMS_IOU_THRESHOLD, NMS_CLASS_AWARE, NMS_TOP_K, INFERENCE_BACKEND, MODEL_PRECISION, WARMUP_RUNS, BATCH_MAX_SIZE
+from src.model.nms import non_max_suppression
+from src.model.backend import create_backend
+from src.model.detection import Detection
 from src.utils.log import write_log
-from ultralytics import YOLO
-import torch
+import numpy as np
+import threading
+import time
 
 
 class PredictDetectionModel:
 
-    def __init__(self, model, save=False) -> None:
+    def __init__(self, model, save=False, backend=INFERENCE_BACKEND, precision=MODEL_PRECISION) -> None:
         """
         Initialize the YOLO model for prediction.
-        """
-        self.best_model = YOLO(model)
-        self.save = save
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
-
-    def check_overlap(self, coordinate_1: dict, coordinate_2: dict) -> bool:
-        """
-        Check if two bouding boxes overlap.
 
         Args:
-            coordinate_1 (dict): The first bounding box.
-            coordinate_2 (dict): The second bounding box.
-
-        Returns:
-            bool: True if the bounding boxes overlap, False otherwise.
+            model (str): The path to the model weights.
+            save (bool): Save the predictions, only supported by the torch backend.
+            backend (str): The inference backend, "torch", "onnx" or "openvino".
+            precision (str): The model precision, "fp32", "fp16", "int8-dynamic" or "int8-static".
         """
-        try:
-            x_left = max(coordinate_1["x1"], coordinate_2["x1"])
-            y_top = max(coordinate_1["y1"], coordinate_2["y1"])
-            x_right = min(coordinate_1["x2"], coordinate_2["x2"])
-            y_bottom = min(coordinate_1["y2"], coordinate_2["y2"])
-
-            if x_right < x_left or y_bottom < y_top:
-                return False
-
-            intersection_area = (x_right - x_left) * (y_bottom - y_top)
-            coordinate_1_area = (coordinate_1["x2"] - coordinate_1["x1"]) * (coordinate_1["y2"] - coordinate_1["y1"])
-            coordinate_2_area = (coordinate_2["x2"] - coordinate_2["x1"]) * (coordinate_2["y2"] - coordinate_2["y1"])
-            union_area = coordinate_1_area + coordinate_2_area - intersection_area
-
-            iou = intersection_area / union_area
-            return iou > 0.3
-        
-        except Exception as e:
-            write_log("error", f"[PredictDetectionModel] Failed to check overlap: {e}")
+        self.backend = create_backend(backend, model, save, precision)
+        self.save = save
+        self.lock = threading.Lock()
+        self.nms_iou = NMS_IOU_THRESHOLD
+        self.nms_class_aware = NMS_CLASS_AWARE
+        self.nms_top_k = NMS_TOP_K
 
 
-    def filter_nms(self, label: list) -> list:
+    def filter_nms(self, boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray) -> np.ndarray:
         """
         Filter double detection using Non-Maximum Suppression (NMS).
         
         Args:
-            label (list): The list of labels to filter.
+            boxes (np.ndarray): The boxes as an (n, 4) array of x1, y1, x2, y2.
+            scores (np.ndarray): The (n,) confidence scores.
+            classes (np.ndarray): The (n,) class IDs.
             
         Returns:
-            list: The list of labels after filtering.
+            np.ndarray: The indices of the kept boxes, in their original order.
         """
         try:
-            for coord_1 in label:
-                for coord_2 in label:
-                    if coord_1 != coord_2:
-                        if self.check_overlap(coord_1, coord_2):
-                            if coord_1["confidence"] > coord_2["confidence"]:
-                                label.remove(coord_2)
-                            else:
-                                label.remove(coord_1)
-
-            return label
+            if len(boxes) < 2:
+                return np.arange(len(boxes))
+
+            keep = non_max_suppression(
+                boxes,
+                scores,
+                classes,
+                iou_threshold=self.nms_iou,
+                class_aware=self.nms_class_aware,
+                top_k=self.nms_top_k
+            )
+            return np.sort(keep)
         
         except Exception as e:
             write_log("error", f"[PredictDetectionModel] Failed to filter NMS: {e}")
+            return np.arange(len(boxes))
 
 
-    def get_label(self, results: list) -> dict:
+    def get_label(self, boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray) -> list:
         """
-        Extract the label from the results.
+        Extract the labels from the backend output.
+
+        The boxes are filtered with NMS as arrays and only then turned into detection records.
         
         Args:
-            results (list): The results from the prediction.
+            boxes (np.ndarray): The (n, 4) boxes in frame pixels.
+            scores (np.ndarray): The (n,) confidence scores.
+            classes (np.ndarray): The (n,) class IDs.
         
         Returns:
-            dict: The label extracted from the results.
+            list: The detections extracted from the output.
         """
         try:
-            detection = []
-
-            for result in results:
-                for box in result.boxes:
-                    label = {}
-                    label["x1"] = int(box.xyxy[0][0].item())
-                    label["y1"] = int(box.xyxy[0][1].item())
-                    label["x2"] = int(box.xyxy[0][2].item())
-                    label["y2"] = int(box.xyxy[0][3].item())
-                    label["confidence"] = box.conf.item()
-                    label["class_id"] = box.id
-                    detection.append(label)
-
-            return detection
+            keep = self.filter_nms(boxes, scores, classes)
+            return Detection.from_arrays(boxes[keep], scores[keep], classes[keep])
         
         except Exception as e:
             write_log("error", f"[PredictDetectionModel] Failed to extract label: {e}")    
 
 
-    def predict(self, src: str) -> dict:
+    def predict(self, src: str) -> list:
         """
         Run object detection on the image.
         
@@ -110,22 +89,62 @@ class PredictDetectionModel:
             src (str): The source to the image.
             
         Returns:
-            dict: The label extracted from the image.
+            list: The detections extracted from the image.
         """
         try:
-            results = self.best_model.predict(
-                                    source=src, 
-                                    conf=0.25, 
-                                    iou=0.7,
-                                    device=self.device,
-                                    save=self.save,
-                                    save_txt=self.save,
-                                    save_conf=self.save
-                                    )
+            # The model is shared between camera pipelines, so only one thread may run it at a time
+            with self.lock:
+                boxes, scores, classes = self.backend.predict(src)
             
-            label = self.get_label(results)
-            filtered_label = self.filter_nms(label)
-            return filtered_label
+            return self.get_label(boxes, scores, classes)
         
         except Exception as e:
             write_log("error", f"[PredictDetectionModel] Failed to predict: {e}")
+
+
+    def predict_batch(self, frames: list) -> list:
+        """
+        Run object detection on several images in one backend call.
+
+        Args:
+            frames (list): The images.
+
+        Returns:
+            list: The detections of every image, in image order.
+        """
+        try:
+            with self.lock:
+                outputs = self.backend.predict_batch(frames)
+
+            return [self.get_label(boxes, scores, classes) for boxes, scores, classes in outputs]
+
+        except Exception as e:
+            write_log("error", f"[PredictDetectionModel] Failed to predict batch: {e}")
+            return [[] for _ in frames]
+
+
+    def warmup(self, shape: tuple = (720, 1280, 3), runs: int = WARMUP_RUNS) -> float:
+        """
+        Run the detector on dummy frames so the first vehicle does not pay the first-inference cost.
+
+        A full batch is also run when batching is enabled, since batched calls use a different input shape.
+
+        Args:
+            shape (tuple): The shape of the dummy frames, ideally the camera resolution.
+            runs (int): The number of warm-up passes.
+
+        Returns:
+            float: The duration of the last single-frame pass in seconds.
+        """
+        frame = np.full(shape, 114, dtype=np.uint8)
+
+        duration = 0.0
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            self.predict(frame)
+            duration = time.perf_counter() - start_time
+
+        if BATCH_MAX_SIZE > 1:
+            self.predict_batch([frame] * BATCH_MAX_SIZE)
+
+        return duration
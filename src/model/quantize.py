@@ -0,0 +1,103 @@
+from src.utils.config import CALIBRATION_DIR, CALIBRATION_SAMPLES, INFERENCE_IMGSZ
+from src.model.backend import letterbox
+from src.utils.log import write_log
+import os
+import cv2
+
+
+PRECISIONS = ("fp32", "fp16", "int8-dynamic", "int8-static")
+
+
+def load_calibration_blobs(folder: str, limit: int) -> list:
+    """
+    Load and preprocess the stored plate images used to calibrate static INT8 quantization.
+
+    Args:
+        folder (str): The folder with calibration images.
+        limit (int): The maximum number of images to use.
+
+    Returns:
+        list: The preprocessed NCHW blobs.
+    """
+    if not folder or not os.path.isdir(folder):
+        raise ValueError(f"Calibration folder not found ({folder}).")
+
+    names = sorted(name for name in os.listdir(folder) if name.lower().endswith((".jpg", ".jpeg", ".png", ".bmp")))
+    blobs = []
+    for name in names[:limit]:
+        frame = cv2.imread(os.path.join(folder, name))
+        if frame is None:
+            continue
+        padded, _, _ = letterbox(frame, INFERENCE_IMGSZ)
+        blobs.append(cv2.dnn.blobFromImage(padded, scalefactor=1 / 255, swapRB=True))
+
+    if not blobs:
+        raise ValueError(f"No calibration images found in {folder}.")
+
+    return blobs
+
+
+def quantize_model(onnx_path: str, precision: str) -> str:
+    """
+    Convert an exported ONNX detector to a lower precision, reusing a previous conversion.
+
+    "fp16" halves the weights and activations while keeping float32 inputs and outputs,
+    "int8-dynamic" quantizes the weights only, and "int8-static" also quantizes activations
+    using ranges calibrated on the images in CALIBRATION_DIR.
+
+    Args:
+        onnx_path (str): The path to the float32 ONNX model.
+        precision (str): The target precision.
+
+    Returns:
+        str: The path to the converted ONNX model.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Invalid model precision ({precision}).")
+
+    if precision == "fp32":
+        return onnx_path
+
+    output_path = f"{os.path.splitext(onnx_path)[0]}.{precision}.onnx"
+    if os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(onnx_path):
+        return output_path
+
+    write_log("info", f"[Quantize] Converting {onnx_path} to {precision}")
+
+    if precision == "fp16":
+        from onnxconverter_common import float16
+        import onnx
+
+        model = float16.convert_float_to_float16(onnx.load(onnx_path), keep_io_types=True)
+        onnx.save(model, output_path)
+        return output_path
+
+    from onnxruntime.quantization import quantize_dynamic, quantize_static, QuantType, QuantFormat, CalibrationDataReader
+
+    if precision == "int8-dynamic":
+        quantize_dynamic(onnx_path, output_path, weight_type=QuantType.QUInt8)
+        return output_path
+
+    class PlateCalibrationReader(CalibrationDataReader):
+
+        def __init__(self, input_name: str) -> None:
+            self.input_name = input_name
+            self.blobs = iter(load_calibration_blobs(CALIBRATION_DIR, CALIBRATION_SAMPLES))
+
+        def get_next(self) -> dict:
+            blob = next(self.blobs, None)
+            return None if blob is None else {self.input_name: blob}
+
+    import onnxruntime as ort
+
+    input_name = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    quantize_static(
+        onnx_path,
+        output_path,
+        PlateCalibrationReader(input_name),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True
+    )
+    return output_path
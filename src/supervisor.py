@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.utils.config import CAMERA_SOURCES, MODEL_PATH, SHOW_PREVIEW, OCR_WORKERS, AUTH_INDEX, PRESENCE_CACHE
+from src.utils.config import DATABASE_ENSURE_INDEXES
+from src.database.authorization import get_authorization_index
+from src.database.history import stop_history_writer
+from src.database.presence import get_presence_table
+from src.controller.supervisor import GateSupervisor
+from src.model.predict import PredictDetectionModel
+from src.controller.extract import TextExtraction
+from src.controller.ocr_pool import OCRProcessPool
+from src.database.indexes import ensure_indexes
+from src.database.visitor import VisitorRecord
+from src.database.setup import get_database
+from src.utils.startup import StartupTracker
+
+
+def main() -> None:
+    """
+    Load and warm up the shared detector and OCR reader, then run every camera lane.
+    """
+    startup = StartupTracker()
+
+    # One model and one OCR reader are shared by every camera lane in the process
+    with startup.phase("Detector load"):
+        model = PredictDetectionModel(MODEL_PATH)
+
+    with startup.phase("OCR load"):
+        extraction = OCRProcessPool() if OCR_WORKERS > 0 else TextExtraction()
+
+    with startup.phase("Database connect"):
+        get_database()
+        if DATABASE_ENSURE_INDEXES:
+            ensure_indexes()
+            VisitorRecord().sweep_expired()
+        if AUTH_INDEX:
+            get_authorization_index()
+        if PRESENCE_CACHE:
+            get_presence_table()
+
+    with startup.phase("Detector warm-up"):
+        model.warmup()
+
+    with startup.phase("OCR warm-up"):
+        extraction.warmup()
+
+    try:
+        GateSupervisor(CAMERA_SOURCES, model, extraction).run(SHOW_PREVIEW, startup)
+    finally:
+        stop_history_writer()
+        if OCR_WORKERS > 0:
+            extraction.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 from dotenv import load_dotenv
+import json
 import os
 
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_TIMEOUT = float(os.getenv("DATABASE_TIMEOUT", 3))
+DATABASE_ENSURE_INDEXES = os.getenv("DATABASE_ENSURE_INDEXES", "true").lower() == "true"
 
 MODEL_PATH = os.getenv("MODEL_PATH")
 
@@ -13,6 +16,90 @@ if VIDEO_SOURCE.isdigit():
     VIDEO_SOURCE = int(VIDEO_SOURCE)
 
 ACTION_OPTION = os.getenv("ACTION_OPTION")
+LANE_ROI = json.loads(os.getenv("LANE_ROI", "null"))
 
 ADMIN_PHONE_NUMBER = os.getenv("ADMIN_PHONE_NUMBER")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
+
+AUTH_INDEX = os.getenv("AUTH_INDEX", "true").lower() == "true"
+AUTH_INDEX_REFRESH = float(os.getenv("AUTH_INDEX_REFRESH", 30))
+AUTH_INDEX_MAX_AGE = float(os.getenv("AUTH_INDEX_MAX_AGE", 300))
+AUTH_INDEX_FULL_RELOAD = float(os.getenv("AUTH_INDEX_FULL_RELOAD", 600))
+AUTH_SNAPSHOT_FILE = os.getenv("AUTH_SNAPSHOT_FILE", "./data/authorization.sqlite")
+FUZZY_MATCH = os.getenv("FUZZY_MATCH", "false").lower() == "true"
+FUZZY_MAX_DISTANCE = float(os.getenv("FUZZY_MAX_DISTANCE", 0.6))
+FUZZY_MIN_MARGIN = float(os.getenv("FUZZY_MIN_MARGIN", 0.5))
+FUZZY_CONFIRM_WINDOW = float(os.getenv("FUZZY_CONFIRM_WINDOW", 60))
+PRESENCE_CACHE = os.getenv("PRESENCE_CACHE", "true").lower() == "true"
+PRESENCE_TTL = float(os.getenv("PRESENCE_TTL", 300))
+HISTORY_WRITE_BEHIND = os.getenv("HISTORY_WRITE_BEHIND", "true").lower() == "true"
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", 100))
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", 1))
+HISTORY_RETRY_MAX_DELAY = float(os.getenv("HISTORY_RETRY_MAX_DELAY", 30))
+HISTORY_DRAIN_TIMEOUT = float(os.getenv("HISTORY_DRAIN_TIMEOUT", 10))
+HISTORY_QUEUE_SIZE = int(os.getenv("HISTORY_QUEUE_SIZE", 10000))
+HISTORY_JOURNAL_FILE = os.getenv("HISTORY_JOURNAL_FILE", "./data/history.journal")
+
+FRAME_QUEUE_SIZE = int(os.getenv("FRAME_QUEUE_SIZE", 1))
+OCR_QUEUE_SIZE = int(os.getenv("OCR_QUEUE_SIZE", 4))
+DECISION_QUEUE_SIZE = int(os.getenv("DECISION_QUEUE_SIZE", 8))
+QUEUE_POLICY = os.getenv("QUEUE_POLICY", "drop_oldest")
+METRICS_INTERVAL = float(os.getenv("METRICS_INTERVAL", 60))
+RECONNECT_DELAY = float(os.getenv("RECONNECT_DELAY", 5))
+
+CAMERA_SOURCES = json.loads(os.getenv("CAMERA_SOURCES", "[]"))
+SHOW_PREVIEW = os.getenv("SHOW_PREVIEW", "false").lower() == "true"
+
+TRACK_IOU_THRESHOLD = float(os.getenv("TRACK_IOU_THRESHOLD", 0.3))
+TRACK_MAX_DISTANCE = float(os.getenv("TRACK_MAX_DISTANCE", 1.0))
+TRACK_MAX_MISSED = int(os.getenv("TRACK_MAX_MISSED", 15))
+TRACK_MAX_OCR_ATTEMPTS = int(os.getenv("TRACK_MAX_OCR_ATTEMPTS", 10))
+TRACK_MAX_DECISIONS = int(os.getenv("TRACK_MAX_DECISIONS", 3))
+OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONFIDENCE", 0.9))
+OCR_VOTE_AGREEMENT = float(os.getenv("OCR_VOTE_AGREEMENT", 0.7))
+OCR_VOTE_MIN_VOTES = int(os.getenv("OCR_VOTE_MIN_VOTES", 2))
+OCR_VOTE_WINDOW = int(os.getenv("OCR_VOTE_WINDOW", 5))
+OCR_MODE = os.getenv("OCR_MODE", "recognize")
+OCR_FALLBACK_CONFIDENCE = float(os.getenv("OCR_FALLBACK_CONFIDENCE", 0.5))
+OCR_STACKED_RATIO = float(os.getenv("OCR_STACKED_RATIO", 2.5))
+OCR_TARGET_HEIGHT = int(os.getenv("OCR_TARGET_HEIGHT", 128))
+OCR_BUFFER_BUCKET = int(os.getenv("OCR_BUFFER_BUCKET", 32))
+OCR_CACHE_SIZE = int(os.getenv("OCR_CACHE_SIZE", 256))
+OCR_CACHE_TOLERANCE = float(os.getenv("OCR_CACHE_TOLERANCE", 0.05))
+OCR_CACHE_TTL = float(os.getenv("OCR_CACHE_TTL", 10))
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", 0))
+OCR_TORCH_THREADS = int(os.getenv("OCR_TORCH_THREADS", 1))
+OCR_POOL_QUEUE = int(os.getenv("OCR_POOL_QUEUE", 8))
+OCR_POOL_SLOT_KB = int(os.getenv("OCR_POOL_SLOT_KB", 1024))
+OCR_POOL_TIMEOUT = float(os.getenv("OCR_POOL_TIMEOUT", 10))
+
+QUALITY_GATE = os.getenv("QUALITY_GATE", "true").lower() == "true"
+QUALITY_MIN_HEIGHT = int(os.getenv("QUALITY_MIN_HEIGHT", 16))
+QUALITY_MIN_SHARPNESS = float(os.getenv("QUALITY_MIN_SHARPNESS", 30))
+QUALITY_MIN_CONTRAST = float(os.getenv("QUALITY_MIN_CONTRAST", 20))
+QUALITY_MAX_CLIPPED = float(os.getenv("QUALITY_MAX_CLIPPED", 0.5))
+QUALITY_BEST_RATIO = float(os.getenv("QUALITY_BEST_RATIO", 0.8))
+
+MOTION_GATE = os.getenv("MOTION_GATE", "true").lower() == "true"
+MOTION_WIDTH = int(os.getenv("MOTION_WIDTH", 160))
+MOTION_PIXEL_THRESHOLD = int(os.getenv("MOTION_PIXEL_THRESHOLD", 25))
+MOTION_SENSITIVITY = float(os.getenv("MOTION_SENSITIVITY", 0.01))
+MOTION_HEARTBEAT = int(os.getenv("MOTION_HEARTBEAT", 30))
+MOTION_HOLD = int(os.getenv("MOTION_HOLD", 15))
+
+NMS_IOU_THRESHOLD = float(os.getenv("NMS_IOU_THRESHOLD", 0.3))
+NMS_CLASS_AWARE = os.getenv("NMS_CLASS_AWARE", "false").lower() == "true"
+NMS_TOP_K = int(os.getenv("NMS_TOP_K", 0))
+
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+INFERENCE_IMGSZ = int(os.getenv("INFERENCE_IMGSZ", 640))
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", 0))
+MODEL_PRECISION = os.getenv("MODEL_PRECISION", "fp32")
+CALIBRATION_DIR = os.getenv("CALIBRATION_DIR", "./calibration")
+CALIBRATION_SAMPLES = int(os.getenv("CALIBRATION_SAMPLES", 200))
+
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 1))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", 10))
+
+WARMUP_RUNS = int(os.getenv("WARMUP_RUNS", 2))
+READY_FILE = os.getenv("READY_FILE", "./ready")
@@ -0,0 +1,122 @@
+from src.utils.log import write_log
+from collections import deque
+import threading
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Compute the q-th percentile of a list of values.
+
+    Args:
+        values (list): The values to compute the percentile of.
+        q (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        float: The percentile value, or 0.0 if there are no values.
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * q / 100
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+class Metrics:
+
+    def __init__(self, name: str, window: int = 1000) -> None:
+        """
+        Initialize a thread-safe set of counters, gauges and timings.
+
+        Args:
+            name (str): The name used to prefix logged summaries.
+            window (int): The number of most recent samples kept per timing.
+        """
+        self.name = name
+        self.window = window
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.timings = {}
+
+
+    def increment(self, key: str, value: int = 1) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            key (str): The counter name.
+            value (int): The amount to add.
+        """
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+
+    def set_gauge(self, key: str, value: float) -> None:
+        """
+        Set a gauge to its current value.
+
+        Args:
+            key (str): The gauge name.
+            value (float): The current value.
+        """
+        with self.lock:
+            self.gauges[key] = value
+
+
+    def observe(self, key: str, value: float) -> None:
+        """
+        Record a timing sample in seconds.
+
+        Args:
+            key (str): The timing name.
+            value (float): The sample in seconds.
+        """
+        with self.lock:
+            if key not in self.timings:
+                self.timings[key] = deque(maxlen=self.window)
+            self.timings[key].append(value)
+
+
+    def snapshot(self) -> dict:
+        """
+        Return a copy of the current metrics.
+
+        Returns:
+            dict: The counters, gauges and timing summaries (count, p50, p95 in milliseconds).
+        """
+        with self.lock:
+            timings = {key: list(samples) for key, samples in self.timings.items()}
+            snapshot = {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "timings": {}
+            }
+
+        for key, samples in timings.items():
+            snapshot["timings"][key] = {
+                "count": len(samples),
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000
+            }
+
+        return snapshot
+
+
+    def log_summary(self) -> None:
+        """
+        Write a one-line summary of the current metrics to the info log.
+        """
+        try:
+            snapshot = self.snapshot()
+            parts = [f"{key}={value}" for key, value in sorted(snapshot["counters"].items())]
+            parts += [f"{key}={value:.2f}" for key, value in sorted(snapshot["gauges"].items())]
+            parts += [
+                f"{key}=p50:{value['p50_ms']:.1f}ms/p95:{value['p95_ms']:.1f}ms"
+                for key, value in sorted(snapshot["timings"].items())
+            ]
+            write_log("info", f"[Metrics] {self.name}: {' '.join(parts)}")
+        except Exception as e:
+            write_log("error", f"[Metrics] Failed to log metrics summary: {e}")
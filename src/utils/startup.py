@@ -0,0 +1,69 @@
+from src.utils.config import READY_FILE
+from contextlib import contextmanager
+from src.utils.log import write_log
+import json
+import time
+import os
+
+
+class StartupTracker:
+
+    def __init__(self, ready_file: str = READY_FILE) -> None:
+        """
+        Initialize the tracker that times each startup phase and signals readiness.
+
+        Args:
+            ready_file (str): The file written once the gate is warm and live, empty to disable.
+        """
+        self.ready_file = ready_file
+        self.phases = {}
+        self.start_time = time.perf_counter()
+        self.clear_ready()
+
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a startup phase and log its duration.
+
+        Args:
+            name (str): The phase name.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start_time
+            write_log("info", f"[Startup] {name} took {self.phases[name]:.2f}s")
+
+
+    def mark_ready(self) -> None:
+        """
+        Log the total startup time and write the readiness file.
+        """
+        total = time.perf_counter() - self.start_time
+        write_log("info", f"[Startup] Ready after {total:.2f}s")
+
+        if not self.ready_file:
+            return
+
+        try:
+            with open(self.ready_file, "w") as file:
+                json.dump({
+                    "ready_at": time.time(),
+                    "startup_seconds": round(total, 3),
+                    "phases": {name: round(duration, 3) for name, duration in self.phases.items()}
+                }, file)
+        except Exception as e:
+            write_log("error", f"[StartupTracker] Failed to write ready file: {e}")
+
+
+    def clear_ready(self) -> None:
+        """
+        Remove the readiness file so the gate is not reported live.
+        """
+        try:
+            if self.ready_file and os.path.exists(self.ready_file):
+                os.remove(self.ready_file)
+        except Exception as e:
+            write_log("error", f"[StartupTracker] Failed to remove ready file: {e}")
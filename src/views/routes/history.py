@@ -60,10 +60,8 @@ def home():
             flash("You do not have permission to access the page.", "warning")
             return redirect("/visitor")
 
-        records = history_db.find_all()
+        records = history_db.find_all() if user_role == 'Founder' else history_db.find_by_group(user_group)
         records = format_times(records)
-        if user_role != 'Founder':
-            records = [record for record in records if record['group'] == user_group]
 
         return render_template("index.html", record=records, whitelisted=whitelisted)
     
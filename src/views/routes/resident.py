@@ -34,9 +34,7 @@ def resident():
             flash("You do not have permission to access the page.", "warning")
             return redirect("/visitor")
 
-        records = user_db.find_all()
-        if user_role != 'Founder':
-            records = [record for record in records if record['group'] == user_group]
+        records = user_db.find_all() if user_role == 'Founder' else user_db.find_by_group(user_group)
 
         formatted_records = []
         for record in records:
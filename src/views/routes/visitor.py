@@ -34,12 +34,13 @@ def visitor():
         user_group = user['group']
         whitelisted = user_role in ['Founder', 'Admin']
 
-        records = visitor_db.find_all()
-        records = format_times(records)
         if user_role == 'Admin':
-            records = [record for record in records if record['group'] == user_group]
+            records = visitor_db.find_by_group(user_group)
         elif user_role == 'Resident':
-            records = [record for record in records if record['phone_number'] == phone_number]
+            records = visitor_db.find_by_phone_number(phone_number)
+        else:
+            records = visitor_db.find_all()
+        records = format_times(records)
 
         return render_template("visitor.html", record=records, whitelisted=whitelisted)
     
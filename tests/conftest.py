@@ -0,0 +1,6 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+# The config module requires a video source, which no test opens
+os.environ.setdefault("VIDEO_SOURCE", "0")
@@ -0,0 +1,136 @@
+from src.database import authorization
+import datetime
+import pytest
+import types
+import time
+import sys
+
+
+class FakeCollection:
+
+    def __init__(self, documents: list) -> None:
+        self.documents = documents
+        self.queries = []
+
+    def find(self, query: dict, projection: dict = None) -> list:
+        self.queries.append(query)
+        return list(self.documents)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    bson = types.ModuleType("bson")
+    bson.ObjectId = types.SimpleNamespace(from_datetime=lambda moment: ("oid", moment))
+    monkeypatch.setitem(sys.modules, "bson", bson)
+
+    database = {
+        "users": FakeCollection([
+            {"_id": 1, "group": "north", "role": "Resident", "vehicle": [{"type": "Car", "license_plate": "ABC 1234"}]},
+            {"_id": 2, "group": "south", "role": "Resident", "vehicle": [{"type": "Car", "license_plate": "XYZ 1"}]}
+        ]),
+        "visitor-record": FakeCollection([]),
+        "deletions": FakeCollection([])
+    }
+    monkeypatch.setattr(authorization, "get_database", lambda: database)
+    return database
+
+
+def index() -> authorization.AuthorizationIndex:
+    index = authorization.AuthorizationIndex(snapshot_file="")
+    assert index.load()
+    return index
+
+
+def test_changed_user_replaces_its_plates(database):
+    authorization_index = index()
+    database["users"].documents = [
+        {"_id": 1, "group": "north", "role": "Resident", "vehicle": [{"type": "Motorcycle", "license_plate": "ABC 99"}]}
+    ]
+
+    assert authorization_index.load_changes()
+    assert authorization_index.lookup("ABC1234") == (None, None)
+    assert authorization_index.lookup("ABC99") == ({"group": "north", "role": "Resident"}, "Motorcycle")
+    assert authorization_index.lookup("XYZ1")[0]["group"] == "south"
+
+
+def test_changes_are_looked_up_since_last_load(database):
+    authorization_index = index()
+    loaded_at = authorization_index.loaded_at
+    database["users"].documents = []
+
+    assert authorization_index.load_changes()
+    query = database["users"].queries[-1]["$or"]
+    assert query[1] == {"updated_at": {"$gte": loaded_at - authorization.DELTA_OVERLAP}}
+    assert query[0]["_id"]["$gte"][1] == datetime.datetime.fromtimestamp(loaded_at - authorization.DELTA_OVERLAP, datetime.timezone.utc)
+    assert authorization_index.loaded_at >= loaded_at
+
+
+def test_new_visitor_is_added_once(database):
+    authorization_index = index()
+    now = time.time()
+    database["users"].documents = []
+    database["visitor-record"].documents = [
+        {"_id": 7, "license_plate": "VIS 42", "group": "north", "vehicle_type": "Car", "enter_time": now - 60, "exit_time": now + 60}
+    ]
+
+    assert authorization_index.load_changes()
+    assert authorization_index.load_changes()
+    assert len(authorization_index.visitors["VIS42"]) == 1
+    assert authorization_index.lookup("VIS42") == ({"group": "north", "role": "Visitor"}, "Car")
+
+
+def test_poll_falls_back_to_full_reload(database, monkeypatch):
+    authorization_index = index()
+    calls = []
+    monkeypatch.setattr(authorization_index, "load", lambda: calls.append("load"))
+    monkeypatch.setattr(authorization_index, "load_changes", lambda: calls.append("changes"))
+    monkeypatch.setattr(authorization_index.changed, "wait", lambda timeout: authorization_index.stop_event.is_set())
+
+    authorization_index.full_loaded_at = time.time()
+    monkeypatch.setattr(authorization_index.metrics, "set_gauge", lambda *args: authorization_index.stop_event.set())
+    authorization_index.poll()
+    assert calls == ["changes"]
+
+    authorization_index.stop_event.clear()
+    authorization_index.full_loaded_at = time.time() - authorization_index.full_reload
+    authorization_index.poll()
+    assert calls == ["changes", "load"]
+
+
+def test_deleted_resident_and_visitor_stop_matching_after_one_refresh(database):
+    now = time.time()
+    database["visitor-record"].documents = [
+        {"_id": 7, "license_plate": "VIS 42", "group": "north", "vehicle_type": "Car", "enter_time": now - 60, "exit_time": now + 60}
+    ]
+    authorization_index = index()
+    assert authorization_index.lookup("ABC1234")[0] and authorization_index.lookup("VIS42")[0]
+
+    database["users"].documents = []
+    database["visitor-record"].documents = []
+    database["deletions"].documents = [
+        {"_id": 100, "collection": "users", "record_id": 1, "plates": ["ABC 1234"], "deleted_at": now},
+        {"_id": 101, "collection": "visitor-record", "record_id": None, "plates": ["VIS 42"], "deleted_at": now}
+    ]
+
+    assert authorization_index.load_changes()
+    assert authorization_index.lookup("ABC1234") == (None, None)
+    assert authorization_index.lookup("VIS42") == (None, None)
+    assert authorization_index.lookup("XYZ1")[0]["group"] == "south"
+
+
+def test_plate_registered_again_after_delete_stays_registered(database):
+    authorization_index = index()
+    now = time.time()
+    database["users"].documents = [
+        {"_id": 3, "group": "east", "role": "Resident", "vehicle": [{"type": "Car", "license_plate": "ABC 1234"}]}
+    ]
+    database["deletions"].documents = [
+        {"_id": 100, "collection": "users", "record_id": 1, "plates": ["ABC 1234"], "deleted_at": now}
+    ]
+
+    assert authorization_index.load_changes()
+    assert authorization_index.lookup("ABC1234")[0]["group"] == "east"
+
+    # The same tombstone is seen again within the overlap of the next lookup
+    assert authorization_index.load_changes()
+    assert authorization_index.lookup("ABC1234")[0]["group"] == "east"
@@ -0,0 +1,32 @@
+from src.database.authorization import AuthorizationIndex
+import sqlite3
+import time
+
+
+def test_snapshot_keeps_only_plate_role_group_and_vehicle_type(tmp_path):
+    snapshot = str(tmp_path / "authorization.sqlite")
+    index = AuthorizationIndex(snapshot_file=snapshot)
+    now = time.time()
+    index.swap(
+        {"ABC1234": ({"group": "north", "role": "Resident"}, "Car")},
+        {"VIS42": [((now - 60, now + 60), {"group": "north", "role": "Visitor"}, "Motorcycle")]},
+        now
+    )
+    index.save()
+
+    connection = sqlite3.connect(snapshot)
+    try:
+        columns = {
+            table: [row[1] for row in connection.execute(f"PRAGMA table_info({table})")]
+            for table in ("residents", "visitors")
+        }
+    finally:
+        connection.close()
+
+    assert columns["residents"] == ["license_plate", "role", "grp", "vehicle_type"]
+    assert columns["visitors"] == ["license_plate", "valid_from", "valid_until", "role", "grp", "vehicle_type"]
+
+    restored = AuthorizationIndex(snapshot_file=snapshot)
+    assert restored.restore()
+    assert restored.lookup("ABC 1234") == ({"group": "north", "role": "Resident"}, "Car")
+    assert restored.lookup("VIS42") == ({"group": "north", "role": "Visitor"}, "Motorcycle")
@@ -0,0 +1,18 @@
+from src.model.backend import InferenceBackend, ExportedBackend
+import pytest
+
+
+def test_backend_without_predict_fails_when_built():
+    class IncompleteBackend(InferenceBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+
+
+def test_exported_backend_without_run_fails_when_built():
+    class IncompleteExportedBackend(ExportedBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteExportedBackend()
@@ -0,0 +1,70 @@
+from src.controller.consensus import PlateConsensus, OCR_MIN_CONFIDENCE, OCR_VOTE_MIN_VOTES, TRACK_MAX_OCR_ATTEMPTS
+from src.controller.tracker import Track, TRACK_MAX_DECISIONS
+from src.model.detection import Detection
+
+
+def test_confident_reading_commits_at_once():
+    consensus = PlateConsensus()
+
+    assert consensus.add("ABC1234", OCR_MIN_CONFIDENCE) == "ABC1234"
+    assert consensus.add("XYZ1", 1.0) == "ABC1234"
+
+
+def test_agreeing_readings_commit():
+    consensus = PlateConsensus()
+    for _ in range(OCR_VOTE_MIN_VOTES - 1):
+        assert consensus.add("ABC1234", 0.5) is None
+
+    assert consensus.add("ABC1234", 0.5) == "ABC1234"
+
+
+def test_split_vote_stays_open_until_attempts_run_out():
+    consensus = PlateConsensus()
+    assert consensus.add("ABC1234", 0.5) is None
+    assert consensus.add("ABC1284", 0.4) is None
+    for _ in range(TRACK_MAX_OCR_ATTEMPTS - 3):
+        assert consensus.add(None, 0.0) is None
+
+    assert consensus.add(None, 0.0) == "ABC1234"
+    assert consensus.exhausted()
+
+
+def test_unreadable_crops_never_commit():
+    consensus = PlateConsensus()
+    for _ in range(TRACK_MAX_OCR_ATTEMPTS):
+        assert consensus.add(None, 0.0) is None
+
+
+def vote(track: Track) -> None:
+    for _ in range(OCR_VOTE_MIN_VOTES):
+        track.record_ocr("ABC1234", 0.5)
+
+
+def test_denied_low_confidence_track_is_voted_on_again():
+    track = Track(1, Detection(0, 0, 100, 30, 0.9))
+    for _ in range(TRACK_MAX_DECISIONS - 1):
+        vote(track)
+        assert track.ready_for_decision()
+        assert track.record_decision(None)
+        assert track.needs_ocr() and not track.ready_for_decision()
+
+    vote(track)
+    assert not track.record_decision(None)
+    assert track.decided and not track.needs_ocr()
+
+
+def test_denied_confident_reading_is_final():
+    track = Track(1, Detection(0, 0, 100, 30, 0.9))
+    track.record_ocr("ABC1234", OCR_MIN_CONFIDENCE)
+
+    assert not track.record_decision(None)
+    assert track.decided and track.decisions == 1
+
+
+def test_admitted_track_is_decided_once():
+    track = Track(1, Detection(0, 0, 100, 30, 0.9))
+    track.record_ocr("ABC1234", 1.0)
+
+    assert not track.record_decision("Resident")
+    assert track.decided and track.role == "Resident"
+    assert not track.ready_for_decision()
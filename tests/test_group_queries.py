@@ -0,0 +1,73 @@
+from src.database.history import HistoryRecord
+from src.database.visitor import VisitorRecord
+from src.database.user import UserDatabase
+from src.database import deletions
+import pytest
+import types
+
+
+class FakeCollection:
+
+    def __init__(self) -> None:
+        self.queries = []
+
+    def find(self, query: dict, *args):
+        self.queries.append(query)
+        return []
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = FakeCollection()
+    for wrapper in (HistoryRecord, VisitorRecord, UserDatabase):
+        monkeypatch.setattr(wrapper, "collection", collection)
+    return collection
+
+
+@pytest.mark.parametrize("group", ["north", "", None])
+def test_group_queries_always_filter_by_group(collection, group):
+    HistoryRecord().find_by_group(group)
+    VisitorRecord().find_by_group(group)
+    UserDatabase.__new__(UserDatabase).find_by_group(group)
+
+    assert [query["group"] for query in collection.queries] == [group, group, group]
+
+
+def test_resident_visitors_are_queried_by_phone_number(collection):
+    VisitorRecord().find_by_phone_number("60123456789")
+
+    assert collection.queries[0]["phone_number"] == "60123456789"
+    assert "exit_time" in collection.queries[0]
+
+
+def test_deletes_record_tombstones_first(monkeypatch):
+    calls = []
+
+    class DeletingCollection:
+
+        def find_one(self, query: dict, projection: dict) -> dict:
+            return {"_id": 1, "vehicle": [{"type": "Car", "license_plate": "ABC1234"}]}
+
+        def delete_one(self, query: dict) -> None:
+            calls.append(("delete_one", query))
+
+        def delete_many(self, query: dict) -> None:
+            calls.append(("delete_many", query))
+
+    monkeypatch.setattr(UserDatabase, "collection", DeletingCollection())
+    monkeypatch.setattr(VisitorRecord, "collection", DeletingCollection())
+    monkeypatch.setattr(deletions, "get_database", lambda: {"deletions": types.SimpleNamespace(
+        insert_one=lambda document: calls.append(("tombstone", document["collection"], document["plates"], document["record_id"]))
+    )})
+
+    user_db = UserDatabase.__new__(UserDatabase)
+    user_db.collection_name = "users"
+    user_db.delete_user("60123456789")
+    VisitorRecord().delete("VIS42")
+
+    assert calls == [
+        ("tombstone", "users", ["ABC1234"], 1),
+        ("delete_one", {"phone_number": "60123456789"}),
+        ("tombstone", "visitor-record", ["VIS42"], None),
+        ("delete_many", {"license_plate": "VIS42"})
+    ]
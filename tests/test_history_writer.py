@@ -0,0 +1,173 @@
+from src.database import history
+import threading
+import pytest
+import types
+import json
+import time
+import sys
+
+
+class BulkWriteError(Exception):
+
+    def __init__(self, details: dict) -> None:
+        super().__init__("batch op errors occurred")
+        self.details = details
+
+
+class InsertOne:
+
+    def __init__(self, document: dict) -> None:
+        self.document = document
+
+
+class UpdateOne:
+
+    def __init__(self, query: dict, update: dict) -> None:
+        self.query = query
+        self.update = update
+
+
+class FakeCollection:
+
+    def __init__(self) -> None:
+        self.documents = {}
+        self.writes = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def bulk_write(self, requests: list, ordered: bool) -> None:
+        self.gate.wait()
+        for index, request in enumerate(requests):
+            if isinstance(request, InsertOne):
+                if request.document["_id"] in self.documents:
+                    raise BulkWriteError({"writeErrors": [{"index": index, "code": 11000, "errmsg": "duplicate key"}]})
+                self.documents[request.document["_id"]] = dict(request.document)
+                self.writes.append(("insert", request.document["_id"]))
+            else:
+                self.documents[request.query["_id"]].update(request.update["$set"])
+                self.writes.append(("update", request.query["_id"]))
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = FakeCollection()
+    pymongo = types.ModuleType("pymongo")
+    pymongo.InsertOne, pymongo.UpdateOne = InsertOne, UpdateOne
+    pymongo.errors = types.SimpleNamespace(BulkWriteError=BulkWriteError)
+    bson = types.ModuleType("bson")
+    bson.json_util = types.SimpleNamespace(dumps=json.dumps, loads=json.loads)
+
+    monkeypatch.setitem(sys.modules, "pymongo", pymongo)
+    monkeypatch.setitem(sys.modules, "pymongo.errors", pymongo.errors)
+    monkeypatch.setitem(sys.modules, "bson", bson)
+    monkeypatch.setattr(history, "get_database", lambda: {"history-record": collection})
+    return collection
+
+
+def writer(path, **kwargs) -> history.HistoryWriter:
+    return history.HistoryWriter(flush_interval=0.01, retry_max_delay=0.01, drain_timeout=1,
+                                 journal_file=str(path), **kwargs)
+
+
+def test_writes_are_flushed_in_order(collection, tmp_path):
+    history_writer = writer(tmp_path / "history.journal")
+    for index in range(5):
+        history_writer.put("insert", {"_id": index, "license_plate": f"ABC{index}", "exit_time": None})
+        history_writer.put("update", {"_id": index, "license_plate": f"ABC{index}", "exit_time": index})
+    history_writer.stop()
+
+    assert collection.writes == [(action, index) for index in range(5) for action in ("insert", "update")]
+    assert history_writer.latest("ABC0") is None
+    assert (tmp_path / "history.journal").read_text() == ""
+
+
+def test_pending_record_is_latest_until_flushed(collection, tmp_path):
+    collection.gate.clear()
+    history_writer = writer(tmp_path / "history.journal")
+    record = {"_id": 1, "license_plate": "ABC1234", "exit_time": None}
+    history_writer.put("insert", record)
+
+    assert history_writer.latest("ABC1234") is record
+    collection.gate.set()
+    history_writer.stop()
+    assert history_writer.latest("ABC1234") is None
+
+
+def test_unflushed_journal_is_replayed_once(collection, tmp_path):
+    journal = tmp_path / "history.journal"
+    collection.documents[1] = {"_id": 1, "license_plate": "ABC1", "exit_time": None}
+    journal.write_text(
+        json.dumps({"action": "insert", "data": {"_id": 1, "license_plate": "ABC1", "exit_time": None}}) + "\n" +
+        json.dumps({"action": "update", "data": {"_id": 1, "license_plate": "ABC1", "exit_time": 5}}) + "\n" +
+        '{"action": "ins'
+    )
+
+    history_writer = writer(journal)
+    history_writer.stop()
+
+    assert collection.documents[1]["exit_time"] == 5
+    assert history_writer.metrics.snapshot()["counters"]["duplicates"] == 1
+    assert journal.read_text() == ""
+
+
+def test_running_process_journal_is_not_shared(collection, tmp_path):
+    journal = tmp_path / "history.journal"
+    first, second = writer(journal), writer(journal)
+
+    assert first.journal_file == str(journal)
+    assert second.journal_file == f"{journal}.1"
+    first.stop()
+    second.stop()
+
+
+def test_dropped_writes_are_recovered_from_journal(collection, tmp_path):
+    collection.gate.clear()
+    history_writer = writer(tmp_path / "history.journal", batch_size=1, queue_size=1)
+    for index in range(4):
+        history_writer.put("insert", {"_id": index, "license_plate": f"ABC{index}"})
+
+    assert history_writer.metrics.snapshot()["counters"]["dropped"] >= 1
+    collection.gate.set()
+    history_writer.stop()
+
+    assert sorted(collection.documents) == [0, 1, 2, 3]
+    assert not history_writer.orphaned
+    assert (tmp_path / "history.journal").read_text() == ""
+
+
+def test_write_concern_error_retries_the_batch(collection, tmp_path, monkeypatch):
+    bulk_write, failures = collection.bulk_write, [BulkWriteError({"writeErrors": [], "writeConcernErrors": [{"code": 64}]})]
+
+    def flaky_bulk_write(requests: list, ordered: bool) -> None:
+        if failures:
+            raise failures.pop()
+        bulk_write(requests, ordered)
+
+    monkeypatch.setattr(collection, "bulk_write", flaky_bulk_write)
+    history_writer = writer(tmp_path / "history.journal")
+    history_writer.put("insert", {"_id": 1, "license_plate": "ABC1"})
+    history_writer.stop()
+
+    assert collection.documents[1]["license_plate"] == "ABC1"
+    assert history_writer.metrics.snapshot()["counters"]["retries"] == 1
+
+
+def test_failed_flush_does_not_stop_the_writer(collection, tmp_path, monkeypatch):
+    history_writer = writer(tmp_path / "history.journal")
+    flush, failures = history_writer.flush, [RuntimeError("unexpected")]
+
+    def failing_flush(batch: list) -> bool:
+        if failures:
+            raise failures.pop()
+        return flush(batch)
+
+    monkeypatch.setattr(history_writer, "flush", failing_flush)
+    history_writer.put("insert", {"_id": 1, "license_plate": "ABC1"})
+    time.sleep(0.1)
+    history_writer.put("insert", {"_id": 2, "license_plate": "ABC2"})
+    history_writer.stop()
+
+    assert history_writer.thread.is_alive() is False
+    assert sorted(collection.documents) == [1, 2]
+    assert history_writer.metrics.snapshot()["counters"]["writer_errors"] == 1
+    assert (tmp_path / "history.journal").read_text() == ""
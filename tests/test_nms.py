@@ -0,0 +1,43 @@
+from src.model.nms import non_max_suppression, pairwise_suppression, matrix_suppression, PAIRWISE_MAX_BOXES
+from benchmarks.nms import legacy_filter_nms, make_labels
+import numpy as np
+import pytest
+
+
+def random_boxes(count: int, seed: int) -> tuple:
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform([100, 100], [1820, 980], size=(max(1, count * 2 // 3), 2))
+    xy = centers[np.arange(count) % len(centers)] + rng.normal(0, 8, size=(count, 2))
+    boxes = np.hstack([xy - [60, 20], xy + [60, 20]]).astype(np.float32)
+    return boxes, rng.uniform(0.25, 1.0, count), rng.integers(0, 2, count)
+
+
+@pytest.mark.parametrize("count", [2, 5, PAIRWISE_MAX_BOXES, PAIRWISE_MAX_BOXES + 1, 40, 100])
+@pytest.mark.parametrize("class_aware", [False, True])
+@pytest.mark.parametrize("top_k", [0, 3])
+def test_pairwise_and_matrix_suppression_agree(count, class_aware, top_k):
+    boxes, scores, classes = random_boxes(count, seed=count)
+    order = np.argsort(-scores, kind="stable")
+    classes = classes if class_aware else None
+
+    pairwise = pairwise_suppression(boxes, order, classes, 0.3, top_k)
+    matrix = matrix_suppression(boxes, order, classes, 0.3, top_k)
+    assert [int(index) for index in pairwise] == [int(index) for index in matrix]
+
+
+def test_highest_score_of_overlapping_boxes_is_kept():
+    boxes = np.array([[0, 0, 100, 30], [5, 2, 105, 32], [500, 0, 600, 30]], dtype=np.float32)
+    scores = np.array([0.6, 0.9, 0.5])
+
+    assert non_max_suppression(boxes, scores).tolist() == [1, 2]
+    assert non_max_suppression(boxes, scores, np.array([0, 1, 0]), class_aware=True).tolist() == [1, 0, 2]
+    assert non_max_suppression(boxes[:0], scores[:0]).tolist() == []
+
+
+@pytest.mark.parametrize("count", [1, 10, 100])
+def test_legacy_filter_keeps_as_many_plates(count):
+    labels = make_labels(count, np.random.default_rng(0))
+    boxes = np.array([[l["x1"], l["y1"], l["x2"], l["y2"]] for l in labels], dtype=np.float32)
+    scores = np.array([l["confidence"] for l in labels])
+
+    assert len(legacy_filter_nms([dict(label) for label in labels])) == len(non_max_suppression(boxes, scores))
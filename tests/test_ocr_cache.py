@@ -0,0 +1,109 @@
+from src.controller.ocr_cache import OCRCache, dhash
+from src.controller.pipeline import DetectionPipeline
+from src.controller.consensus import OCR_VOTE_MIN_VOTES
+from src.controller.extract import TextExtraction
+from src.controller.tracker import PlateTracker
+from src.model.detection import Detection
+import numpy as np
+
+
+def plate_crop(text_value: int, noise_seed: int = None) -> np.ndarray:
+    crop = np.full((64, 256), 230, dtype=np.uint8)
+    crop[16:48, 16 + text_value * 8:48 + text_value * 8] = 20
+    if noise_seed is not None:
+        noise = np.random.default_rng(noise_seed).integers(-1, 2, crop.shape)
+        crop = np.clip(crop.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    return crop
+
+
+class CountingExtraction(TextExtraction):
+
+    def __init__(self, confidence: float = 0.95) -> None:
+        super().__init__(load_reader=False)
+        self.confidence = confidence
+        self.calls = 0
+
+    def ocr_crops(self, crops: list) -> list:
+        self.calls += len(crops)
+        return [("ABC1234", self.confidence)] * len(crops)
+
+
+def test_dhash_is_stable_under_pixel_noise():
+    assert bin(dhash(plate_crop(1)) ^ dhash(plate_crop(1, noise_seed=0))).count("1") <= 1
+    assert bin(dhash(plate_crop(1)) ^ dhash(plate_crop(10))).count("1") > 20
+
+
+def test_cache_answers_near_identical_crops_and_expires():
+    cache = OCRCache(max_size=4, tolerance=0.05, ttl=10)
+    key, cached = cache.lookup(plate_crop(1))
+    assert cached is None
+
+    cache.store(key, ("ABC1234", 0.9))
+    assert cache.lookup(plate_crop(1, noise_seed=1))[1] == ("ABC1234", 0.9)
+    assert cache.lookup(plate_crop(10))[1] is None
+
+    expired = OCRCache(max_size=4, tolerance=0.05, ttl=0)
+    expired.store(expired.lookup(plate_crop(1))[0], ("ABC1234", 0.9))
+    assert expired.lookup(plate_crop(1))[1] is None
+
+
+def test_read_crops_flags_cache_hits():
+    extraction = CountingExtraction()
+    first = extraction.read_crops([plate_crop(1)], with_hits=True)
+    second = extraction.read_crops([plate_crop(1), plate_crop(10)], with_hits=True)
+
+    assert first == [("ABC1234", 0.95, False)]
+    assert second == [("ABC1234", 0.95, True), ("ABC1234", 0.95, False)]
+    assert extraction.calls == 2
+
+
+def test_uncertain_readings_are_not_cached():
+    extraction = CountingExtraction(confidence=0.6)
+    extraction.read_crops([plate_crop(1)])
+    extraction.read_crops([plate_crop(1)])
+
+    assert extraction.calls == 2
+    assert len(extraction.cache) == 0
+
+
+def stationary_pipeline(confidence: float) -> DetectionPipeline:
+    pipeline = DetectionPipeline(0, None, CountingExtraction(confidence), None)
+    pipeline.quality_gate = None
+    return pipeline
+
+
+def stationary_packet(pipeline: DetectionPipeline) -> dict:
+    frame = np.full((480, 640, 3), 230, dtype=np.uint8)
+    frame[200:232, 200:440] = 20
+    labels = [Detection(180, 190, 460, 242, 0.9)]
+    return {"frame": frame, "labels": labels, "tracks": pipeline.tracker.update(labels)}
+
+
+def test_stationary_low_confidence_track_reaches_a_decision():
+    pipeline = stationary_pipeline(confidence=0.6)
+    for _ in range(OCR_VOTE_MIN_VOTES):
+        packet = stationary_packet(pipeline)
+        pipeline.recognize(packet)
+
+    assert packet["tracks"][0].ready_for_decision()
+    assert packet["plates"] == ["ABC1234"]
+
+
+def test_cache_hit_commits_a_new_track():
+    pipeline = stationary_pipeline(confidence=0.95)
+    pipeline.recognize(stationary_packet(pipeline))
+    pipeline.tracker = PlateTracker()
+    packet = stationary_packet(pipeline)
+    pipeline.recognize(packet)
+
+    assert pipeline.extraction.calls == 1
+    assert packet["tracks"][0].ready_for_decision()
+
+
+def test_warmup_bypasses_the_cache():
+    extraction = CountingExtraction()
+    extraction.mode = "readtext"
+    extraction.warmup(runs=3)
+
+    assert extraction.calls == 3
+    assert len(extraction.cache) == 0
@@ -0,0 +1,34 @@
+from src.controller.ocr_pool import OCRProcessPool
+from concurrent.futures import Future
+import numpy as np
+import threading
+import time
+
+
+def test_stop_fails_waiting_calls_with_one_reading_per_crop(monkeypatch):
+    pool = OCRProcessPool.__new__(OCRProcessPool)
+    pool.stop_event = threading.Event()
+    pool.processes, pool.slots = [], []
+    pool.collector = threading.Thread(target=lambda: None)
+    pool.collector.start()
+    pool.pending_lock = threading.Lock()
+    pool.pending = {}
+
+    def submit(crops: list) -> Future:
+        future = Future()
+        future.task_id = 1
+        with pool.pending_lock:
+            pool.pending[1] = (future, 0, time.perf_counter())
+        return future
+
+    monkeypatch.setattr(pool, "submit", submit)
+    results = []
+    caller = threading.Thread(target=lambda: results.append(pool.ocr_crops([np.zeros((8, 8), np.uint8)] * 2)))
+    caller.start()
+    while not pool.pending:
+        time.sleep(0.01)
+
+    pool.stop()
+    caller.join(timeout=5)
+
+    assert results == [[(None, 0.0), (None, 0.0)]]
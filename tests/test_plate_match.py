@@ -0,0 +1,103 @@
+from src.controller.plate_match import plate_distance, canonical_plate, levenshtein, BKTree, PlateMatcher, CONFUSION_COST
+import pytest
+
+
+def test_levenshtein_counts_unit_edits():
+    assert levenshtein("ABC1234", "ABC1234") == 0
+    assert levenshtein("ABC1234", "ABC1235") == 1
+    assert levenshtein("ABC1234", "AB1234") == 1
+    assert levenshtein("", "ABC") == 3
+
+
+def test_letter_digit_confusion_is_cheap():
+    assert plate_distance("WXY1Z34", "WXY1234") == pytest.approx(CONFUSION_COST)
+    assert plate_distance("W8Y1234", "WBY1234") == pytest.approx(CONFUSION_COST)
+
+
+def test_letter_letter_and_digit_digit_substitutions_are_full_edits():
+    assert plate_distance("ABU1234", "ABV1234") == pytest.approx(1.0)
+    assert plate_distance("ABO1234", "ABD1234") == pytest.approx(1.0)
+    assert plate_distance("WXY1235", "WXY1234") == pytest.approx(1.0)
+
+
+def test_digraphs_are_not_confusions():
+    assert plate_distance("VVXY1234", "WXY1234") >= 1.0
+    assert plate_distance("RN1234", "M1234") >= 1.0
+
+
+def test_canonical_plate_collapses_only_letter_digit_groups():
+    assert canonical_plate("WXY1Z34") == canonical_plate("WXY1234")
+    assert canonical_plate("ABU1234") != canonical_plate("ABV1234")
+
+
+def test_bk_tree_search_finds_words_within_radius():
+    tree = BKTree(["ABC1234", "ABC1235", "XYZ9876"])
+    assert tree.size == 3
+    assert sorted(word for _, word in tree.search("ABC1234", 1)) == ["ABC1234", "ABC1235"]
+    assert [word for _, word in tree.search("ABC1234", 0)] == ["ABC1234"]
+
+
+def test_matcher_accepts_a_confusion():
+    match = PlateMatcher(["WXY1234", "JKL5678"]).match("WXY1Z34")
+    assert match["plate"] == "WXY1234"
+    assert match["distance"] == pytest.approx(CONFUSION_COST)
+    assert not match["ambiguous"]
+
+
+def test_matcher_rejects_genuine_edits():
+    matcher = PlateMatcher(["WXY1234"])
+    assert matcher.match("WXY1235") is None
+    assert matcher.match("WXY12345") is None
+
+
+def test_matcher_rejects_letter_look_alikes():
+    matcher = PlateMatcher(["ABV1234", "WXY1234", "ABD1234"])
+    assert matcher.match("ABU1234") is None
+    assert matcher.match("VVXY1234") is None
+    assert matcher.match("ABO1234") is None
+
+
+def test_matcher_flags_close_runner_up_as_ambiguous():
+    match = PlateMatcher(["ABC1O0", "ABC100"]).match("ABC10O")
+    assert match["plate"] == "ABC100"
+    assert match["runner_up"] == "ABC1O0"
+    assert match["ambiguous"]
+
+
+def test_matcher_radius_follows_max_distance():
+    assert PlateMatcher(["WXY1234"]).match("WXY1235") is None
+    assert PlateMatcher(["WXY1234"], max_distance=1.0).match("WXY1235")["plate"] == "WXY1234"
+
+
+class FakeIndex:
+
+    def __init__(self, match: dict) -> None:
+        self.result = match
+
+    def is_usable(self) -> bool:
+        return True
+
+    def match(self, car_plate: str) -> dict:
+        return self.result
+
+
+def make_processor(match: dict):
+    from src.controller.vehicle_processor import VehicleDetectionProcessor
+
+    processor = VehicleDetectionProcessor.__new__(VehicleDetectionProcessor)
+    processor.index = FakeIndex(match)
+    processor.fuzzy_pending = {}
+    return processor
+
+
+def test_near_miss_is_admitted_only_after_a_second_agreeing_read():
+    processor = make_processor({"plate": "WXY1234", "distance": 0.3, "runner_up": None, "runner_up_distance": None, "ambiguous": False})
+    assert processor.resolve_plate("WXY1Z34") == "WXY1Z34"
+    assert processor.resolve_plate("WXY1Z34") == "WXY1234"
+    assert processor.resolve_plate("WXY1Z34") == "WXY1Z34"
+
+
+def test_ambiguous_near_miss_is_never_admitted():
+    processor = make_processor({"plate": "ABC100", "distance": 0.3, "runner_up": "ABC1O0", "runner_up_distance": 0.6, "ambiguous": True})
+    assert processor.resolve_plate("ABC10O") == "ABC10O"
+    assert processor.resolve_plate("ABC10O") == "ABC10O"
@@ -0,0 +1,73 @@
+from src.controller.vehicle_processor import VehicleDetectionProcessor
+from src.database.presence import PresenceTable
+import time
+
+
+class FakeHistory:
+
+    def __init__(self, record: dict) -> None:
+        self.record = record
+        self.queries = 0
+
+    def find_by_car_plate(self, car_plate: str) -> dict:
+        self.queries += 1
+        return self.record
+
+
+def processor(action: str, table: PresenceTable, record: dict) -> VehicleDetectionProcessor:
+    processor = VehicleDetectionProcessor.__new__(VehicleDetectionProcessor)
+    processor.action = action
+    processor.cooldown = 60
+    processor.presence = table
+    processor.history_db = FakeHistory(record)
+    return processor
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    table = PresenceTable(ttl=10)
+
+    table.store("ABC1234", {"enter_time": 1000.0})
+    assert table.lookup("ABC1234") == {"enter_time": 1000.0}
+
+    now[0] += 10
+    assert table.lookup("ABC1234") is None
+    assert table.metrics.snapshot()["counters"]["expired"] == 1
+
+
+def test_misses_are_not_cached():
+    table = PresenceTable(ttl=10)
+    table.store("ABC1234", {})
+
+    assert table.lookup("ABC1234") is None
+
+
+def test_vehicle_without_history_is_read_again():
+    table = PresenceTable(ttl=10)
+    entry = processor("entry", table, {})
+
+    assert entry.find_history("ABC1234") == {}
+    assert entry.find_history("ABC1234") == {}
+    assert entry.history_db.queries == 2
+
+
+def test_repeated_detection_within_cooldown_is_served_from_table():
+    table = PresenceTable(ttl=300)
+    table.store("ABC1234", {"enter_time": time.time()})
+    entry = processor("entry", table, None)
+
+    assert entry.find_history("ABC1234")["enter_time"]
+    assert entry.history_db.queries == 0
+
+
+def test_exited_record_is_refreshed_on_exit():
+    # Another process entered the vehicle again since this process saw it exit
+    table = PresenceTable(ttl=300)
+    table.store("ABC1234", {"enter_time": time.time() - 3600, "exit_time": time.time() - 600})
+    latest = {"enter_time": time.time() - 30, "exit_time": None}
+    exit_lane = processor("exit", table, latest)
+
+    assert exit_lane.find_history("ABC1234") is latest
+    assert exit_lane.history_db.queries == 1
+    assert table.lookup("ABC1234") is latest